@@ -0,0 +1,65 @@
+# benchmarks/bench_chunk_store.py
+#
+# Compares parsing and normalizing a large synthetic transcript as chunk dicts
+# and as a ChunkStore. Needs NumPy, so run it with Blender's Python:
+#   blender --background --factory-startup --python benchmarks/bench_chunk_store.py -- --chunks 100000
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (repo_dir, os.path.dirname(os.path.abspath(__file__))):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from modules import chunk_normalizer, chunk_store, parser
+import synthetic_data
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else argv[1:]
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('--chunks', type=int, default=100000)
+    return arg_parser.parse_args(argv)
+
+def measure(transcript_path, config, use_store):
+    """
+    Returns (seconds, held_mb, peak_mb) of parsing and normalizing the transcript.
+    """
+    numpy_module = chunk_store.np
+    if not use_store:
+        chunk_store.np = None
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        chunks = chunk_normalizer.normalize_chunks(parser.parse_data(transcript_path, config), config)
+        elapsed = time.perf_counter() - start
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        chunk_store.np = numpy_module
+    del chunks
+    return elapsed, held / 1e6, peak / 1e6
+
+def run(argv):
+    args = parse_args(argv)
+    if not chunk_store.available():
+        print("NumPy is not available")
+        sys.exit(1)
+
+    config = {'FRAME_RATE': 30, 'MIN_CAPTION_FRAMES': 3}
+    with tempfile.TemporaryDirectory(prefix='chunk_store_') as work_dir:
+        transcript_path = os.path.join(work_dir, 'transcript.json')
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            json.dump(synthetic_data.generate_transcript(args.chunks), f)
+
+        for name, use_store in (('dicts', False), ('store', True)):
+            elapsed, held_mb, peak_mb = measure(transcript_path, config, use_store)
+            print(f"{name}: {elapsed:.2f}s, {held_mb:.1f} MB held after normalization, {peak_mb:.1f} MB peak")
+
+if __name__ == "__main__":
+    run(sys.argv)
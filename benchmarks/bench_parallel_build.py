@@ -0,0 +1,94 @@
+# benchmarks/bench_parallel_build.py
+#
+# Measures how the scene build scales with the number of parallel build workers:
+#   blender --background --factory-startup --python benchmarks/bench_parallel_build.py -- \
+#       --transcript t.json --visual-elements v.json --workers 1 2 4 8
+# One worker compiles the timeline in this process, more use parallel_build.
+# Prints the build wall time and the speedup over one worker for each count.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+import bpy
+
+# Stages that compile the timeline, timed as the build
+BUILD_STAGES = ('compile_timeline', 'parallel_build')
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transcript', required=True)
+    parser.add_argument('--visual-elements', required=True)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--min-items', type=int, default=50, help="BUILD_PARTITION_MIN_ITEMS")
+    parser.add_argument('--output-json', help="Also write the measurements to this file")
+    return parser.parse_args(argv)
+
+def build_once(config, args, work_dir, workers):
+    """
+    Builds the scene and returns (build_seconds, total_seconds).
+    """
+    from modules import setup_scene
+    import main
+
+    stages = {}
+
+    def stage_hook(name, func, *stage_args, **stage_kwargs):
+        start = time.perf_counter()
+        result = func(*stage_args, **stage_kwargs)
+        stages[name] = time.perf_counter() - start
+        return result
+
+    # Each run writes its partitions next to its own output
+    output_dir = os.path.join(work_dir, f"workers_{workers}")
+    os.makedirs(output_dir)
+    run_config = dict(config, PARALLEL_BUILD=workers > 1, BUILD_WORKERS=workers,
+                      OUTPUT_PATH=os.path.join(output_dir, 'video.mp4'))
+
+    setup_scene.reset_to_empty_scene()
+    start = time.perf_counter()
+    main.main(run_config, data_file=args.transcript, visual_elements_file=args.visual_elements,
+              blend_path=os.path.join(output_dir, 'build.blend'), render=False, stage_hook=stage_hook)
+    total = time.perf_counter() - start
+    return sum(stages.get(name, 0) for name in BUILD_STAGES), total
+
+def run(argv):
+    args = parse_args(argv)
+
+    from config import CONFIG
+    from modules import template_library
+
+    work_dir = tempfile.mkdtemp(prefix='parallel_build_')
+    config = dict(CONFIG, FRAME_LIMIT=None, USE_TIMELINE_IR=True, INCREMENTAL_BUILD=False,
+                  BUILD_PARTITION_MIN_ITEMS=args.min_items, TEMPLATE_DIR=os.path.join(work_dir, 'templates'),
+                  OUTPUT_PATH=os.path.join(work_dir, 'video.mp4'))
+    if config.get('USE_TEMPLATE_LIBRARY'):
+        # Built before the first run so no run pays for it
+        template_library.ensure_template_library(config)
+
+    results = []
+    for workers in args.workers:
+        build_s, total_s = build_once(config, args, work_dir, workers)
+        results.append({'workers': workers, 'build_s': build_s, 'total_s': total_s})
+
+    baseline = results[0]['build_s']
+    print(f"{'workers':>8} {'build s':>9} {'total s':>9} {'speedup':>8}")
+    for result in results:
+        result['speedup'] = baseline / result['build_s'] if result['build_s'] else None
+        speedup = f"{result['speedup']:.2f}x" if result['speedup'] else '-'
+        print(f"{result['workers']:>8} {result['build_s']:>9.2f} {result['total_s']:>9.2f} {speedup:>8}")
+
+    if args.output_json:
+        with open(args.output_json, 'w', encoding='utf-8') as f:
+            json.dump({'blender_version': bpy.app.version_string, 'results': results}, f, indent=2)
+
+if __name__ == "__main__":
+    run(sys.argv)
@@ -0,0 +1,78 @@
+# benchmarks/bench_pipeline.py
+#
+# Times each stage of main.main() on one dataset inside Blender:
+#   blender --background --factory-startup --python benchmarks/bench_pipeline.py -- \
+#       --transcript t.json --visual-elements v.json --output-json result.json
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+import bpy
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transcript', required=True)
+    parser.add_argument('--visual-elements', required=True)
+    parser.add_argument('--output-json', required=True)
+    parser.add_argument('--sample-frames', type=int, default=8, help="Frames rendered for the render stage")
+    parser.add_argument('--profile', default='draft', help="Render profile used for the frame sample")
+    return parser.parse_args(argv)
+
+def render_frame_sample(sample_frames):
+    """
+    Renders frames spread evenly over the timeline without writing them.
+    """
+    scene = bpy.context.scene
+    span = max(1, scene.frame_end - scene.frame_start)
+    frames = sorted({scene.frame_start + span * i // max(1, sample_frames - 1) for i in range(sample_frames)})
+    for frame in frames:
+        scene.frame_set(frame)
+        bpy.ops.render.render(write_still=False)
+    return len(frames)
+
+def run(argv):
+    args = parse_args(argv)
+
+    from config import CONFIG
+    from modules import render_instrumentation, scene_stats, setup_scene
+    import main
+
+    work_dir = tempfile.mkdtemp(prefix='bench_')
+    config = dict(CONFIG, FRAME_LIMIT=None, RENDER_PROFILE=args.profile,
+                  OUTPUT_PATH=os.path.join(work_dir, 'video.mp4'))
+    stages = {}
+
+    def stage_hook(name, func, *stage_args, **stage_kwargs):
+        start = time.perf_counter()
+        result = func(*stage_args, **stage_kwargs)
+        _, peak_mb = render_instrumentation.get_memory_mb()
+        stages[name] = {'time_s': time.perf_counter() - start, 'peak_rss_mb': peak_mb}
+        return result
+
+    setup_scene.reset_to_empty_scene()
+    main.main(config, data_file=args.transcript, visual_elements_file=args.visual_elements,
+              blend_path=os.path.join(work_dir, 'bench.blend'), render=False, stage_hook=stage_hook)
+    main.run_stage(stage_hook, 'render_sample', render_frame_sample, args.sample_frames)
+
+    _, peak_mb = render_instrumentation.get_memory_mb()
+    result = {
+        'blender_version': bpy.app.version_string,
+        'stages': stages,
+        'counts': scene_stats.count_datablocks(),
+        'peak_rss_mb': peak_mb,
+        'sample_frames': args.sample_frames,
+    }
+    with open(args.output_json, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    run(sys.argv)
@@ -0,0 +1,76 @@
+# benchmarks/check_determinism.py
+#
+# Builds the same inputs twice inside Blender and compares the animation data,
+# which must be identical for build output to be cacheable:
+#   blender --background --factory-startup --python benchmarks/check_determinism.py -- \
+#       --transcript t.json --visual-elements v.json
+# Exits with status 1 if the two builds differ. The timeline and effect seeds
+# are checked without Blender by tests/test_determinism.py.
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+import bpy
+
+def parse_args(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transcript', required=True)
+    parser.add_argument('--visual-elements', required=True)
+    return parser.parse_args(argv)
+
+def dump_animation():
+    """
+    Returns every action's keyframes, ordered by action, data path and array index.
+    """
+    from modules import scene_stats
+
+    dump = {}
+    for action in sorted(bpy.data.actions, key=lambda action: action.name):
+        fcurves = []
+        for fcurve in scene_stats.iter_action_fcurves(action):
+            fcurves.append([fcurve.data_path, fcurve.array_index, [
+                [list(point.co), list(point.handle_left), list(point.handle_right), point.interpolation]
+                for point in fcurve.keyframe_points
+            ]])
+        dump[action.name] = sorted(fcurves, key=lambda fcurve: (fcurve[0], fcurve[1]))
+    return dump
+
+def build_once(config, args, work_dir, run):
+    from modules import setup_scene
+    import main
+
+    setup_scene.reset_to_empty_scene()
+    main.main(config, data_file=args.transcript, visual_elements_file=args.visual_elements,
+              blend_path=os.path.join(work_dir, f'build_{run}.blend'), render=False)
+    payload = json.dumps(dump_animation(), sort_keys=True).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest(), payload
+
+def run(argv):
+    args = parse_args(argv)
+
+    from config import CONFIG
+
+    work_dir = tempfile.mkdtemp(prefix='determinism_')
+    config = dict(CONFIG, FRAME_LIMIT=None, INCREMENTAL_BUILD=False,
+                  OUTPUT_PATH=os.path.join(work_dir, 'video.mp4'))
+
+    first_hash, first = build_once(config, args, work_dir, 1)
+    second_hash, second = build_once(config, args, work_dir, 2)
+
+    print(f"Animation data: {first_hash} vs {second_hash} ({len(first)} bytes)")
+    if first != second:
+        print("Builds are not deterministic")
+        sys.exit(1)
+    print("Builds are identical")
+
+if __name__ == "__main__":
+    run(sys.argv)
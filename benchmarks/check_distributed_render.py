@@ -0,0 +1,108 @@
+# benchmarks/check_distributed_render.py
+#
+# Runs the frame lease protocol of distributed_render with several worker
+# processes on a temporary share directory. The first worker dies in the middle
+# of its range, so its lease has to go stale and be taken over:
+#   python benchmarks/check_distributed_render.py --workers 4 --frames 600
+# Workers write the frame numbers of their range instead of rendering, so no
+# Blender is needed. Exits with status 1 if a frame is missing or rendered twice.
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import frame_leases
+
+LEASE_TIMEOUT = 2
+HEARTBEAT_INTERVAL = 0.5
+POLL_INTERVAL = 0.2
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Distributed render lease check")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--range-frames', type=int, default=50)
+    parser.add_argument('--frame-seconds', type=float, default=0.002, help="Stand-in render time per frame")
+    return parser.parse_args()
+
+def make_board(share_dir):
+    return frame_leases.LeaseBoard(share_dir, lease_timeout=LEASE_TIMEOUT, heartbeat_interval=HEARTBEAT_INTERVAL)
+
+def run_worker(share_dir, frame_seconds, crash):
+    """
+    Joins the job like distributed_render.join_render, with a stand-in renderer.
+    """
+    def render(start, end, output_path):
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for frame in range(start, end + 1):
+                time.sleep(frame_seconds)
+                f.write(f"{frame}\n")
+                if crash and frame == (start + end) // 2:
+                    f.flush()
+                    os._exit(1)
+
+    frame_leases.run_worker(make_board(share_dir), render, POLL_INTERVAL)
+
+def read_frames(segment_paths):
+    frames = []
+    for path in segment_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            frames += [int(line) for line in f]
+    return frames
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix='distributed_') as share_dir:
+        board = make_board(share_dir)
+        job = board.create_job(0, args.frames - 1, args.range_frames, extension='.txt',
+                               config={'RESOLUTION': [1920, 1080], 'FRAME_RATE': 30})
+
+        # Spawned processes import everything again, as separate Blender processes would
+        context = multiprocessing.get_context('spawn')
+        crasher = context.Process(target=run_worker, args=(share_dir, args.frame_seconds, True))
+        crasher.start()
+        while not os.listdir(os.path.join(share_dir, 'leases')) and crasher.is_alive():
+            time.sleep(0.01)
+        workers = [context.Process(target=run_worker, args=(share_dir, args.frame_seconds, False))
+                   for _ in range(args.workers - 1)]
+        for worker in workers:
+            worker.start()
+
+        start = time.perf_counter()
+        segment_paths = frame_leases.wait_for_segments(board, POLL_INTERVAL, timeout=LEASE_TIMEOUT * 10 + args.frames)
+        elapsed = time.perf_counter() - start
+        for process in [crasher] + workers:
+            process.join()
+
+        owners = {}
+        for index, _, _ in job['ranges']:
+            with open(board.done_path(index), 'r') as f:
+                owners.setdefault(f.read(), []).append(index)
+        frames = read_frames(segment_paths)
+
+    print(f"{len(job['ranges'])} ranges rendered by {len(owners)} workers in {elapsed:.1f}s")
+    for worker_id, indices in sorted(owners.items()):
+        print(f"  {worker_id}: {len(indices)} ranges")
+
+    problems = []
+    if crasher.exitcode != 1:
+        problems.append(f"the crashing worker exited with {crasher.exitcode}")
+    problems += [f"worker exited with {worker.exitcode}" for worker in workers if worker.exitcode != 0]
+    if frames != list(range(args.frames)):
+        missing = sorted(set(range(args.frames)) - set(frames))
+        problems.append(f"{len(missing)} frames missing, {len(frames) - len(set(frames))} rendered twice, "
+                        f"order {'kept' if frames == sorted(frames) else 'broken'}")
+    for problem in problems:
+        print(f"Problem: {problem}")
+    if problems:
+        sys.exit(1)
+    print("Every frame was rendered once, in order")
+
+if __name__ == "__main__":
+    run(parse_args())
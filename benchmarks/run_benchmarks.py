@@ -0,0 +1,125 @@
+# benchmarks/run_benchmarks.py
+#
+# Runs the synthetic benchmark suite and compares it against a stored baseline:
+#   python benchmarks/run_benchmarks.py --blender /path/to/blender
+#   python benchmarks/run_benchmarks.py --sizes 100 1000 --update-baseline
+#
+# Each dataset size runs in its own Blender process so peak memory is measured per size.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(bench_dir)
+sys.path.insert(0, bench_dir)
+
+import synthetic_data
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+DEFAULT_BASELINE = os.path.join(bench_dir, 'baseline.json')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scene build and render benchmark")
+    parser.add_argument('--blender', default='blender', help="Blender executable")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Transcript chunk counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample-frames', type=int, default=8)
+    parser.add_argument('--profile', default='draft')
+    parser.add_argument('--work-dir', default=os.path.join(bench_dir, 'work'))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--results', default=os.path.join(bench_dir, 'results.json'))
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown before flagging")
+    parser.add_argument('--update-baseline', action='store_true', help="Store the results as the new baseline")
+    return parser.parse_args()
+
+def run_size(args, chunk_count):
+    """
+    Generates the dataset for one size and benchmarks it in a fresh Blender process.
+    """
+    image_paths = [os.path.join(repo_dir, name) for name in ('t1.png', 't2.png', 't3.png')]
+    transcript_path, visual_elements_path = synthetic_data.write_dataset(
+        args.work_dir, chunk_count, image_paths, seed=args.seed)
+    output_json = os.path.join(args.work_dir, f'result_{chunk_count}.json')
+
+    command = [
+        args.blender, '--background', '--factory-startup',
+        '--python', os.path.join(bench_dir, 'bench_pipeline.py'), '--',
+        '--transcript', transcript_path,
+        '--visual-elements', visual_elements_path,
+        '--output-json', output_json,
+        '--sample-frames', str(args.sample_frames),
+        '--profile', args.profile,
+    ]
+    print(f"Benchmarking {chunk_count} chunks...")
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0 or not os.path.isfile(output_json):
+        print(completed.stdout[-2000:])
+        print(completed.stderr[-2000:])
+        raise RuntimeError(f"Benchmark for {chunk_count} chunks failed")
+
+    with open(output_json, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(results, baseline, tolerance, min_delta_s=0.05):
+    """
+    Returns a list of regressions: stages that got slower than the tolerance allows,
+    higher peak memory, and changed datablock counts.
+    """
+    regressions = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        for stage, timing in result['stages'].items():
+            base_timing = base['stages'].get(stage)
+            if base_timing is None:
+                continue
+            old, new = base_timing['time_s'], timing['time_s']
+            if new > old * (1 + tolerance) and new - old > min_delta_s:
+                regressions.append(f"{size} chunks: {stage} {old:.3f}s -> {new:.3f}s")
+        old_mb, new_mb = base.get('peak_rss_mb'), result.get('peak_rss_mb')
+        if old_mb and new_mb and new_mb > old_mb * (1 + tolerance):
+            regressions.append(f"{size} chunks: peak memory {old_mb:.0f} MB -> {new_mb:.0f} MB")
+        for key, count in result['counts'].items():
+            old_count = base['counts'].get(key)
+            if old_count is not None and count > old_count:
+                regressions.append(f"{size} chunks: {key} count {old_count} -> {count}")
+    return regressions
+
+def print_results(results):
+    for size, result in results.items():
+        stages = ", ".join(f"{name} {timing['time_s']:.2f}s" for name, timing in result['stages'].items())
+        print(f"{size} chunks: {stages}")
+        print(f"  peak memory {result['peak_rss_mb'] or 0:.0f} MB, counts {result['counts']}")
+
+def main():
+    args = parse_args()
+    results = {str(size): run_size(args, size) for size in args.sizes}
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print_results(results)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print("Baseline updated:", args.baseline)
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline found. Run with --update-baseline to store one.")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION:", regression)
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
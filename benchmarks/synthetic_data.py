@@ -0,0 +1,106 @@
+# benchmarks/synthetic_data.py
+#
+# Generates synthetic transcripts and visual element timelines with a fixed seed.
+
+import json
+import os
+import random
+import shutil
+import subprocess
+
+VOCABULARY = [
+    "president", "Modi", "Moscow", "Kiev", "Zelensky", "Putin", "minister", "talks",
+    "peace", "war", "India", "Ukraine", "Russia", "visit", "arrival", "meeting",
+    "said", "the", "and", "of", "to", "with", "in", "on", "a", "new", "week",
+]
+
+EFFECTS = ['zoom_in', 'zoom_out', 'pan_and_zoom', 'corner_to_corner_pan']
+
+def generate_transcript(chunk_count, seed=0):
+    """
+    Returns a Whisper-style transcript with `chunk_count` chunks.
+    Some chunks repeat the end of the previous one, like real transcripts do.
+    """
+    rng = random.Random(seed)
+    chunks = []
+    time = rng.uniform(0.0, 1.0)
+    previous_word = None
+
+    for _ in range(chunk_count):
+        duration = round(rng.uniform(0.15, 0.6), 2)
+        if previous_word is not None and rng.random() < 0.05:
+            text = f" {previous_word}"
+        else:
+            words = rng.choices(VOCABULARY, k=rng.choice([1, 1, 1, 2]))
+            text = " " + " ".join(words)
+            previous_word = words[-1]
+        start = round(time, 2)
+        end = round(time + duration, 2)
+        chunks.append({'text': text, 'timestamp': [start, end]})
+        time = end
+
+    return {
+        'text': "".join(chunk['text'] for chunk in chunks),
+        'chunks': chunks,
+    }
+
+def generate_video(path, ffmpeg_binary='ffmpeg', seconds=4, size='540x960'):
+    """
+    Renders a short green screen test clip with ffmpeg. Returns False if ffmpeg is unavailable.
+    """
+    if shutil.which(ffmpeg_binary) is None:
+        return False
+    command = [
+        ffmpeg_binary, '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'color=c=green:s={size}:d={seconds}:r=24',
+        '-f', 'lavfi', '-i', f'testsrc=s=270x480:d={seconds}:r=24',
+        '-filter_complex', '[0][1]overlay=135:240', '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path,
+    ]
+    return subprocess.run(command, capture_output=True).returncode == 0
+
+def generate_visual_elements(duration, image_paths, video_paths=(), seed=0, seconds_per_element=8.0):
+    """
+    Returns a visual element timeline covering `duration` seconds with images,
+    videos and effects picked with a fixed seed.
+    """
+    rng = random.Random(seed)
+    elements = []
+    time = 0.0
+
+    while time < duration:
+        length = rng.uniform(seconds_per_element * 0.5, seconds_per_element * 1.5)
+        use_video = rng.random() < 0.2 and bool(video_paths)
+        element = {
+            'file_path': rng.choice(video_paths if use_video else image_paths),
+            'type': 'main' if use_video else rng.choice(['background', 'background', 'overlay']),
+            'timestamp': [round(time, 2), round(min(time + length, duration), 2)],
+            'media': 'video' if use_video else 'image',
+            'effects': [rng.choice(EFFECTS)] if rng.random() < 0.6 else [],
+        }
+        elements.append(element)
+        time += length
+
+    return {'visual_elements': elements}
+
+def write_dataset(output_dir, chunk_count, image_paths, seed=0, ffmpeg_binary='ffmpeg'):
+    """
+    Writes a transcript and visual element timeline for `chunk_count` chunks.
+    Returns the (transcript_path, visual_elements_path).
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    transcript = generate_transcript(chunk_count, seed)
+    duration = transcript['chunks'][-1]['timestamp'][1] if transcript['chunks'] else 0
+
+    video_path = os.path.join(output_dir, 'greenscreen.mp4')
+    video_paths = [video_path] if os.path.isfile(video_path) or generate_video(video_path, ffmpeg_binary) else []
+    visual_elements = generate_visual_elements(duration, image_paths, video_paths, seed)
+
+    transcript_path = os.path.join(output_dir, f'transcript_{chunk_count}.json')
+    visual_elements_path = os.path.join(output_dir, f'visual_elements_{chunk_count}.json')
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        json.dump(transcript, f)
+    with open(visual_elements_path, 'w', encoding='utf-8') as f:
+        json.dump(visual_elements, f, indent=2)
+    return transcript_path, visual_elements_path
@@ -0,0 +1,105 @@
+# blender_worker.py
+#
+# Long-running Blender worker started by service.py:
+#   blender --background --factory-startup --python blender_worker.py
+#
+# Reads one JSON task per line from stdin and answers with a line starting with
+# '@@worker ' on stdout. The pipeline modules, effect modules and the template
+# library stay loaded between tasks. With '-- --no-preload' the default config
+# is not preloaded, for one-off workers whose task brings its own config.
+
+import json
+import os
+import sys
+import time
+import traceback
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+import bpy
+import main
+from config import CONFIG
+from modules import effect_manager, renderer, setup_scene, template_library, timeline_compiler
+
+MESSAGE_PREFIX = '@@worker '
+
+def send(message):
+    print(MESSAGE_PREFIX + json.dumps(message), flush=True)
+
+def preload(config):
+    """
+    Imports the effect modules and builds the template library of the config.
+    Both are kept, so tasks with the same config find them ready.
+    """
+    effect_manager.load_effects(config['EFFECTS'])
+    if config.get('USE_TEMPLATE_LIBRARY') and not os.path.isfile(template_library.get_template_path(config)):
+        template_library.build_template_library(config)
+        setup_scene.reset_to_empty_scene()
+
+def build(task):
+    """
+    Builds and saves the job's .blend without rendering it.
+    Windowed jobs are built and rendered here, since each window is built on its own.
+    """
+    config = task['config']
+    setup_scene.reset_to_empty_scene()
+    main.main(config, data_file=task['transcript'], visual_elements_file=task['visual_elements'],
+              blend_path=task['blend_path'], render=False)
+    return {'rendered': bool(config.get('WINDOWED_RENDER'))}
+
+def render(task):
+    """
+    Opens the job's .blend and renders it.
+    """
+    config = task['config']
+    bpy.ops.wm.open_mainfile(filepath=task['blend_path'])
+    # Frame handlers of effects such as the typewriter are not stored in the .blend
+    effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+    renderer.setup_rendering(config)
+    renderer.render_animation(config)
+    return {}
+
+def build_partition(task):
+    """
+    Compiles one time range of a timeline into a library .blend for parallel_build.
+    Returns the names of the compiled objects.
+    """
+    config = task['config']
+    preload(config)
+    setup_scene.reset_to_empty_scene()
+    setup_scene.setup_scene(config)
+    timeline_compiler.compile_items(task['layers'], task['captions'], config)
+    bpy.ops.wm.save_as_mainfile(filepath=task['blend_path'])
+    return {'objects': [obj.name for obj in bpy.data.objects if 'timeline_id' in obj]}
+
+TASKS = {
+    'build': build,
+    'render': render,
+    'build_partition': build_partition,
+}
+
+def run(argv):
+    argv = argv[argv.index('--') + 1:] if '--' in argv else []
+    if '--no-preload' not in argv:
+        preload(CONFIG)
+    send({'event': 'ready', 'pid': os.getpid()})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        task = json.loads(line)
+        start = time.perf_counter()
+        result = {'event': 'done', 'job_id': task.get('job_id'), 'task': task.get('task')}
+        try:
+            result.update(TASKS[task['task']](task))
+            result['ok'] = True
+        except Exception as e:
+            traceback.print_exc()
+            result.update({'ok': False, 'error': f"{type(e).__name__}: {e}"})
+        result['time_s'] = round(time.perf_counter() - start, 3)
+        send(result)
+
+if __name__ == "__main__":
+    run(sys.argv)
@@ -0,0 +1,167 @@
+# cli.py
+#
+# Headless entry point:
+#   blender --background --factory-startup --python cli.py -- --transcript transcript.json --profile draft
+
+import time
+_script_start = time.perf_counter()
+
+import argparse
+import ast
+import json
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+def get_process_age():
+    """
+    Returns the seconds since the Blender process started, or None where /proc is unavailable.
+    """
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # The command name may contain spaces, so split after its closing parenthesis
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+def parse_override(text):
+    """
+    Parses a KEY=VALUE override. Values are read as Python literals when possible.
+    """
+    if '=' not in text:
+        raise argparse.ArgumentTypeError(f"Override must be KEY=VALUE: {text}")
+    key, value = text.split('=', 1)
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return key.strip(), value
+
+def parse_args(argv):
+    """
+    Parses the arguments given after '--' on the Blender command line.
+    """
+    if '--' in argv:
+        argv = argv[argv.index('--') + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(prog='blender --background --factory-startup --python cli.py --')
+    parser.add_argument('--transcript', default=os.path.join(script_dir, 'transcript.json'),
+                        help="Transcript JSON with 'chunks'")
+    parser.add_argument('--visual-elements', default=os.path.join(script_dir, 'visual_elements.json'),
+                        help="Visual elements JSON")
+    parser.add_argument('--output', help="Video output path (overrides OUTPUT_PATH)")
+    parser.add_argument('--blend', default=os.path.join(script_dir, 'output.blend'),
+                        help="Where to save the built .blend file")
+    parser.add_argument('--profile', help="Render profile from RENDER_PROFILES")
+    parser.add_argument('--config', help="JSON file with CONFIG overrides")
+    parser.add_argument('--set', dest='overrides', action='append', default=[], type=parse_override,
+                        metavar='KEY=VALUE', help="Override a CONFIG key, may be repeated")
+    parser.add_argument('--no-render', action='store_true', help="Build and save the scene without rendering")
+    parser.add_argument('--profile-stages', action='store_true',
+                        help="Profile every pipeline stage (sets PROFILE_PIPELINE)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Rebuild only what changed in the existing --blend file (uses the timeline IR)")
+    parser.add_argument('--build-workers', type=int, metavar='N',
+                        help="Build the scene in N parallel Blender processes (sets PARALLEL_BUILD)")
+    parser.add_argument('--report', action='store_true',
+                        help="Report the complexity and estimated render time of the saved --blend file and exit")
+    parser.add_argument('--report-samples', type=int, default=0,
+                        help="Frames to render to calibrate the --report estimate")
+    parser.add_argument('--preview', action='store_true',
+                        help="Render only the change points of the saved --blend file as a contact sheet and slideshow")
+    parser.add_argument('--join-render', metavar='SHARE_DIR',
+                        help="Render frame ranges of a distributed job in SHARE_DIR and exit")
+    parser.add_argument('--build-templates', action='store_true',
+                        help="Rebuild the template library for the config and exit")
+    return parser.parse_args(argv)
+
+def build_config(args):
+    """
+    Returns a copy of CONFIG with the command line overrides applied.
+    """
+    from config import CONFIG
+    config = dict(CONFIG)
+
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    config.update(dict(args.overrides))
+    if args.output:
+        config['OUTPUT_PATH'] = os.path.abspath(args.output)
+    if args.profile:
+        config['RENDER_PROFILE'] = args.profile
+    if args.profile_stages:
+        config['PROFILE_PIPELINE'] = True
+    if args.incremental:
+        config['USE_TIMELINE_IR'] = True
+        config['INCREMENTAL_BUILD'] = True
+    if args.build_workers:
+        config['PARALLEL_BUILD'] = True
+        config['BUILD_WORKERS'] = args.build_workers
+    return config
+
+def run(argv):
+    args = parse_args(argv)
+    config = build_config(args)
+
+    # Start from an empty scene instead of the startup file
+    reset_start = time.perf_counter()
+    from modules import setup_scene
+    setup_scene.reset_to_empty_scene()
+    reset_time = time.perf_counter() - reset_start
+
+    process_age = get_process_age()
+    ready_time = time.perf_counter() - _script_start
+    if process_age is not None:
+        print(f"Startup: {process_age - ready_time:.2f}s Blender launch, {ready_time:.2f}s CLI setup "
+              f"({reset_time:.2f}s scene reset)")
+    else:
+        print(f"Startup: {ready_time:.2f}s CLI setup ({reset_time:.2f}s scene reset)")
+
+    if args.report:
+        import bpy
+        from modules import effect_manager, renderer, scene_report
+        bpy.ops.wm.open_mainfile(filepath=os.path.abspath(args.blend))
+        # Frame handlers are not stored in the .blend; the report counts them and
+        # --report-samples renders with them
+        effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+        if bpy.context.scene.get('visibility_buckets'):
+            from modules import visibility_buckets
+            visibility_buckets.register_handler()
+        renderer.setup_rendering(config)
+        scene_report.report_scene(config, sample_frames=args.report_samples)
+        return
+
+    if args.preview:
+        import bpy
+        from modules import change_preview
+        bpy.ops.wm.open_mainfile(filepath=os.path.abspath(args.blend))
+        change_preview.render_change_preview(config)
+        return
+
+    if args.join_render:
+        from modules import distributed_render
+        distributed_render.join_render(os.path.abspath(args.join_render), config)
+        return
+
+    if args.build_templates:
+        from modules import template_library
+        template_library.build_template_library(config)
+        return
+
+    # The pipeline modules are imported only once the job is known
+    import main
+    main.main(config, data_file=args.transcript, visual_elements_file=args.visual_elements,
+              blend_path=os.path.abspath(args.blend), render=not args.no_render)
+    print(f"Job finished in {time.perf_counter() - _script_start:.2f}s")
+
+if __name__ == "__main__":
+    run(sys.argv)
@@ -1,11 +1,17 @@
 # config.py
 import math
+import os
+
+# Paths are resolved relative to the repository so jobs run on any machine
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 CONFIG = {
     # General Settings
     'FRAME_RATE': 24,
     'RESOLUTION': (1080, 1920),  # Width x Height for portrait mode
-    'OUTPUT_PATH': 'D:\\workspace\\blender\\output\\video.mp4',
+    'OUTPUT_PATH': os.path.join(BASE_DIR, 'output', 'video.mp4'),
     'BACKGROUND_COLOR': (0, 0, 0, 1),  # Black background
+    'FRAME_LIMIT': 150,  # Stop the animation at this frame, None renders the whole transcript
 
     # Effects to Apply
     'EFFECTS': [
@@ -15,13 +21,14 @@ CONFIG = {
     ],
 
     # Asset Paths
-    'FONT_PATH': 'D:\\workspace\\blender\\assets\\fonts\\',
+    'FONT_PATH': os.path.join(BASE_DIR, 'assets', 'fonts'),
     'DEFAULT_FONT': 'BebasNeue-Regular.ttf',
     'BOLD_FONT': 'Roboto-Bold.ttf',
 
     # Other Settings
     'TEXT_COLOR': (1, 1, 1, 1),  # White text
     'TEXT_SIZE': 1.0,
+    'SHARE_TEXT_DATA': True,  # Captions with the same text share one text datablock
     'SCENE_NAME': 'Scene',
     # ... (other configurations)
     'CAMERA_DISTANCE': 10,  # Distance from the text to the camera
@@ -32,4 +39,133 @@ CONFIG = {
     'MIN_FOV': math.radians(10),        # Minimum field of view in radians
     'SCALE_PADDING': 0.75,
     'CAMERA_ORTHO_SCALE': 5,
+
+    # Template Library
+    'USE_TEMPLATE_LIBRARY': False,      # Append camera, world and shader templates instead of building them
+    'TEMPLATE_DIR': None,               # Defaults to a 'templates' folder next to OUTPUT_PATH
+
+    # Render Profiles
+    # Throughput of each profile is measured with renderer.measure_render_profiles()
+    # and stored in render_profiles.json next to OUTPUT_PATH.
+    'RENDER_PROFILE': 'final',
+    'RENDER_PROFILES': {
+        'draft': {
+            'engine': 'BLENDER_WORKBENCH',
+            'render_aa': 'OFF',
+            'resolution_percentage': 25,
+            'frame_step': 2,
+            'ffmpeg_preset': 'REALTIME',
+            'crf': 'LOW',
+            'threads': 0,               # 0 = use all cores
+        },
+        'preview': {
+            'engine': 'CYCLES',
+            'device': 'CPU',
+            'samples': 4,
+            'resolution_percentage': 50,
+            'frame_step': 1,
+            'ffmpeg_preset': 'REALTIME',
+            'crf': 'MEDIUM',
+            'threads': 0,
+        },
+        'final': {
+            'engine': 'BLENDER_EEVEE_NEXT',
+            'resolution_percentage': 100,
+            'frame_step': 1,
+            'ffmpeg_preset': 'GOOD',
+            'crf': 'HIGH',
+            'threads': 0,
+        },
+    },
+
+    'RENDER_INSTRUMENTATION': False,    # Write per-frame timing and memory report next to OUTPUT_PATH
+    'OUTPUT_MODE': 'ffmpeg',            # 'ffmpeg' (Blender encodes, with audio), 'pipelined' (separate ffmpeg process, video only) or 'hls' (video only)
+    'PIPELINE_QUEUE_SIZE': 8,           # Frames waiting for the encoder before the render pauses
+    'ENCODER_THREADS': 0,               # ffmpeg threads for pipelined encoding, 0 = auto
+    'SEGMENT_SECONDS': 2,               # Duration of each HLS segment
+    'SEGMENT_FORMAT': 'fmp4',           # 'fmp4' (fragmented MP4) or 'mpegts'
+
+    # Scene Report
+    'SCENE_REPORT': False,              # Print scene complexity and a render time estimate before rendering
+    'REPORT_RANGE_SECONDS': 10,         # Length of each frame range in the report
+
+    # Change Preview
+    'CHANGE_PREVIEW': False,            # Render only the frames where captions, layers or effect keys change
+    'PREVIEW_PROFILE': 'draft',         # Render profile used for the preview stills
+    'PREVIEW_OUTPUT': 'both',           # 'contact_sheet', 'slideshow' or 'both'
+    'PREVIEW_MIN_GAP_SECONDS': 0.25,    # Change points closer than this are rendered once
+    'PREVIEW_COLUMNS': 6,               # Contact sheet layout, one sheet per COLUMNS x ROWS stills
+    'PREVIEW_ROWS': 5,
+    'PREVIEW_SLIDE_SECONDS': 0.5,       # How long each still is shown in the slideshow
+
+    # Profiling
+    'PROFILE_PIPELINE': False,          # cProfile, tracemalloc and bpy.ops counts per pipeline stage
+    'PROFILE_DIR': None,                # Defaults to a 'profile' folder next to OUTPUT_PATH
+
+    # Caption Normalization
+    'NORMALIZE_CHUNKS': True,           # Merge redundant chunks and resolve overlapping frames
+    'MIN_CAPTION_FRAMES': 6,            # Minimum on-screen duration of a caption
+    'MAX_CAPTION_DELAY_FRAMES': 2,      # How far a caption may start after its spoken time to lengthen the previous one
+
+    # Asset Preprocessing
+    'PREPROCESS_ASSETS': False,         # Probe, check and build proxies of the media in a process pool before the build
+    'PREPROCESS_WORKERS': None,         # Pool size, None = CPU count
+    'ASSET_MANIFEST': None,             # Defaults to assets/manifest.json next to OUTPUT_PATH
+    'PROXY_DIR': None,                  # Defaults to a 'proxies' folder next to the manifest
+    'BUILD_PROXIES': True,              # Downscale media larger than RESOLUTION
+    'CHECK_ASSET_INTEGRITY': True,      # Decode each asset once to catch broken files
+    'FFPROBE_BINARY': 'ffprobe',
+
+    # Lazy Media
+    'LAZY_MEDIA': False,                # Keep media resident only around its elements' frames while rendering
+    'MEDIA_PREFETCH_SECONDS': 2,        # Media is read ahead and loaded this long before it starts
+    'MEDIA_MEMORY_BUDGET_MB': None,     # Estimated texture memory budget, None = unlimited
+
+    # Keyframe Compaction
+    'COMPACT_KEYFRAMES': False,         # Remove redundant keys and constant fcurves after the build
+    'ANIMATION_EVAL_SAMPLES': 48,       # Frames evaluated to time animation before and after, 0 = skip
+
+    # Visibility Buckets
+    'VISIBILITY_BUCKETS': False,        # Only include the objects of the current time bucket in the depsgraph
+    'BUCKET_SECONDS': 10,               # Length of each bucket
+
+    # Multi-Aspect Output
+    # Each target is rendered from the same scene build, e.g.
+    # [{'name': '9x16', 'resolution': (1080, 1920)}, {'name': '1x1', 'resolution': (1080, 1080)},
+    #  {'name': '16x9', 'resolution': (1920, 1080)}]
+    'OUTPUT_TARGETS': [],               # Empty renders RESOLUTION to OUTPUT_PATH only
+    'OUTPUT_TARGETS_PARALLEL': False,   # Render each target in its own Blender process
+
+    # Timeline IR
+    'USE_TIMELINE_IR': False,           # Build the scene from the pure-Python timeline description
+    'INCREMENTAL_BUILD': False,         # Rebuild only the changed items of an existing .blend (needs USE_TIMELINE_IR)
+
+    # Parallel Build
+    'PARALLEL_BUILD': False,            # Compile time ranges of the timeline in separate Blender processes (uses the timeline IR)
+    'BUILD_WORKERS': None,              # Build processes, None = CPU count
+    'BUILD_PARTITION_MIN_ITEMS': 200,   # Captions and layers per process below which fewer processes are used
+
+    # Distributed Rendering
+    'DISTRIBUTED_RENDER': False,        # Render through frame-range leases other nodes can join with --join-render
+    'RENDER_SHARE_DIR': None,           # Shared directory, defaults to a 'distributed' folder next to OUTPUT_PATH
+    'LEASE_RANGE_SECONDS': 10,          # Length of each leased frame range
+    'LEASE_TIMEOUT': 60,                # Seconds without a heartbeat before a range is reclaimed
+    'LEASE_HEARTBEAT': 10,              # Seconds between heartbeats
+    'LEASE_POLL_SECONDS': 2,
+
+    # Worker Service
+    'BLENDER_BINARY': 'blender',        # Executable used for warm worker processes
+    'SERVICE_HOST': '127.0.0.1',
+    'SERVICE_PORT': 8765,
+    'SERVICE_WORKERS': 2,               # Warm Blender processes, use 2+ to overlap builds with renders
+    'SERVICE_JOB_DIR': None,            # Defaults to a 'jobs' folder next to OUTPUT_PATH
+    'SERVICE_STARTUP_TIMEOUT': 120,     # Seconds a worker may take to preload
+
+    # Windowed Rendering (long videos)
+    'WINDOWED_RENDER': False,           # Build and render the video one time window at a time
+    'WINDOW_SECONDS': 60,               # Length of each render window
+    'WINDOW_OVERLAP_SECONDS': 1.0,      # Objects active this close to a window are built into it
+    'WINDOW_SAVE_BLEND': False,         # Save a .blend per window next to the segments
+    'STREAM_REORDER_BUFFER': 64,        # Chunks buffered to restore timestamp order while streaming
+    'FFMPEG_BINARY': 'ffmpeg',
 }
@@ -2,6 +2,7 @@
 
 import bpy
 import os
+from modules import text_creator
 
 def apply(text_obj, start_frame, end_frame):
     """
@@ -16,6 +17,6 @@ def apply(text_obj, start_frame, end_frame):
             break
 
     if bold_font:
-        text_obj.data.font = bold_font
+        text_creator.set_text_font(text_obj, bold_font)
     else:
         print("Bold font not found. Using default font.")
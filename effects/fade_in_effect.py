@@ -2,17 +2,13 @@
 
 import bpy
 
-def apply(text_obj, start_frame, end_frame):
+# Name of the fade material in the template library
+FADE_MATERIAL_TEMPLATE = 'Template_Fade'
+
+def build_fade_nodes(material, color):
     """
-    Animates the text object's opacity to create a fade-in effect.
+    Replaces the material's nodes with an Emission/Transparent mix and returns the Mix Shader node.
     """
-    # Ensure the text object has a material
-    if not text_obj.data.materials:
-        material = bpy.data.materials.new(name=f"Material_{text_obj.name}")
-        text_obj.data.materials.append(material)
-    else:
-        material = text_obj.data.materials[0]
-
     # Enable nodes
     material.use_nodes = True
     nodes = material.node_tree.nodes
@@ -33,7 +29,40 @@ def apply(text_obj, start_frame, end_frame):
     material.node_tree.links.new(emission_node.outputs[0], mix_shader.inputs[2])
 
     # Set emission color
-    emission_node.inputs['Color'].default_value = text_obj.data.materials[0].node_tree.nodes['Emission'].inputs['Color'].default_value
+    emission_node.inputs['Color'].default_value = color
+    return mix_shader
+
+def apply(text_obj, start_frame, end_frame):
+    """
+    Animates the text object's opacity to create a fade-in effect.
+    """
+    # Ensure the text object has a material. The slot may link it to the object
+    # rather than to text data shared with other captions.
+    if not text_obj.material_slots:
+        text_obj.data.materials.append(bpy.data.materials.new(name=f"Material_{text_obj.name}"))
+    slot = text_obj.material_slots[0]
+    if slot.material is None:
+        slot.material = bpy.data.materials.new(name=f"Material_{text_obj.name}")
+    material = slot.material
+
+    # Keep the current emission color
+    color = (1, 1, 1, 1)
+    if material.node_tree and material.node_tree.nodes.get('Emission'):
+        color = tuple(material.node_tree.nodes['Emission'].inputs['Color'].default_value)
+
+    template = bpy.data.materials.get(FADE_MATERIAL_TEMPLATE)
+    if template is not None:
+        # Swap in a copy of the prebuilt fade material
+        name = material.name
+        slot.material = template.copy()
+        bpy.data.materials.remove(material)
+        material = slot.material
+        material.name = name
+        material.use_fake_user = False
+        material.node_tree.nodes['Emission'].inputs['Color'].default_value = color
+        mix_shader = next(node for node in material.node_tree.nodes if node.type == 'MIX_SHADER')
+    else:
+        mix_shader = build_fade_nodes(material, color)
 
     # Animate the 'Fac' of the Mix Shader
     mix_input = mix_shader.inputs['Fac']
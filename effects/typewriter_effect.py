@@ -1,10 +1,13 @@
 # effects/typewriter_effect.py
 
 import bpy
+from bpy.app.handlers import persistent
 
 def apply(text_obj, start_frame, end_frame):
     """
     Creates a typewriter effect by updating the text content on each frame.
+    The timing is stored on the object and one frame handler types every
+    caption, so reopening the .blend only needs register_handler().
     """
     text = text_obj.data.body
     total_chars = len(text)
@@ -13,6 +16,12 @@ def apply(text_obj, start_frame, end_frame):
     if total_chars == 0 or frame_duration == 0:
         return  # Nothing to animate
 
+    if text_obj.data.get('shared_text'):
+        # The handler rewrites the body, which would change every caption sharing it
+        text_obj.data = text_obj.data.copy()
+        text_obj.data.name = f"Text_{text_obj.name}"
+        del text_obj.data['shared_text']
+
     frames_per_char = max(1, frame_duration // total_chars)
 
     # Store the data we need in a custom property on the text object
@@ -22,39 +31,46 @@ def apply(text_obj, start_frame, end_frame):
         "frames_per_char": frames_per_char,
         "end_frame": end_frame
     }
+    register_handler()
 
-    # Define the frame change handler
-    def typewriter_handler(scene):
-        current_frame = scene.frame_current
-        obj = text_obj
-        if "typewriter_data" in obj:
-            data = obj["typewriter_data"]
-            start = data["start_frame"]
-            end = data["end_frame"]
-            frames_per_char = data["frames_per_char"]
-            full_text = data["full_text"]
-            total_chars = len(full_text)
-
-            if current_frame < start:
-                obj.data.body = ""
-            elif current_frame <= end:
-                chars_to_show = min(
-                    (current_frame - start) // frames_per_char + 1,
-                    total_chars
-                )
-                obj.data.body = full_text[:chars_to_show]
-            else:
-                obj.data.body = full_text  # Show full text after end_frame
-
-            # Remove handler after the effect is done
-            if current_frame > end:
-                bpy.app.handlers.frame_change_post.remove(typewriter_handler)
-                del obj["typewriter_data"]
-
-    # Remove existing handlers added by this script
-    for handler in bpy.app.handlers.frame_change_post:
-        if hasattr(handler, '__name__') and handler.__name__ == "typewriter_handler":
-            bpy.app.handlers.frame_change_post.remove(handler)
+def get_typed_text(data, frame):
+    """
+    Returns the part of the text typed at the frame.
+    """
+    full_text = data["full_text"]
+    start = data["start_frame"]
+    if frame < start:
+        return ""
+    if frame <= data["end_frame"]:
+        chars_to_show = min((frame - start) // data["frames_per_char"] + 1, len(full_text))
+        return full_text[:chars_to_show]
+    return full_text  # Show full text after end_frame
 
-    # Register the handler
+def get_settle_frame(data):
+    """
+    Returns the frame at which the whole text is shown.
+    """
+    typing_frames = (len(data["full_text"]) - 1) * data["frames_per_char"]
+    return min(data["end_frame"], data["start_frame"] + typing_frames)
+
+@persistent
+def typewriter_handler(scene, depsgraph=None):
+    current_frame = scene.frame_current
+    for obj in scene.objects:
+        data = obj.get("typewriter_data")
+        if data is None:
+            continue
+        body = get_typed_text(data, current_frame)
+        # Setting the body rebuilds the text curve, so only touch captions that change
+        if obj.data.body != body:
+            obj.data.body = body
+
+def register_handler():
+    """
+    Registers the frame handler once. Frame handlers are not stored in a .blend,
+    so call this again after opening a file with typewriter captions.
+    """
+    for handler in list(bpy.app.handlers.frame_change_post):
+        if getattr(handler, '__name__', '') == typewriter_handler.__name__:
+            bpy.app.handlers.frame_change_post.remove(handler)
     bpy.app.handlers.frame_change_post.append(typewriter_handler)
@@ -1,43 +1,140 @@
 # main.py
 
 import bpy
-import sys
 import os
 
 # print blender version
 print(bpy.app.version_string)
 
-# Adjust the path to ensure modules and effects can be imported
 script_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(os.path.join(script_dir, 'modules'))
-sys.path.append(os.path.join(script_dir, 'effects'))
 
+# The pipeline modules are imported by the stages that use them, so importing
+# main costs little and jobs only load the subsystems they enable
 from config import CONFIG
-from modules import parser, text_creator, effect_manager, renderer, setup_scene, visual_elements_manager
 
-def main():
+def run_stage(stage_hook, name, func, *args, **kwargs):
+    """
+    Runs one pipeline stage. When a stage_hook is given, the stage is run through
+    stage_hook(name, func, *args, **kwargs) so callers can time or profile it.
+    """
+    if stage_hook is None:
+        return func(*args, **kwargs)
+    return stage_hook(name, func, *args, **kwargs)
+
+def apply_text_effects(text_objects, chunks, effects_list, config):
+    """
+    Applies the effects to every text object over its chunk's frame range.
+    """
+    from modules import chunk_normalizer, effect_manager
+
+    for text_obj, chunk in zip(text_objects, chunks):
+        start_frame, end_frame = chunk_normalizer.get_chunk_frames(chunk, config['FRAME_RATE'])
+        effect_manager.apply_effects(text_obj, effects_list, start_frame, end_frame)
+
+def main(config=None, data_file=None, visual_elements_file=None, blend_path='output.blend', render=True, stage_hook=None):
     # Step 1: Load configurations
-    config = CONFIG
-    setup_scene.setup_scene(config)
+    config = config or CONFIG
+    visual_elements_file = visual_elements_file or os.path.join(script_dir,'visual_elements.json')
+    data_file = data_file or os.path.join(script_dir, 'transcript.json')
+
+    # Opt-in profiling of every stage
+    profiler = None
+    if stage_hook is None and config.get('PROFILE_PIPELINE'):
+        from modules import pipeline_profiler
+        profiler = pipeline_profiler.PipelineProfiler(config)
+        stage_hook = profiler.stage_hook
+
+    try:
+        run_pipeline(config, data_file, visual_elements_file, blend_path, render, stage_hook)
+    finally:
+        if profiler is not None:
+            profiler.write_report()
+
+def preprocess_visual_elements(visual_elements, config, stage_hook):
+    """
+    Probes the assets in a worker pool and attaches their manifest entries.
+    Elements whose asset failed the checks are dropped.
+    """
+    from modules import asset_preprocessor
+    manifest = run_stage(stage_hook, 'preprocess_assets', asset_preprocessor.preprocess_assets, visual_elements, config)
+    return asset_preprocessor.apply_manifest(visual_elements, manifest)
+
+def build_timeline_scene(config, data_file, visual_elements_file, blend_path, stage_hook):
+    """
+    Builds the scene through the timeline IR. With INCREMENTAL_BUILD and an existing
+    blend_path, only the items that changed since that .blend was built are rebuilt.
+    Returns False if there is nothing to build.
+    """
+    from modules import chunk_normalizer, parser, setup_scene, timeline, timeline_compiler
+
+    visual_elements = run_stage(stage_hook, 'parse_visual_elements', parser.parse_visual_elements, visual_elements_file)
+    if visual_elements and config.get('PREPROCESS_ASSETS'):
+        visual_elements = preprocess_visual_elements(visual_elements, config, stage_hook)
+    chunks = run_stage(stage_hook, 'parse_data', parser.parse_data, data_file, config)
+    if not chunks and not visual_elements:
+        print("No data to process.")
+        return False
+    if chunks and config.get('NORMALIZE_CHUNKS', True):
+        chunks = run_stage(stage_hook, 'normalize_chunks', chunk_normalizer.normalize_chunks, chunks, config)
+
+    timeline_data = run_stage(stage_hook, 'build_timeline', timeline.build_timeline, chunks, visual_elements, config)
+    if config.get('INCREMENTAL_BUILD') and os.path.isfile(blend_path):
+        diff = run_stage(stage_hook, 'rebuild_timeline', timeline_compiler.rebuild_blend, blend_path, timeline_data, config)
+        if diff is not None:
+            return True
+        # The opened .blend cannot be reused
+        setup_scene.reset_to_empty_scene()
+
+    run_stage(stage_hook, 'setup_scene', setup_scene.setup_scene, config)
+    if config.get('PARALLEL_BUILD'):
+        from modules import parallel_build
+        run_stage(stage_hook, 'parallel_build', parallel_build.build_parallel, timeline_data, config)
+    else:
+        run_stage(stage_hook, 'compile_timeline', timeline_compiler.compile_timeline, timeline_data, config)
+    return True
+
+def run_pipeline(config, data_file, visual_elements_file, blend_path, render, stage_hook):
+    """
+    Builds the scene from the inputs, saves it and renders it.
+    """
+    if (config.get('USE_TIMELINE_IR') or config.get('PARALLEL_BUILD')) and not config.get('WINDOWED_RENDER'):
+        if build_timeline_scene(config, data_file, visual_elements_file, blend_path, stage_hook):
+            finish_pipeline(config, blend_path, render, stage_hook)
+        return
+
+    from modules import setup_scene
+    run_stage(stage_hook, 'setup_scene', setup_scene.setup_scene, config)
+
+    # Long videos are built and rendered one time window at a time
+    if config.get('WINDOWED_RENDER'):
+        from modules import windowed_renderer
+        windowed_renderer.render_windowed(data_file, visual_elements_file, config)
+        return
 
-    visual_elements_file = os.path.join(script_dir,'visual_elements.json')
-    visual_elements = parser.parse_visual_elements(visual_elements_file)
+    from modules import chunk_normalizer, effect_manager, parser, text_creator, visual_elements_manager
+
+    visual_elements = run_stage(stage_hook, 'parse_visual_elements', parser.parse_visual_elements, visual_elements_file)
+    if visual_elements and config.get('PREPROCESS_ASSETS'):
+        visual_elements = preprocess_visual_elements(visual_elements, config, stage_hook)
     if visual_elements:
         # Step 1.3: Add visual elements to the scene
-        visual_elements_manager.add_visual_elements(visual_elements, config)
+        run_stage(stage_hook, 'add_visual_elements', visual_elements_manager.add_visual_elements, visual_elements, config)
     else:
         print("No visual elements to add.")
 
     # Step 2: Parse data
-    data_file = os.path.join(script_dir, 'transcript.json')
-    chunks = parser.parse_data(data_file)
+    chunks = run_stage(stage_hook, 'parse_data', parser.parse_data, data_file, config)
 
     if not chunks:
         print("No data to process.")
         return
 
+    # Step 2.1: Merge redundant chunks and resolve overlapping frames
+    if config.get('NORMALIZE_CHUNKS', True):
+        chunks = run_stage(stage_hook, 'normalize_chunks', chunk_normalizer.normalize_chunks, chunks, config)
+
     # Step 3: Create text objects
-    text_objects = text_creator.create_text_objects(chunks, config)
+    text_objects = run_stage(stage_hook, 'create_text_objects', text_creator.create_text_objects, chunks, config)
 
     if not text_objects:
         print("No text objects created.")
@@ -49,24 +146,56 @@ def main():
     if not effects_list:
         print("No effects to apply.")
     else:
-        for text_obj, chunk in zip(text_objects, chunks):
-            start_frame = int(chunk['timestamp'][0] * config['FRAME_RATE'])
-            end_frame = int(chunk['timestamp'][1] * config['FRAME_RATE'])
-            effect_manager.apply_effects(text_obj, effects_list, start_frame, end_frame)
+        run_stage(stage_hook, 'apply_effects', apply_text_effects, text_objects, chunks, effects_list, config)
 
     #set number of frames for the animation
-    bpy.context.scene.frame_end = int(chunks[-1]['timestamp'][1] * config['FRAME_RATE'])
+    bpy.context.scene.frame_end = chunk_normalizer.get_chunk_frames(chunks[-1], config['FRAME_RATE'])[1]
+    finish_pipeline(config, blend_path, render, stage_hook)
+
+def finish_pipeline(config, blend_path, render, stage_hook):
+    """
+    Applies the frame limit, saves the .blend and renders it.
+    """
+    from modules import renderer
+
     #add audio file to the scene
-    bpy.context.scene.frame_end=150
+    if config.get('FRAME_LIMIT'):
+        bpy.context.scene.frame_end = config['FRAME_LIMIT']
+
+    # Drop keyframes and fcurves that do not change the animation
+    if config.get('COMPACT_KEYFRAMES'):
+        from modules import keyframe_compactor
+        run_stage(stage_hook, 'compact_keyframes', keyframe_compactor.compact_keyframes, config)
+
+    # Group timed objects into collections that are only included around their frames
+    if config.get('VISIBILITY_BUCKETS'):
+        from modules import visibility_buckets
+        run_stage(stage_hook, 'visibility_buckets', visibility_buckets.build_visibility_buckets, config)
     bpy.context.preferences.filepaths.use_file_compression = False
     #save the blend file
-    bpy.ops.wm.save_as_mainfile(filepath='output.blend')
+    run_stage(stage_hook, 'save', bpy.ops.wm.save_as_mainfile, filepath=blend_path)
 
     # Step 5: Set up rendering
-    renderer.setup_rendering(config)
-
-    # Step 6: Render the animation
-    renderer.render_animation()
+    run_stage(stage_hook, 'setup_rendering', renderer.setup_rendering, config)
+
+    # Step 5.1: Report what is about to be rendered and how long it should take
+    if config.get('SCENE_REPORT'):
+        from modules import scene_report
+        run_stage(stage_hook, 'scene_report', scene_report.report_scene, config)
+
+    # Step 6: Render the animation, once per aspect when OUTPUT_TARGETS are set,
+    # or only the frames where something changes for a CHANGE_PREVIEW
+    if render and config.get('CHANGE_PREVIEW'):
+        from modules import change_preview
+        run_stage(stage_hook, 'change_preview', change_preview.render_change_preview, config)
+    elif render and config.get('DISTRIBUTED_RENDER'):
+        from modules import distributed_render
+        run_stage(stage_hook, 'distributed_render', distributed_render.start_distributed_render, config)
+    elif render and config.get('OUTPUT_TARGETS'):
+        from modules import multi_output
+        run_stage(stage_hook, 'render_targets', multi_output.render_targets, config, blend_path)
+    elif render:
+        run_stage(stage_hook, 'render', renderer.render_animation, config)
 
 if __name__ == "__main__":
     main()
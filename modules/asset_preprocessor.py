@@ -0,0 +1,291 @@
+# modules/asset_preprocessor.py
+#
+# Validates and prepares the media of the visual elements before the scene is
+# built. Runs without bpy, so assets are processed in a pool of worker processes:
+#   python -m modules.asset_preprocessor visual_elements.json
+#
+# The resulting manifest holds per asset its metadata, cover-fit mapping and
+# proxy path; the scene builder loads the proxy and uses the stored fit.
+
+import concurrent.futures
+import contextlib
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import shutil
+import struct
+import subprocess
+import sys
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import framing
+
+MANIFEST_VERSION = 1
+
+# Video planes are cropped towards the top like in create_material_with_chroma_key_media
+WIDE_Y_LOCATION = {'image': 0, 'video': 0.94}
+
+def get_manifest_path(config):
+    return config.get('ASSET_MANIFEST') or os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'assets', 'manifest.json')
+
+def get_proxy_dir(config):
+    return config.get('PROXY_DIR') or os.path.join(os.path.dirname(get_manifest_path(config)), 'proxies')
+
+def get_source_key(path):
+    """
+    Returns a key that changes whenever the source file changes.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+def read_png_size(path):
+    """
+    Reads the dimensions from a PNG header, used when ffprobe is unavailable.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+def probe(path, ffprobe_binary):
+    """
+    Returns the (width, height, duration, fps) of the first video stream of a file.
+    """
+    if shutil.which(ffprobe_binary) is None:
+        size = read_png_size(path)
+        if size is None:
+            raise ValueError(f"{ffprobe_binary} not found and not a PNG file")
+        return size[0], size[1], None, None
+
+    command = [ffprobe_binary, '-v', 'error', '-select_streams', 'v:0', '-print_format', 'json',
+               '-show_entries', 'stream=width,height,avg_frame_rate,duration:format=duration', path]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise ValueError(completed.stderr.strip() or "ffprobe failed")
+    info = json.loads(completed.stdout)
+    if not info.get('streams'):
+        raise ValueError("No video or image stream")
+
+    stream = info['streams'][0]
+    duration = stream.get('duration') or info.get('format', {}).get('duration')
+    fps = None
+    if stream.get('avg_frame_rate', '0/0') != '0/0':
+        numerator, denominator = stream['avg_frame_rate'].split('/')
+        fps = int(numerator) / int(denominator) if int(denominator) else None
+    return int(stream['width']), int(stream['height']), float(duration) if duration else None, fps
+
+def get_proxy_size(width, height, resolution):
+    """
+    Returns the smallest even size that still covers the output resolution, or
+    None if the source is not larger than that.
+    """
+    scale = max(resolution[0] / width, resolution[1] / height)
+    if scale >= 1:
+        return None
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+def build_proxy(path, media, proxy_size, proxy_dir, ffmpeg_binary):
+    """
+    Writes a downscaled copy of the asset. Returns its path.
+    """
+    digest = hashlib.sha1(f"{os.path.abspath(path)}:{get_source_key(path)}:{proxy_size}".encode('utf-8')).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(path))[0]
+    extension = '.mp4' if media == 'video' else '.png'
+    proxy_path = os.path.join(proxy_dir, f"{name}_{digest}{extension}")
+    if os.path.isfile(proxy_path):
+        return proxy_path
+
+    command = [ffmpeg_binary, '-y', '-v', 'error', '-i', path, '-vf', f"scale={proxy_size[0]}:{proxy_size[1]}"]
+    if media == 'video':
+        command += ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18', '-pix_fmt', 'yuv420p', '-an']
+    else:
+        command += ['-frames:v', '1']
+    temp_path = proxy_path + '.tmp' + extension
+    completed = subprocess.run(command + [temp_path], capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise ValueError(f"Proxy failed: {completed.stderr.strip()}")
+    os.replace(temp_path, proxy_path)
+    return proxy_path
+
+def check_integrity(path, media, ffmpeg_binary):
+    """
+    Decodes the whole image, or the first second of a video, to catch truncated files.
+    """
+    if shutil.which(ffmpeg_binary) is None:
+        return
+    command = [ffmpeg_binary, '-v', 'error', '-i', path]
+    if media == 'video':
+        command += ['-t', '1']
+    completed = subprocess.run(command + ['-f', 'null', '-'], capture_output=True, text=True)
+    if completed.returncode != 0 or completed.stderr.strip():
+        raise ValueError(f"Decode errors: {completed.stderr.strip()[:200]}")
+
+def process_asset(path, media, settings):
+    """
+    Returns the manifest entry for one asset. Runs in a worker process.
+    """
+    entry = {'path': path, 'media': media, 'ok': False}
+    try:
+        if not os.path.isfile(path):
+            raise ValueError("File not found")
+        entry['source_key'] = get_source_key(path)
+        width, height, duration, fps = probe(path, settings['ffprobe'])
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid dimensions {width}x{height}")
+        if media == 'video' and not duration:
+            raise ValueError("Video has no duration")
+        if settings['check_integrity']:
+            check_integrity(path, media, settings['ffmpeg'])
+
+        resolution = settings['resolution']
+        image_aspect = width / height
+        plane_aspect = framing.get_aspect(resolution)
+        entry.update({
+            'width': width,
+            'height': height,
+            'duration': duration,
+            'fps': fps,
+            'image_aspect': image_aspect,
+            'uv_fit': framing.cover_fit(image_aspect, plane_aspect, WIDE_Y_LOCATION[media]),
+            'proxy_path': None,
+        })
+
+        proxy_size = get_proxy_size(width, height, resolution) if settings['build_proxies'] else None
+        if proxy_size is not None and shutil.which(settings['ffmpeg']):
+            entry['proxy_path'] = build_proxy(path, media, proxy_size, settings['proxy_dir'], settings['ffmpeg'])
+            entry['proxy_size'] = proxy_size
+
+        # Aspect ratios far from the output get cropped heavily
+        crop = 1 - entry['uv_fit'][0] * entry['uv_fit'][1]
+        entry['warnings'] = [f"{crop:.0%} of the image is cropped"] if crop > 0.6 else []
+        entry['ok'] = True
+    except (OSError, ValueError, KeyError) as e:
+        entry['error'] = str(e)
+    return entry
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if manifest.get('version') == MANIFEST_VERSION else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+@contextlib.contextmanager
+def worker_main_module():
+    """
+    Spawned workers re-import the parent's main module. Point them at this module
+    instead of the script that started Blender, which would run the pipeline again.
+    """
+    main_module = sys.modules.get('__main__')
+    saved_spec = getattr(main_module, '__spec__', None)
+    if main_module is not None and saved_spec is None:
+        main_module.__spec__ = importlib.util.find_spec('modules.asset_preprocessor')
+    try:
+        yield
+    finally:
+        if main_module is not None:
+            main_module.__spec__ = saved_spec
+
+def make_pool(workers):
+    """
+    Returns a process pool, or a thread pool where processes cannot be started.
+    Probing and scaling run in ffprobe/ffmpeg subprocesses, so threads still overlap them.
+    """
+    try:
+        # Spawned workers do not inherit Blender's state
+        return concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+    except (OSError, ValueError, NotImplementedError) as e:
+        print(f"Process pool unavailable ({e}), using threads")
+        return concurrent.futures.ThreadPoolExecutor(workers)
+
+def run_pool(pool, pending, settings):
+    futures = {key: pool.submit(process_asset, element['file_path'], element['media'], settings)
+               for key, element in pending.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+def preprocess_assets(visual_elements, config):
+    """
+    Probes, checks and builds proxies for every asset of the visual elements in a
+    worker pool. Unchanged assets of a previous manifest are reused.
+    Writes and returns the manifest.
+    """
+    manifest_path = get_manifest_path(config)
+    settings = {
+        'resolution': list(config['RESOLUTION']),
+        'ffmpeg': config.get('FFMPEG_BINARY', 'ffmpeg'),
+        'ffprobe': config.get('FFPROBE_BINARY', 'ffprobe'),
+        'proxy_dir': get_proxy_dir(config),
+        'build_proxies': config.get('BUILD_PROXIES', True),
+        'check_integrity': config.get('CHECK_ASSET_INTEGRITY', True),
+    }
+    if not os.path.exists(settings['proxy_dir']):
+        os.makedirs(settings['proxy_dir'])
+
+    previous = load_manifest(manifest_path)
+    reusable = {}
+    if previous is not None and previous.get('settings') == settings:
+        reusable = previous['assets']
+
+    assets = {}
+    pending = {}
+    for element in visual_elements:
+        key = f"{element['media']}:{element['file_path']}"
+        if key in assets or key in pending:
+            continue
+        old = reusable.get(key)
+        try:
+            unchanged = old is not None and old.get('source_key') == get_source_key(element['file_path'])
+        except OSError:
+            unchanged = False
+        if unchanged and (old['proxy_path'] is None or os.path.isfile(old['proxy_path'])):
+            assets[key] = old
+        else:
+            pending[key] = element
+
+    if pending:
+        workers = min(config.get('PREPROCESS_WORKERS') or os.cpu_count() or 1, len(pending))
+        try:
+            with worker_main_module(), make_pool(workers) as pool:
+                assets.update(run_pool(pool, pending, settings))
+        except concurrent.futures.process.BrokenProcessPool:
+            print("Process pool failed, preprocessing assets in threads")
+            with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+                assets.update(run_pool(pool, pending, settings))
+
+    manifest = {'version': MANIFEST_VERSION, 'settings': settings, 'assets': assets}
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    failed = [entry for entry in assets.values() if not entry['ok']]
+    for entry in failed:
+        print(f"Asset problem: {entry['path']}: {entry['error']}")
+    for entry in assets.values():
+        for warning in entry.get('warnings', []):
+            print(f"Asset warning: {entry['path']}: {warning}")
+    print(f"Preprocessed {len(assets)} assets ({len(pending)} processed, {len(failed)} failed)")
+    return manifest
+
+def apply_manifest(visual_elements, manifest):
+    """
+    Attaches each element's manifest entry as element['asset'] and drops elements
+    whose asset failed, so the scene builder never opens a broken file.
+    """
+    usable = []
+    for element in visual_elements:
+        entry = manifest['assets'].get(f"{element['media']}:{element['file_path']}")
+        if entry is not None and entry['ok']:
+            usable.append(dict(element, asset=entry))
+    return usable
+
+if __name__ == "__main__":
+    from config import BASE_DIR, CONFIG
+    from modules import parser
+
+    elements_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, 'visual_elements.json')
+    preprocess_assets(parser.parse_visual_elements(elements_path), CONFIG)
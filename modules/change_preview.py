@@ -0,0 +1,164 @@
+# modules/change_preview.py
+#
+# QA preview of a built scene. Instead of every frame, only the frames where the
+# visible state changes are rendered: each caption once its effects (fades,
+# typing) have settled, and where visual elements appear, disappear and reach
+# their effect keyframes (zoom cycles). The stills are tiled into contact sheets
+# and/or joined into a short slideshow.
+
+import bpy
+import os
+import shutil
+import subprocess
+from modules import effect_manager, renderer, scene_stats
+
+# Keyframes of these paths only toggle visibility, already covered by the frame ranges
+VISIBILITY_PATHS = ('hide_render', 'hide_viewport')
+
+def get_keyframe_frames(id_data):
+    """
+    Returns the frames of an ID's effect keyframes.
+    """
+    animation_data = getattr(id_data, 'animation_data', None)
+    if animation_data is None or animation_data.action is None:
+        return set()
+    frames = set()
+    for fcurve in scene_stats.iter_action_fcurves(animation_data.action):
+        if fcurve.data_path not in VISIBILITY_PATHS:
+            frames.update(round(point.co[0]) for point in fcurve.keyframe_points)
+    return frames
+
+def get_object_keyframe_frames(obj):
+    """
+    Returns the frames of the effect keyframes of an object, its data and its materials.
+    """
+    keys = get_keyframe_frames(obj) | get_keyframe_frames(obj.data)
+    for slot in obj.material_slots:
+        if slot.material is not None and slot.material.node_tree is not None:
+            keys |= get_keyframe_frames(slot.material.node_tree)
+    return keys
+
+def get_settle_frame(obj, frame_range):
+    """
+    Returns the first frame of a caption's range at which its effect keys have
+    settled and its text is fully typed, or the range's last frame if they never do.
+    """
+    settle = max([frame_range[0]] + [frame for frame in get_object_keyframe_frames(obj) if frame >= frame_range[0]])
+    if 'typewriter_data' in obj:
+        from effects import typewriter_effect
+        settle = max(settle, typewriter_effect.get_settle_frame(obj['typewriter_data']))
+    return min(settle, frame_range[1])
+
+def collect_change_frames(scene):
+    """
+    Returns the sorted frames of the scene's frame range at which the visible
+    state changes: a caption after its effects settle, and a visual element
+    appearing, disappearing or reaching one of its effect keyframes.
+    """
+    frames = {scene.frame_start}
+    for obj in scene.objects:
+        frame_range = tuple(obj['frame_range']) if 'frame_range' in obj else None
+        if obj.type == 'FONT' and frame_range is not None:
+            # One still per caption; captions follow each other, so the next one's still shows it gone
+            frames.add(get_settle_frame(obj, frame_range))
+            continue
+        if frame_range is not None:
+            frames.update((frame_range[0], frame_range[1] + 1))
+
+        keys = get_object_keyframe_frames(obj)
+        if frame_range is not None:
+            keys = {frame for frame in keys if frame_range[0] <= frame <= frame_range[1]}
+        frames.update(keys)
+    return sorted(frame for frame in frames if scene.frame_start <= frame <= scene.frame_end)
+
+def thin_frames(frames, min_gap):
+    """
+    Keeps one frame of each run of frames within min_gap frames of the run's
+    first frame: the last one, when the effects starting in the run are furthest along.
+    """
+    kept = []
+    run_start = None
+    for frame in frames:
+        if run_start is None or frame - run_start >= min_gap:
+            run_start = frame
+            kept.append(frame)
+        else:
+            kept[-1] = frame
+    return kept
+
+def get_preview_paths(config):
+    base = os.path.splitext(config['OUTPUT_PATH'])[0]
+    return base + '_preview', base + '_contact_sheet_%03d.png', base + '_preview.mp4'
+
+def render_stills(scene, frames, still_dir):
+    """
+    Renders each frame to a numbered PNG with its frame number and time stamped on it.
+    """
+    if os.path.isdir(still_dir):
+        shutil.rmtree(still_dir)
+    os.makedirs(still_dir)
+
+    scene.render.image_settings.file_format = 'PNG'
+    # Stills are not played back, stamp the time of the full frame rate
+    scene.render.fps_base = 1
+    scene.render.use_stamp = True
+    scene.render.use_stamp_frame = True
+    scene.render.use_stamp_time = True
+    current = scene.frame_current
+    for index, frame in enumerate(frames):
+        scene.frame_set(frame)
+        scene.render.filepath = os.path.join(still_dir, f"change_{index:05d}.png")
+        bpy.ops.render.render(write_still=True)
+    scene.frame_set(current)
+    return os.path.join(still_dir, 'change_%05d.png')
+
+def write_contact_sheets(still_pattern, sheet_pattern, config):
+    columns = config.get('PREVIEW_COLUMNS', 6)
+    rows = config.get('PREVIEW_ROWS', 5)
+    command = [config.get('FFMPEG_BINARY', 'ffmpeg'), '-y', '-v', 'error', '-i', still_pattern,
+               '-vf', f"tile={columns}x{rows}:padding=4:margin=4", sheet_pattern]
+    return subprocess.run(command, capture_output=True, text=True)
+
+def write_slideshow(still_pattern, video_path, config):
+    command = [config.get('FFMPEG_BINARY', 'ffmpeg'), '-y', '-v', 'error',
+               '-framerate', str(1 / config.get('PREVIEW_SLIDE_SECONDS', 0.5)), '-i', still_pattern,
+               '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+               '-r', str(config['FRAME_RATE']), video_path]
+    return subprocess.run(command, capture_output=True, text=True)
+
+def render_change_preview(config):
+    """
+    Renders the change frames of the current scene with PREVIEW_PROFILE and writes
+    the contact sheets and/or slideshow selected by PREVIEW_OUTPUT.
+    Returns the rendered frames.
+    """
+    scene = bpy.context.scene
+    renderer.setup_rendering(config, config.get('PREVIEW_PROFILE', 'draft'))
+    # Frame handlers are not stored in the .blend, so re-register the bucket switch
+    # and the handlers of effects such as the typewriter
+    if scene.get('visibility_buckets'):
+        from modules import visibility_buckets
+        visibility_buckets.register_handler()
+    effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+
+    all_frames = collect_change_frames(scene)
+    min_gap = max(1, int(config.get('PREVIEW_MIN_GAP_SECONDS', 0.25) * scene.render.fps))
+    frames = thin_frames(all_frames, min_gap)
+    total = scene.frame_end - scene.frame_start + 1
+    print(f"Change preview: {len(frames)} of {total} frames ({len(all_frames)} change points)")
+
+    still_dir, sheet_pattern, video_path = get_preview_paths(config)
+    still_pattern = render_stills(scene, frames, still_dir)
+
+    output = config.get('PREVIEW_OUTPUT', 'both')
+    results = []
+    if output in ('contact_sheet', 'both'):
+        results.append((sheet_pattern % 1, write_contact_sheets(still_pattern, sheet_pattern, config)))
+    if output in ('slideshow', 'both'):
+        results.append((video_path, write_slideshow(still_pattern, video_path, config)))
+    for path, result in results:
+        if result.returncode != 0:
+            print(f"Failed to write {path}: {result.stderr.strip()}")
+        else:
+            print("Preview saved to:", path)
+    return frames
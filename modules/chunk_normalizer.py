@@ -0,0 +1,137 @@
+# modules/chunk_normalizer.py
+
+import functools
+from modules import chunk_store
+
+def get_chunk_frames(chunk, frame_rate):
+    """
+    Returns the (start_frame, end_frame) of a chunk.
+    Quantized chunks carry their frame range, raw chunks are converted from
+    their timestamp with the same rounding. A chunk without an end time lasts one frame.
+    """
+    if 'frames' in chunk:
+        return tuple(chunk['frames'])
+    _, start_frame, end_frame = _quantize(chunk, frame_rate, 1)
+    return start_frame, end_frame
+
+@functools.lru_cache(maxsize=65536)
+def _words(text):
+    return tuple(text.casefold().split())
+
+# Transcripts repeat the same few phrases, so most text pairs were compared before
+@functools.lru_cache(maxsize=65536)
+def _is_redundant(previous_text, text):
+    """
+    Returns True if one text is the same as, or contained in, the other on word boundaries.
+    """
+    a, b = _words(previous_text), _words(text)
+    if not a or not b:
+        return not b
+    short, long = (a, b) if len(a) <= len(b) else (b, a)
+    return any(long[i:i + len(short)] == short for i in range(len(long) - len(short) + 1))
+
+def _quantize(chunk, frame_rate, min_frames):
+    start_time, end_time = chunk['timestamp']
+    start_frame = int(round(start_time * frame_rate))
+    if end_time is None:
+        end_frame = start_frame + min_frames - 1
+    else:
+        end_frame = int(round(end_time * frame_rate))
+    return chunk['text'], start_frame, max(start_frame, end_frame)
+
+def _normalize_frames(items, min_frames, max_delay=0):
+    """
+    Normalizes time-ordered (text, start_frame, end_frame) items.
+    A caption starts at most max_delay frames after its own start frame.
+    Yields [text, start_frame, end_frame] lists.
+    """
+    pending = None
+
+    for text, start_frame, end_frame in items:
+        if not text.strip():
+            continue
+        chunk = [text, start_frame, end_frame]
+
+        if pending is None:
+            pending = chunk
+            continue
+
+        # Merge redundant captions that touch or overlap in time
+        if chunk[1] <= pending[2] + 1 and _is_redundant(pending[0], chunk[0]):
+            if len(_words(chunk[0])) > len(_words(pending[0])):
+                pending[0] = chunk[0]
+            pending[2] = max(pending[2], chunk[2])
+            continue
+
+        # Enforce the minimum duration, then resolve the boundary with the next caption
+        pending[2] = max(pending[2], pending[1] + min_frames - 1)
+        if chunk[1] <= pending[2]:
+            if chunk[1] - pending[1] >= min_frames:
+                pending[2] = chunk[1] - 1
+            else:
+                # The next caption gives way by at most max_delay frames and this one
+                # is shortened, so a run of short captions does not drift behind the audio
+                start_frame = min(pending[1] + min_frames, chunk[1] + max_delay)
+                if start_frame <= pending[1]:
+                    # No frame left for this caption, it is shown with the next one
+                    chunk[0] = pending[0].rstrip() + ' ' + chunk[0].lstrip()
+                    chunk[1] = pending[1]
+                    pending = chunk
+                    continue
+                pending[2] = start_frame - 1
+                chunk[1] = start_frame
+                chunk[2] = max(chunk[2], start_frame)
+
+        yield pending
+        pending = chunk
+
+    if pending is not None:
+        pending[2] = max(pending[2], pending[1] + min_frames - 1)
+        yield pending
+
+def iter_normalized_chunks(chunks, config):
+    """
+    Normalizes a time-ordered chunk stream:
+    - merges neighbouring chunks whose text is identical or contained in the other,
+    - resolves overlapping and shared boundary frames so only one caption is visible per frame,
+    - enforces a minimum on-screen duration of CONFIG['MIN_CAPTION_FRAMES'] where the
+      next caption starts late enough, delaying it by at most CONFIG['MAX_CAPTION_DELAY_FRAMES'].
+    Each yielded chunk has 'text', 'timestamp' and a resolved inclusive 'frames' range.
+    """
+    frame_rate = config['FRAME_RATE']
+    min_frames = max(1, config.get('MIN_CAPTION_FRAMES', 1))
+    max_delay = max(0, config.get('MAX_CAPTION_DELAY_FRAMES', 2))
+    items = (_quantize(chunk, frame_rate, min_frames) for chunk in chunks)
+    for text, start_frame, end_frame in _normalize_frames(items, min_frames, max_delay):
+        yield {'text': text, 'frames': [start_frame, end_frame],
+               'timestamp': [start_frame / frame_rate, end_frame / frame_rate]}
+
+def normalize_store(store, config):
+    """
+    Normalizes a ChunkStore straight from its frame table, without building a
+    dict per chunk. Returns a new ChunkStore.
+    """
+    frame_rate = config['FRAME_RATE']
+    min_frames = max(1, config.get('MIN_CAPTION_FRAMES', 1))
+    if store.frames is None:
+        store.quantize(frame_rate, min_frames)
+    texts = [store.texts[text_id] for text_id in store.text_ids.tolist()]
+    max_delay = max(0, config.get('MAX_CAPTION_DELAY_FRAMES', 2))
+    items = zip(texts, store.frames[:, 0].tolist(), store.frames[:, 1].tolist())
+    rows = list(_normalize_frames(items, min_frames, max_delay))
+    return chunk_store.ChunkStore.from_frames(rows, frame_rate)
+
+def normalize_chunks(chunks, config):
+    """
+    Normalizes a list of chunks and reports the counts before and after.
+    Returns the normalized list, or a ChunkStore when given one.
+    """
+    if isinstance(chunks, chunk_store.ChunkStore):
+        # A ChunkStore is already ordered by start time
+        normalized = normalize_store(chunks, config)
+    else:
+        chunks = sorted(chunks, key=lambda c: c['timestamp'][0])
+        normalized = list(iter_normalized_chunks(chunks, config))
+
+    print(f"Chunk normalization: {len(chunks)} -> {len(normalized)} chunks")
+    return normalized
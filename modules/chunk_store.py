@@ -0,0 +1,227 @@
+# modules/chunk_store.py
+#
+# Column store for transcript chunks. Texts are interned and the timestamps and
+# frame ranges of all chunks are held in NumPy arrays, so validation, sorting and
+# frame quantization run over every chunk at once. Iterating the store yields
+# plain chunk dicts, so the pipeline modules consume it like the parsed list.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Bundled with Blender, may be missing in other interpreters
+    np = None
+
+def available():
+    return np is not None
+
+def iter_validated_chunks(chunks, counts=None):
+    """
+    Validates a chunk stream one chunk at a time, with the rules of
+    validate_chunks(): chunks without a start time are dropped and an end
+    before the start is clamped. The number of chunks hit by each rule is
+    added to the optional `counts` dict. Raises ValueError for malformed chunks.
+    """
+    if counts is None:
+        counts = {}
+    for index, chunk in enumerate(chunks):
+        try:
+            text = chunk['text']
+            start_time, end_time = chunk['timestamp']
+            start_time = None if start_time is None else float(start_time)
+            end_time = None if end_time is None else float(end_time)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Chunk {index} needs 'text' and a [start, end] 'timestamp'")
+        if start_time is None:
+            counts['no_start'] = counts.get('no_start', 0) + 1
+            continue
+        if end_time is None:
+            counts['no_end'] = counts.get('no_end', 0) + 1
+        elif end_time < start_time:
+            counts['backwards'] = counts.get('backwards', 0) + 1
+            end_time = start_time
+        yield {'text': text, 'timestamp': [start_time, end_time]}
+
+def describe_problems(counts):
+    """
+    Returns the problem messages for the counts of iter_validated_chunks().
+    """
+    problems = []
+    if counts.get('no_start'):
+        problems.append(f"{counts['no_start']} chunks without a start time were dropped")
+    if counts.get('no_end'):
+        problems.append(f"{counts['no_end']} chunks have no end time")
+    if counts.get('backwards'):
+        problems.append(f"{counts['backwards']} chunks end before they start, their end was clamped")
+    return problems
+
+def validate_chunks(chunks):
+    """
+    Validates chunk dicts like ChunkStore.validate(), for interpreters without
+    NumPy. Returns the (chunks, problems). Raises ValueError for malformed chunks.
+    """
+    counts = {}
+    validated = list(iter_validated_chunks(chunks, counts))
+    problems = describe_problems(counts)
+    unordered = sum(1 for previous, chunk in zip(validated, validated[1:])
+                    if chunk['timestamp'][0] < previous['timestamp'][0])
+    if unordered:
+        problems.append(f"{unordered} chunks start before the previous one and were reordered")
+        validated.sort(key=lambda chunk: chunk['timestamp'][0])
+    return validated, problems
+
+def quantize_chunks(chunks, frame_rate, min_frames=1):
+    """
+    Gives chunk dicts the frame ranges ChunkStore.quantize() computes.
+    """
+    for chunk in chunks:
+        start_time, end_time = chunk['timestamp']
+        start_frame = int(round(start_time * frame_rate))
+        if end_time is None:
+            end_frame = start_frame + max(1, min_frames) - 1
+        else:
+            end_frame = int(round(end_time * frame_rate))
+        chunk['frames'] = [start_frame, max(start_frame, end_frame)]
+    return chunks
+
+class ChunkStore:
+    """
+    Chunks as interned texts plus start/end time arrays. A missing end time is NaN.
+    After quantize(), every chunk carries its inclusive frame range from one
+    precomputed frame table.
+    """
+
+    def __init__(self, texts, text_ids, starts, ends, frames=None):
+        self.texts = texts
+        self.text_ids = text_ids
+        self.starts = starts
+        self.ends = ends
+        self.frames = frames
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Builds the store from chunk dicts. Raises ValueError for malformed chunks.
+        """
+        texts = []
+        text_index = {}
+        text_ids = []
+        starts = []
+        ends = []
+        for index, chunk in enumerate(chunks):
+            try:
+                text = chunk['text']
+                start_time, end_time = chunk['timestamp']
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Chunk {index} needs 'text' and a [start, end] 'timestamp'")
+            text_id = text_index.get(text)
+            if text_id is None:
+                text_id = text_index[text] = len(texts)
+                texts.append(text)
+            text_ids.append(text_id)
+            starts.append(math.nan if start_time is None else start_time)
+            ends.append(math.nan if end_time is None else end_time)
+
+        return cls(texts, np.array(text_ids, dtype=np.int32), np.array(starts, dtype=np.float64),
+                   np.array(ends, dtype=np.float64))
+
+    @classmethod
+    def from_frames(cls, rows, frame_rate):
+        """
+        Builds a quantized store from (text, start_frame, end_frame) rows, with
+        the times taken from the frames.
+        """
+        texts = []
+        text_index = {}
+        text_ids = []
+        for text, _, _ in rows:
+            text_id = text_index.get(text)
+            if text_id is None:
+                text_id = text_index[text] = len(texts)
+                texts.append(text)
+            text_ids.append(text_id)
+        frames = np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, 2)
+        times = frames / frame_rate
+        return cls(texts, np.array(text_ids, dtype=np.int32), times[:, 0].copy(), times[:, 1].copy(), frames)
+
+    def __len__(self):
+        return len(self.text_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # A store of the sliced chunks, sharing the arrays' memory
+            frames = self.frames[index] if self.frames is not None else None
+            return ChunkStore(self.texts, self.text_ids[index], self.starts[index], self.ends[index], frames)
+        index = range(len(self))[index]
+        start, end = self.starts[index], self.ends[index]
+        chunk = {
+            'text': self.texts[self.text_ids[index]],
+            'timestamp': [float(start), None if math.isnan(end) else float(end)],
+        }
+        if self.frames is not None:
+            chunk['frames'] = [int(self.frames[index, 0]), int(self.frames[index, 1])]
+        return chunk
+
+    def __iter__(self):
+        # Converting whole columns at once is much faster than indexing the arrays per chunk
+        frames = self.frames.tolist() if self.frames is not None else None
+        for index, (text_id, start, end) in enumerate(zip(self.text_ids.tolist(), self.starts.tolist(), self.ends.tolist())):
+            chunk = {'text': self.texts[text_id], 'timestamp': [start, None if math.isnan(end) else end]}
+            if frames is not None:
+                chunk['frames'] = frames[index]
+            yield chunk
+
+    def validate(self):
+        """
+        Drops chunks without a start time, orders the chunks by start time and
+        clamps ends before their start. Missing ends are kept, quantize() gives
+        them the minimum duration. Returns the problems found as readable strings.
+        """
+        problems = []
+        no_start = np.isnan(self.starts)
+        if no_start.any():
+            problems.append(f"{int(no_start.sum())} chunks without a start time were dropped")
+            self.select(~no_start)
+
+        no_end = np.isnan(self.ends)
+        if no_end.any():
+            problems.append(f"{int(no_end.sum())} chunks have no end time")
+
+        backwards = self.ends < self.starts
+        if backwards.any():
+            problems.append(f"{int(backwards.sum())} chunks end before they start, their end was clamped")
+            self.ends = np.where(backwards, self.starts, self.ends)
+
+        unordered = int((np.diff(self.starts) < 0).sum())
+        if unordered:
+            problems.append(f"{unordered} chunks start before the previous one and were reordered")
+            self.select(np.argsort(self.starts, kind='stable'))
+        return problems
+
+    def select(self, selection):
+        """
+        Keeps the chunks picked by a boolean mask or an index array, in that order.
+        """
+        self.text_ids = self.text_ids[selection]
+        self.starts = self.starts[selection]
+        self.ends = self.ends[selection]
+        if self.frames is not None:
+            self.frames = self.frames[selection]
+
+    def quantize(self, frame_rate, min_frames=1):
+        """
+        Computes the frame table: start and end times rounded to frames, chunks
+        without an end time last min_frames, and no range ends before it starts.
+        """
+        start_frames = np.rint(self.starts * frame_rate).astype(np.int64)
+        end_frames = np.where(np.isnan(self.ends), start_frames + max(1, min_frames) - 1,
+                              np.rint(np.nan_to_num(self.ends) * frame_rate)).astype(np.int64)
+        self.frames = np.stack([start_frames, np.maximum(start_frames, end_frames)], axis=1)
+        return self.frames
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the arrays and the interned texts.
+        """
+        arrays = [self.text_ids, self.starts, self.ends] + ([self.frames] if self.frames is not None else [])
+        return sum(array.nbytes for array in arrays) + sum(len(text.encode('utf-8')) for text in self.texts)
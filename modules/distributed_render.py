@@ -0,0 +1,84 @@
+# modules/distributed_render.py
+#
+# Renders one saved .blend on several machines sharing a directory. The node that
+# built the scene copies it to the share, writes the job and renders ranges like
+# any other worker; the other nodes join with:
+#   blender --background --factory-startup --python cli.py -- --join-render /mnt/share/job
+#
+# Locally, a temporary directory and a few joined processes stand in for the share;
+# benchmarks/check_distributed_render.py runs the lease protocol that way.
+
+import bpy
+import os
+from modules import effect_manager, frame_leases, renderer
+
+BLEND_NAME = 'output.blend'
+
+# Settings read by setup_rendering and render_animation. They travel with the job,
+# so every node renders at the coordinator's resolution, frame rate and profile
+JOB_CONFIG_KEYS = ('SCENE_NAME', 'RESOLUTION', 'FRAME_RATE', 'RENDER_PROFILE', 'RENDER_PROFILES', 'EFFECTS',
+                   'OUTPUT_MODE', 'PIPELINE_QUEUE_SIZE', 'ENCODER_THREADS',
+                   'LAZY_MEDIA', 'MEDIA_PREFETCH_SECONDS', 'MEDIA_MEMORY_BUDGET_MB')
+
+def get_share_dir(config):
+    return config.get('RENDER_SHARE_DIR') or os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'distributed')
+
+def make_board(share_dir, config):
+    return frame_leases.LeaseBoard(share_dir, lease_timeout=config.get('LEASE_TIMEOUT', 60),
+                                   heartbeat_interval=config.get('LEASE_HEARTBEAT', 10))
+
+def render_range(config):
+    """
+    Returns a function rendering an inclusive frame range of the open scene into a file.
+    """
+    scene = bpy.context.scene
+
+    def render(start, end, output_path):
+        scene.frame_start = start
+        scene.frame_end = end
+        scene.render.filepath = output_path
+        renderer.render_animation(dict(config, OUTPUT_PATH=output_path))
+
+    return render
+
+def start_distributed_render(config):
+    """
+    Copies the built scene to the share, splits its frame range into leases,
+    renders ranges until none are left and assembles OUTPUT_PATH from the segments.
+    """
+    scene = bpy.context.scene
+    share_dir = get_share_dir(config)
+    board = make_board(share_dir, config)
+
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.join(share_dir, BLEND_NAME), copy=True)
+    range_frames = max(1, int(config.get('LEASE_RANGE_SECONDS', 10) * scene.render.fps))
+    job = board.create_job(scene.frame_start, scene.frame_end, range_frames,
+                           extension=os.path.splitext(config['OUTPUT_PATH'])[1],
+                           config={key: config[key] for key in JOB_CONFIG_KEYS if key in config})
+    print(f"Distributed render: {len(job['ranges'])} ranges of {range_frames} frames in {share_dir}")
+
+    output_path = config['OUTPUT_PATH']
+    frame_leases.run_worker(board, render_range(config), config.get('LEASE_POLL_SECONDS', 2))
+    segment_paths = frame_leases.wait_for_segments(board, config.get('LEASE_POLL_SECONDS', 2))
+
+    scene.frame_start, scene.frame_end = job['frame_start'], job['frame_end']
+    scene.render.filepath = output_path
+    renderer.concat_segments(segment_paths, output_path, config.get('FFMPEG_BINARY', 'ffmpeg'))
+    return segment_paths
+
+def join_render(share_dir, config):
+    """
+    Opens the job's .blend from the share and renders ranges until none are left.
+    The job's render settings override the local config.
+    """
+    board = make_board(share_dir, config)
+    job = board.load_job()
+    config = dict(config, **job.get('config', {}))
+
+    bpy.ops.wm.open_mainfile(filepath=os.path.join(share_dir, BLEND_NAME))
+    # Frame handlers of effects such as the typewriter are not stored in the .blend
+    effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+    renderer.setup_rendering(config)
+    rendered = frame_leases.run_worker(board, render_range(config), config.get('LEASE_POLL_SECONDS', 2))
+    print(f"Worker {board.worker_id} rendered {len(rendered)} ranges")
+    return rendered
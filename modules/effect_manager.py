@@ -12,10 +12,14 @@ def load_effects(effect_names):
     effects = []
     for effect_name in effect_names:
         try:
-            module = importlib.import_module(effect_name)
-            effects.append(module)
+            module = importlib.import_module(f"effects.{effect_name}")
         except ModuleNotFoundError:
-            print(f"Effect module '{effect_name}' not found.")
+            try:
+                module = importlib.import_module(effect_name)
+            except ModuleNotFoundError:
+                print(f"Effect module '{effect_name}' not found.")
+                continue
+        effects.append(module)
     return effects
 
 def apply_effects(text_obj, effects_list, start_frame, end_frame):
@@ -27,3 +31,12 @@ def apply_effects(text_obj, effects_list, start_frame, end_frame):
             effect.apply(text_obj, start_frame, end_frame)
         else:
             print(f"Effect module '{effect.__name__}' does not have an 'apply' function.")
+
+def register_handlers(effects_list):
+    """
+    Registers the frame handlers of effects that animate through Python handlers.
+    Handlers are not stored in a .blend, so call this after opening one.
+    """
+    for effect in effects_list:
+        if hasattr(effect, 'register_handler'):
+            effect.register_handler()
@@ -0,0 +1,246 @@
+# modules/frame_leases.py
+#
+# Frame-range leases on a shared directory, used by distributed_render. Pure
+# Python, so it works on any filesystem where exclusive create and rename are
+# atomic (local disks, NFSv3+). Layout of the share:
+#
+#   job.json                 frame ranges and render settings, written once
+#   leases/range_00003.lease the worker rendering a range; its mtime is the heartbeat
+#   done/range_00003.done    written after the range's segment is in place
+#   segments/range_00003.mp4 rendered segments
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+JOB_FILE = 'job.json'
+
+def get_worker_id():
+    return f"{socket.gethostname()}_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+
+def split_frame_range(frame_start, frame_end, range_frames):
+    """
+    Splits an inclusive frame range into (index, start, end) ranges of range_frames frames.
+    """
+    ranges = []
+    start = frame_start
+    while start <= frame_end:
+        end = min(start + range_frames - 1, frame_end)
+        ranges.append((len(ranges), start, end))
+        start = end + 1
+    return ranges
+
+def write_json_atomic(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+class LeaseBoard:
+    """
+    Tracks which frame ranges of a job are claimed, by whom, and which are done.
+    A lease whose file was not touched within lease_timeout seconds is stale and
+    can be taken over by another worker.
+    """
+
+    def __init__(self, share_dir, worker_id=None, lease_timeout=60, heartbeat_interval=10):
+        self.share_dir = share_dir
+        self.worker_id = worker_id or get_worker_id()
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        for name in ('leases', 'done', 'segments'):
+            os.makedirs(os.path.join(share_dir, name), exist_ok=True)
+
+    def job_path(self):
+        return os.path.join(self.share_dir, JOB_FILE)
+
+    def lease_path(self, index):
+        return os.path.join(self.share_dir, 'leases', f"range_{index:05d}.lease")
+
+    def done_path(self, index):
+        return os.path.join(self.share_dir, 'done', f"range_{index:05d}.done")
+
+    def segment_path(self, index, extension):
+        return os.path.join(self.share_dir, 'segments', f"range_{index:05d}{extension}")
+
+    def create_job(self, frame_start, frame_end, range_frames, **settings):
+        """
+        Clears any previous job from the share and writes the job description
+        with its frame ranges. Returns the job.
+        """
+        # Removed first so a worker joining meanwhile waits instead of loading the old job
+        try:
+            os.remove(self.job_path())
+        except FileNotFoundError:
+            pass
+        for name in ('leases', 'done', 'segments'):
+            directory = os.path.join(self.share_dir, name)
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+        job = dict(settings, frame_start=frame_start, frame_end=frame_end,
+                   ranges=split_frame_range(frame_start, frame_end, range_frames))
+        write_json_atomic(self.job_path(), job)
+        return job
+
+    def load_job(self, timeout=None, poll_interval=2):
+        """
+        Returns the job, waiting for the coordinator to write it if needed.
+        """
+        started = time.time()
+        while not os.path.exists(self.job_path()):
+            if timeout is not None and time.time() - started > timeout:
+                raise TimeoutError(f"No job in {self.share_dir}")
+            time.sleep(poll_interval)
+        with open(self.job_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def share_now(self):
+        """
+        Returns the current time as seen by the share, so heartbeats are compared
+        with the file server's clock rather than the local one.
+        """
+        probe_path = os.path.join(self.share_dir, 'leases', f".clock_{self.worker_id}")
+        with open(probe_path, 'w'):
+            pass
+        return os.stat(probe_path).st_mtime
+
+    def is_done(self, index):
+        return os.path.exists(self.done_path(index))
+
+    def read_owner(self, path):
+        try:
+            with open(path, 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def try_claim(self, index, now):
+        """
+        Claims a range if it is unleased or its lease is stale. Returns True on success.
+        """
+        lease_path = self.lease_path(index)
+        try:
+            if now - os.stat(lease_path).st_mtime <= self.lease_timeout:
+                return False
+            owner = self.read_owner(lease_path)
+            # Only one worker can rename the stale lease away
+            stale_path = f"{lease_path}.stale_{self.worker_id}"
+            os.rename(lease_path, stale_path)
+        except FileNotFoundError:
+            pass
+        else:
+            # Another worker may have reclaimed the range between the stat and the
+            # rename, so check the file that was actually renamed before dropping it
+            if now - os.stat(stale_path).st_mtime <= self.lease_timeout or self.read_owner(stale_path) != owner:
+                try:
+                    # A link fails if yet another worker created a lease meanwhile
+                    os.link(stale_path, lease_path)
+                except FileExistsError:
+                    pass
+                os.remove(stale_path)
+                return False
+            os.remove(stale_path)
+            print(f"Reclaiming stale lease of range {index}")
+
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.worker_id)
+        return True
+
+    def owns(self, index):
+        return self.read_owner(self.lease_path(index)) == self.worker_id
+
+    def heartbeat(self, index):
+        """
+        Starts a thread that keeps the lease fresh. Call the returned function to stop it.
+        """
+        stop = threading.Event()
+
+        def beat():
+            # A reclaiming worker may move the lease away for a moment, so keep checking
+            taken_over = False
+            while not stop.wait(self.heartbeat_interval):
+                try:
+                    if self.owns(index):
+                        os.utime(self.lease_path(index), None)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if not taken_over:
+                    taken_over = True
+                    print(f"Lease of range {index} was taken over")
+
+        threading.Thread(target=beat, daemon=True).start()
+        return stop.set
+
+    def complete(self, index, temp_segment_path, extension):
+        """
+        Moves a rendered segment into place, marks the range done and drops the lease.
+        """
+        os.replace(temp_segment_path, self.segment_path(index, extension))
+        with open(self.done_path(index), 'w') as f:
+            f.write(self.worker_id)
+        if self.owns(index):
+            os.remove(self.lease_path(index))
+
+    def claim_next(self, ranges):
+        """
+        Returns the first range this worker could claim, or None.
+        """
+        now = self.share_now()
+        for index, start, end in ranges:
+            if not self.is_done(index) and self.try_claim(index, now):
+                return index, start, end
+        return None
+
+    def remaining(self, ranges):
+        return [index for index, _, _ in ranges if not self.is_done(index)]
+
+def run_worker(board, render_range, poll_interval=2):
+    """
+    Claims and renders ranges until every range of the job is done.
+    render_range(start, end, output_path) renders the inclusive range into output_path.
+    Returns the indices this worker rendered.
+    """
+    job = board.load_job()
+    ranges = [tuple(item) for item in job['ranges']]
+    extension = job.get('extension', '.mp4')
+    rendered = []
+
+    while board.remaining(ranges):
+        claimed = board.claim_next(ranges)
+        if claimed is None:
+            # Everything left is leased by live workers, wait for them or for a lease to go stale
+            time.sleep(poll_interval)
+            continue
+
+        index, start, end = claimed
+        print(f"Worker {board.worker_id} rendering range {index}: frames {start}-{end}")
+        temp_path = os.path.join(board.share_dir, 'segments', f"range_{index:05d}.{board.worker_id}.partial{extension}")
+        stop_heartbeat = board.heartbeat(index)
+        try:
+            render_range(start, end, temp_path)
+        finally:
+            stop_heartbeat()
+        board.complete(index, temp_path, extension)
+        rendered.append(index)
+    return rendered
+
+def wait_for_segments(board, poll_interval=2, timeout=None):
+    """
+    Waits until every range is done. Returns the segment paths in frame order.
+    """
+    job = board.load_job()
+    ranges = [tuple(item) for item in job['ranges']]
+    started = time.time()
+    while board.remaining(ranges):
+        if timeout is not None and time.time() - started > timeout:
+            raise TimeoutError(f"{len(board.remaining(ranges))} ranges still rendering")
+        time.sleep(poll_interval)
+    return [board.segment_path(index, job.get('extension', '.mp4')) for index, _, _ in ranges]
@@ -0,0 +1,68 @@
+# modules/framing.py
+#
+# Framing math shared by the scene build and the multi-aspect outputs.
+# Pure Python so the fits can be computed without Blender.
+
+import os
+
+def cover_fit(image_aspect, plane_aspect, wide_y_location=0):
+    """
+    Returns the (uv_scale_x, uv_scale_y, x_location, y_location) mapping that fits
+    an image to the height of a plane while keeping its aspect ratio.
+    Wider images are cropped at the sides and placed at wide_y_location.
+    """
+    if image_aspect > plane_aspect:
+        # Image is wider relative to the plane, so scale UV in X direction (crop sides)
+        uv_scale_x = plane_aspect / image_aspect
+        uv_scale_y = 1
+        x_location = (1 - uv_scale_x) / 2
+        y_location = wide_y_location
+    else:
+        # Image is taller relative to the plane, so scale UV in Y direction (no cropping needed)
+        uv_scale_x = 1
+        uv_scale_y = image_aspect / plane_aspect
+        x_location = 0
+        y_location = (1 - uv_scale_y) / 2
+    return uv_scale_x, uv_scale_y, x_location, y_location
+
+def fit_scale(text_width, text_height, view_width, view_height, padding=0.95, max_scale=1.0):
+    """
+    Returns the uniform scale that fits text of the given size into the view,
+    without upscaling and with padding.
+    """
+    scale_x = view_width / text_width if text_width > 0 else 1
+    scale_y = view_height / text_height if text_height > 0 else 1
+    return min(scale_x, scale_y, 1) * max_scale * padding
+
+def get_aspect(resolution):
+    return resolution[0] / resolution[1]
+
+def get_ortho_view_size(ortho_scale, resolution):
+    """
+    Returns the (width, height) seen by an orthographic camera whose sensor matches the resolution.
+    """
+    return ortho_scale * get_aspect(resolution), ortho_scale
+
+def get_target_output_path(output_path, target_name):
+    """
+    Returns output_path with the target name appended, e.g. video_16x9.mp4.
+    """
+    root, extension = os.path.splitext(output_path)
+    return f"{root}_{target_name}{extension}"
+
+def retarget_mapping(old_fit, new_fit):
+    """
+    Returns functions that move Scale and Location values keyframed for old_fit to new_fit.
+    Effects animate around the fitted mapping, so scales are rescaled and locations shifted.
+    """
+    def scale_value(index, value):
+        if index > 1 or old_fit[index] == 0:
+            return value
+        return value * new_fit[index] / old_fit[index]
+
+    def location_value(index, value):
+        if index > 1:
+            return value
+        return value + new_fit[2 + index] - old_fit[2 + index]
+
+    return scale_value, location_value
@@ -0,0 +1,216 @@
+# modules/keyframe_compactor.py
+
+import bpy
+import time
+from modules import scene_stats
+
+# Keys closer than this many frames are treated as one
+COINCIDENT_FRAMES = 1e-3
+
+def find_redundant_keys(keys, tolerance=1e-6):
+    """
+    Returns the indices of keys the curve already produces without them.
+    keys is a list of (frame, value, interpolation, handles_auto) tuples sorted by
+    frame, where handles_auto is True for auto-clamped handles.
+
+    A key is redundant when it continues a CONSTANT hold at the same value, lies
+    on the line of a LINEAR segment, or is the middle of three equal values with
+    auto-clamped handles (Blender flattens those, so the curve stays flat).
+    """
+    redundant = []
+    last = 0
+    for index in range(1, len(keys) - 1):
+        frame, value, interpolation, handles_auto = keys[index]
+        last_frame, last_value, last_interpolation, last_auto = keys[last]
+        next_frame, next_value, _, next_auto = keys[index + 1]
+
+        if interpolation != last_interpolation:
+            remove = False
+        elif interpolation == 'CONSTANT':
+            remove = abs(value - last_value) <= tolerance
+        elif interpolation == 'LINEAR':
+            expected = last_value + (next_value - last_value) * (frame - last_frame) / (next_frame - last_frame)
+            remove = abs(value - expected) <= tolerance
+        elif interpolation == 'BEZIER':
+            remove = (last_auto and handles_auto and next_auto
+                      and abs(value - last_value) <= tolerance and abs(value - next_value) <= tolerance)
+        else:
+            remove = False
+
+        if remove:
+            redundant.append(index)
+        else:
+            last = index
+    return redundant
+
+def sample_fcurve(fcurve, frame_start, frame_end):
+    return [fcurve.evaluate(frame) for frame in range(int(frame_start), int(frame_end) + 2)]
+
+def save_keys(fcurve):
+    return [
+        (tuple(point.co), tuple(point.handle_left), tuple(point.handle_right),
+         point.interpolation, point.handle_left_type, point.handle_right_type, point.easing)
+        for point in fcurve.keyframe_points
+    ]
+
+def restore_keys(fcurve, saved):
+    points = fcurve.keyframe_points
+    while len(points):
+        points.remove(points[0], fast=True)
+    points.add(len(saved))
+    for point, (co, handle_left, handle_right, interpolation, left_type, right_type, easing) in zip(points, saved):
+        point.co = co
+        point.handle_left_type = left_type
+        point.handle_right_type = right_type
+        point.handle_left = handle_left
+        point.handle_right = handle_right
+        point.interpolation = interpolation
+        point.easing = easing
+    fcurve.update()
+
+def merge_coincident_keys(fcurve):
+    """
+    Removes keys at the same frame as the following key, which wins like a re-insert would.
+    Returns the number of removed keys.
+    """
+    points = fcurve.keyframe_points
+    coincident = [index for index in range(len(points) - 1)
+                  if points[index + 1].co[0] - points[index].co[0] < COINCIDENT_FRAMES]
+    for index in reversed(coincident):
+        points.remove(points[index], fast=True)
+    if coincident:
+        fcurve.update()
+    return len(coincident)
+
+def compact_fcurve(fcurve, tolerance=1e-4):
+    """
+    Drops the redundant keys of an fcurve. The curve is sampled on every frame before
+    and after; if anything moved, the original keys are restored.
+    Returns the number of removed keys.
+    """
+    points = fcurve.keyframe_points
+    keys = [
+        (point.co[0], point.co[1], point.interpolation,
+         point.handle_left_type == 'AUTO_CLAMPED' and point.handle_right_type == 'AUTO_CLAMPED')
+        for point in points
+    ]
+    redundant = find_redundant_keys(keys)
+    if not redundant:
+        return 0
+
+    frame_start, frame_end = keys[0][0], keys[-1][0]
+    before = sample_fcurve(fcurve, frame_start, frame_end)
+    saved = save_keys(fcurve)
+    for index in reversed(redundant):
+        points.remove(points[index], fast=True)
+    fcurve.update()
+
+    after = sample_fcurve(fcurve, frame_start, frame_end)
+    if any(abs(a - b) > tolerance for a, b in zip(before, after)):
+        restore_keys(fcurve, saved)
+        return 0
+    return len(redundant)
+
+def get_action_owners():
+    """
+    Returns a dict of action name -> IDs animated by it, including embedded node trees.
+    """
+    owners = {}
+    collections = (bpy.data.objects, bpy.data.materials, bpy.data.worlds, bpy.data.node_groups,
+                   bpy.data.curves, bpy.data.meshes, bpy.data.cameras, bpy.data.lights, bpy.data.scenes)
+    for collection in collections:
+        for owner in collection:
+            for id_data in (owner, getattr(owner, 'node_tree', None)):
+                animation_data = getattr(id_data, 'animation_data', None)
+                if animation_data is not None and animation_data.action is not None:
+                    owners.setdefault(animation_data.action.name, []).append(id_data)
+    return owners
+
+def set_property_value(owner, data_path, index, value):
+    """
+    Sets the value an fcurve was animating. Returns False if the path does not resolve.
+    """
+    try:
+        if '.' in data_path:
+            container_path, attribute = data_path.rsplit('.', 1)
+            container = owner.path_resolve(container_path)
+        else:
+            container, attribute = owner, data_path
+        current = getattr(container, attribute)
+        if hasattr(current, '__len__'):
+            current[index] = type(current[index])(value)
+        else:
+            setattr(container, attribute, type(current)(value))
+        return True
+    except (ValueError, AttributeError, TypeError, IndexError):
+        return False
+
+def remove_constant_fcurve(fcurves, fcurve, owners, tolerance=1e-6):
+    """
+    Removes an fcurve whose keys all hold the same value, after writing that value
+    to the property. Returns True if it was removed.
+    """
+    points = fcurve.keyframe_points
+    if len(points) == 0 or fcurve.modifiers:
+        return False
+    value = points[0].co[1]
+    if any(abs(point.co[1] - value) > tolerance for point in points):
+        return False
+    # A shared action could animate the same path differently on each owner
+    if len(owners) != 1 or not set_property_value(owners[0], fcurve.data_path, fcurve.array_index, value):
+        return False
+    fcurves.remove(fcurve)
+    return True
+
+def measure_animation_eval(scene, samples):
+    """
+    Returns the mean milliseconds per frame to evaluate the scene at `samples`
+    frames spread over the frame range, or None if samples is 0.
+    """
+    if not samples:
+        return None
+    current = scene.frame_current
+    step = max(1, (scene.frame_end - scene.frame_start) // samples)
+    frames = list(range(scene.frame_start, scene.frame_end + 1, step))[:samples]
+    start = time.perf_counter()
+    for frame in frames:
+        scene.frame_set(frame)
+    elapsed = time.perf_counter() - start
+    scene.frame_set(current)
+    return round(elapsed * 1000 / len(frames), 3)
+
+def compact_keyframes(config):
+    """
+    Merges coincident keys, drops keys the interpolation already produces and
+    removes fcurves that never change, over every action in the file.
+    Returns a report with key and fcurve counts and evaluation time before and after.
+    """
+    scene = bpy.context.scene
+    samples = config.get('ANIMATION_EVAL_SAMPLES', 48)
+    counts_before = scene_stats.count_datablocks()
+    eval_before = measure_animation_eval(scene, samples)
+
+    owners = get_action_owners()
+    merged = removed_keys = removed_fcurves = 0
+    for action in bpy.data.actions:
+        for fcurves in scene_stats.iter_fcurve_collections(action):
+            for fcurve in list(fcurves):
+                merged += merge_coincident_keys(fcurve)
+                if remove_constant_fcurve(fcurves, fcurve, owners.get(action.name, [])):
+                    removed_fcurves += 1
+                else:
+                    removed_keys += compact_fcurve(fcurve)
+
+    counts_after = scene_stats.count_datablocks()
+    report = {
+        'keyframes': [counts_before['keyframes'], counts_after['keyframes']],
+        'fcurves': [counts_before['fcurves'], counts_after['fcurves']],
+        'merged_keys': merged,
+        'redundant_keys': removed_keys,
+        'constant_fcurves': removed_fcurves,
+        'eval_ms_per_frame': [eval_before, measure_animation_eval(scene, samples)],
+    }
+    print(f"Keyframe compaction: {report['keyframes'][0]} -> {report['keyframes'][1]} keys, "
+          f"{report['fcurves'][0]} -> {report['fcurves'][1]} fcurves, "
+          f"evaluation {report['eval_ms_per_frame'][0]} -> {report['eval_ms_per_frame'][1]} ms/frame")
+    return report
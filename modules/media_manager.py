@@ -0,0 +1,174 @@
+# modules/media_manager.py
+
+import bpy
+import queue
+import threading
+from bisect import bisect_right
+
+def get_texture_bytes(image):
+    """
+    Estimates the memory of an image buffer: 4 channels of bytes or floats per pixel.
+    """
+    width, height = image.size[:2]
+    return width * height * 4 * (4 if image.is_float else 1)
+
+def get_object_images(obj):
+    """
+    Returns the images used by the image texture nodes of an object's materials.
+    """
+    images = []
+    for material in getattr(obj.data, 'materials', []):
+        if material is None or material.node_tree is None:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None and node.image not in images:
+                images.append(node.image)
+    return images
+
+class MediaManager:
+    """
+    Keeps only the media of elements near the current frame resident while rendering.
+
+    MEDIA_PREFETCH_SECONDS before its element starts, a background thread reads
+    the image's file so the load Blender does on first use hits the OS cache, and
+    the image is counted as resident. After its last element ends the image's
+    buffers are freed. When the resident estimate exceeds MEDIA_MEMORY_BUDGET_MB,
+    media that is prefetched but not yet on screen is freed first.
+
+    Memory is not measured: each image counts the 'texture_bytes' estimate of the
+    first object using it, so the budget and the peak are estimates of the decoded
+    texture size.
+    """
+
+    def __init__(self, scene, config):
+        self.scene = scene
+        fps = scene.render.fps
+        self.lead_frames = int(config.get('MEDIA_PREFETCH_SECONDS', 2) * fps)
+        budget_mb = config.get('MEDIA_MEMORY_BUDGET_MB')
+        self.budget_bytes = budget_mb * 1024 * 1024 if budget_mb else None
+
+        # One entry per image with the union of its elements' frame ranges
+        entries = {}
+        for obj in scene.objects:
+            if 'frame_range' not in obj:
+                continue
+            frame_start, frame_end = obj['frame_range']
+            for image in get_object_images(obj):
+                entry = entries.setdefault(image.name, {
+                    'image': image,
+                    'path': bpy.path.abspath(image.filepath),
+                    'start': frame_start,
+                    'end': frame_end,
+                    'bytes': obj.get('texture_bytes', 0),
+                })
+                entry['start'] = min(entry['start'], frame_start)
+                entry['end'] = max(entry['end'], frame_end)
+        self.entries = sorted(entries.values(), key=lambda entry: entry['start'])
+        self.starts = [entry['start'] for entry in self.entries]
+
+        self.next_index = 0
+        self.last_frame = None
+        self.resident = {}
+        # Prefetched media freed to stay within the budget, loaded again when it starts
+        self.deferred = []
+        self.resident_bytes = 0
+        self.peak_bytes = 0
+        self.loads = 0
+        self.frees = 0
+        self.budget_exceeded = False
+        self.prefetch_queue = queue.Queue()
+        self.prefetch_thread = None
+
+    def _prefetch(self):
+        # Reads files ahead so Blender's load on first use comes from the OS cache
+        while True:
+            path = self.prefetch_queue.get()
+            if path is None:
+                return
+            try:
+                with open(path, 'rb') as f:
+                    while f.read(1024 * 1024):
+                        pass
+            except OSError:
+                pass
+
+    def _load(self, entry):
+        self.resident[entry['image'].name] = entry
+        self.resident_bytes += entry['bytes']
+        self.peak_bytes = max(self.peak_bytes, self.resident_bytes)
+        self.loads += 1
+
+    def _free(self, entry):
+        entry['image'].buffers_free()
+        del self.resident[entry['image'].name]
+        self.resident_bytes -= entry['bytes']
+        self.frees += 1
+
+    def _enforce_budget(self, frame):
+        if self.budget_bytes is None or self.resident_bytes <= self.budget_bytes:
+            return
+        # Free the media that starts latest first, it is loaded again on first use
+        for entry in sorted(self.resident.values(), key=lambda entry: entry['start'], reverse=True):
+            if self.resident_bytes <= self.budget_bytes or entry['start'] <= frame:
+                break
+            self._free(entry)
+            self.deferred.append(entry)
+        if self.resident_bytes > self.budget_bytes and not self.budget_exceeded:
+            self.budget_exceeded = True
+            print(f"Media on screen at frame {frame} needs an estimated {self.resident_bytes / (1024 * 1024):.0f} MB, "
+                  f"over the {self.budget_bytes / (1024 * 1024):.0f} MB budget")
+
+    def update(self, frame):
+        """
+        Prefetches the media starting within the prefetch lead and frees media that has ended.
+        """
+        if self.last_frame is not None and frame < self.last_frame:
+            # Rendering restarted or jumped back, start over
+            for entry in list(self.resident.values()):
+                self._free(entry)
+            self.deferred = []
+            self.next_index = 0
+        self.last_frame = frame
+
+        # Entries are sorted by start, so only the ones not yet reached are checked
+        reached = bisect_right(self.starts, frame + self.lead_frames)
+        for entry in self.entries[self.next_index:reached]:
+            if entry['end'] >= frame:
+                self.prefetch_queue.put(entry['path'])
+                self._load(entry)
+        self.next_index = max(self.next_index, reached)
+        for entry in [entry for entry in self.deferred if entry['start'] <= frame]:
+            self.deferred.remove(entry)
+            if entry['end'] >= frame:
+                self._load(entry)
+
+        for entry in list(self.resident.values()):
+            if entry['end'] < frame:
+                self._free(entry)
+        self._enforce_budget(frame)
+
+    def on_frame_change(self, scene, depsgraph=None):
+        self.update(scene.frame_current)
+
+    def register(self):
+        # Media loaded while building the scene is released until it is needed
+        for entry in self.entries:
+            entry['image'].buffers_free()
+        self.prefetch_thread = threading.Thread(target=self._prefetch, daemon=True)
+        self.prefetch_thread.start()
+        bpy.app.handlers.frame_change_pre.append(self.on_frame_change)
+
+    def unregister(self):
+        if self.on_frame_change in bpy.app.handlers.frame_change_pre:
+            bpy.app.handlers.frame_change_pre.remove(self.on_frame_change)
+        self.prefetch_queue.put(None)
+
+    def summary(self):
+        return {
+            'images': len(self.entries),
+            'loads': self.loads,
+            'frees': self.frees,
+            'estimated_peak_texture_mb': round(self.peak_bytes / (1024 * 1024), 1),
+            'estimated_total_texture_mb': round(sum(entry['bytes'] for entry in self.entries) / (1024 * 1024), 1),
+            'budget_exceeded': self.budget_exceeded,
+        }
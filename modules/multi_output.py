@@ -0,0 +1,123 @@
+# modules/multi_output.py
+
+import bpy
+import json
+import os
+import subprocess
+from modules import framing, renderer, scene_stats, text_creator
+
+def get_target_config(config, target):
+    """
+    Returns the config for one output target with its resolution and output path.
+    """
+    target_config = dict(config)
+    target_config['RESOLUTION'] = tuple(target['resolution'])
+    target_config['OUTPUT_PATH'] = framing.get_target_output_path(config['OUTPUT_PATH'], target['name'])
+    return target_config
+
+def retarget_fcurves(node_tree, data_path, convert):
+    """
+    Converts the keyframed values of one node socket with convert(array_index, value).
+    """
+    if node_tree.animation_data is None or node_tree.animation_data.action is None:
+        return
+    for fcurve in scene_stats.iter_action_fcurves(node_tree.animation_data.action):
+        if fcurve.data_path != data_path:
+            continue
+        for point in fcurve.keyframe_points:
+            point.co[1] = convert(fcurve.array_index, point.co[1])
+            point.handle_left[1] = convert(fcurve.array_index, point.handle_left[1])
+            point.handle_right[1] = convert(fcurve.array_index, point.handle_right[1])
+        fcurve.update()
+
+def refit_plane(plane, plane_aspect):
+    """
+    Resizes a fullscreen plane to the new aspect and refits its media, moving
+    the effect keyframes along with the fit.
+    """
+    plane.scale.x *= plane_aspect / plane['plane_aspect']
+    plane['plane_aspect'] = plane_aspect
+    if not plane.data.materials:
+        return
+
+    node_tree = plane.data.materials[0].node_tree
+    mapping_node = next((node for node in node_tree.nodes if node.type == 'MAPPING'), None)
+    if mapping_node is None:
+        return
+
+    old_fit = tuple(plane['uv_fit'])
+    new_fit = framing.cover_fit(plane['image_aspect'], plane_aspect, plane['wide_y_location'])
+    scale_value, location_value = framing.retarget_mapping(old_fit, new_fit)
+
+    for socket_name, convert in (('Scale', scale_value), ('Location', location_value)):
+        socket = mapping_node.inputs[socket_name]
+        socket.default_value = [convert(index, value) for index, value in enumerate(socket.default_value)]
+        retarget_fcurves(node_tree, socket.path_from_id('default_value'), convert)
+    plane['uv_fit'] = new_fit
+
+def apply_target(config):
+    """
+    Reframes the built scene for config['RESOLUTION']: camera sensor, render size,
+    fullscreen planes, media fit and caption scale. Text and media are not reloaded.
+    """
+    scene = bpy.context.scene
+    resolution = config['RESOLUTION']
+    scene.render.resolution_x, scene.render.resolution_y = resolution
+
+    camera = scene.camera
+    camera.data.sensor_width, camera.data.sensor_height = resolution
+    if camera.data.type == 'PERSP':
+        view_size = text_creator.get_camera_view_size(camera, camera.location.length)
+    else:
+        view_size = text_creator.get_camera_view_size(camera, distance=None)
+
+    plane_aspect = framing.get_aspect(resolution) * scene.render.pixel_aspect_x / scene.render.pixel_aspect_y
+    for obj in scene.objects:
+        if 'plane_aspect' in obj:
+            refit_plane(obj, plane_aspect)
+        elif 'text_size' in obj:
+            text_width, text_height = obj['text_size']
+            scale_factor = framing.fit_scale(text_width, text_height, view_size[0], view_size[1],
+                                             config.get('SCALE_PADDING', 0.95), config.get('MAX_SCALE', 1.0))
+            obj.scale = (scale_factor, scale_factor, scale_factor)
+
+def start_render_process(target_config, blend_path):
+    """
+    Renders a saved target .blend in a separate Blender process. Returns the process.
+    """
+    worker_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'blender_worker.py')
+    command = [target_config.get('BLENDER_BINARY', 'blender'), '--background', '--factory-startup',
+               '--python', worker_script, '--', '--no-preload']
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, text=True)
+    # The worker renders the task and exits once its stdin is closed
+    process.stdin.write(json.dumps({'task': 'render', 'blend_path': blend_path, 'config': target_config}) + '\n')
+    process.stdin.close()
+    return process
+
+def render_targets(config, blend_path):
+    """
+    Renders every OUTPUT_TARGETS aspect from the scene that is already built.
+    Targets render one after another, or in separate Blender processes with
+    OUTPUT_TARGETS_PARALLEL. Returns the output paths.
+    """
+    processes = []
+    output_paths = []
+    for target in config['OUTPUT_TARGETS']:
+        target_config = get_target_config(config, target)
+        apply_target(target_config)
+        output_paths.append(target_config['OUTPUT_PATH'])
+
+        if config.get('OUTPUT_TARGETS_PARALLEL'):
+            target_blend = framing.get_target_output_path(blend_path, target['name'])
+            renderer.setup_rendering(target_config)
+            bpy.ops.wm.save_as_mainfile(filepath=target_blend, copy=True)
+            processes.append((target['name'], start_render_process(target_config, target_blend)))
+        else:
+            print(f"Rendering target {target['name']} at {target_config['RESOLUTION'][0]}x{target_config['RESOLUTION'][1]}")
+            renderer.setup_rendering(target_config)
+            renderer.render_animation(target_config)
+
+    for name, process in processes:
+        if process.wait() != 0:
+            print(f"Render of target {name} failed with exit code {process.returncode}")
+    return output_paths
@@ -0,0 +1,139 @@
+# modules/parallel_build.py
+#
+# Builds a timeline in several background Blender processes at once. The
+# timeline is split into time ranges, each worker compiles its range with the
+# usual text_creator, effect_manager and visual_elements_manager code into a
+# library .blend, and the objects of every library are appended into the
+# current scene. Appended rather than linked, so later stages can still edit them.
+
+import bpy
+import json
+import os
+import subprocess
+from modules import effect_manager, template_library, text_creator, timeline, timeline_compiler, worker_pool
+
+def get_partition_dir(config):
+    return os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'partitions')
+
+def get_partition_count(timeline_data, config):
+    items = len(timeline_data['layers']) + len(timeline_data['captions'])
+    workers = config.get('BUILD_WORKERS') or os.cpu_count() or 1
+    min_items = max(1, config.get('BUILD_PARTITION_MIN_ITEMS', 200))
+    return max(1, min(workers, items // min_items))
+
+def start_build_process(task, config, log_path):
+    """
+    Compiles one partition in a separate Blender process. Returns the process.
+    """
+    worker_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'blender_worker.py')
+    # The task brings its own config, so the worker skips preloading the default one
+    command = [config.get('BLENDER_BINARY', 'blender'), '--background', '--factory-startup',
+               '--python', worker_script, '--', '--no-preload']
+    # Output goes to a file so a full pipe never blocks a worker while others are waited on
+    with open(log_path, 'w', encoding='utf-8') as log:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=log, stderr=subprocess.STDOUT, text=True)
+    # The worker builds the task and exits once its stdin is closed
+    process.stdin.write(json.dumps(task) + '\n')
+    process.stdin.close()
+    return process
+
+def read_result(log_path):
+    """
+    Returns the worker's task result message from its log, or None.
+    """
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(worker_pool.MESSAGE_PREFIX):
+                    message = json.loads(line[len(worker_pool.MESSAGE_PREFIX):])
+                    if message.get('event') == 'done':
+                        return message
+    except OSError:
+        pass
+    return None
+
+def append_partition(blend_path, object_names):
+    """
+    Appends the named objects and everything they use from a partition .blend
+    and links them into the current scene. Returns the appended objects.
+    """
+    wanted = set(object_names)
+    with bpy.data.libraries.load(blend_path, link=False) as (data_from, data_to):
+        data_to.objects = [name for name in data_from.objects if name in wanted]
+
+    collection = bpy.context.scene.collection
+    for obj in data_to.objects:
+        if obj is not None:
+            collection.objects.link(obj)
+    return [obj for obj in data_to.objects if obj is not None]
+
+def merge_duplicate_fonts():
+    """
+    Every partition loaded the fonts on its own. Keeps one font per file.
+    """
+    fonts = {}
+    for font in list(bpy.data.fonts):
+        path = bpy.path.abspath(font.filepath)
+        if path in fonts:
+            font.user_remap(fonts[path])
+            bpy.data.fonts.remove(font)
+        else:
+            fonts[path] = font
+
+def build_parallel(timeline_data, config):
+    """
+    Builds the whole timeline into the current scene, compiling its time ranges
+    in parallel Blender processes. Falls back to compiling a range here if its
+    worker fails. Returns the number of partitions built by workers.
+    """
+    if get_partition_count(timeline_data, config) < 2:
+        # Starting Blender processes costs more than building a short timeline
+        timeline_compiler.compile_timeline(timeline_data, config)
+        return 0
+
+    for problem in timeline.validate_timeline(timeline_data):
+        print(f"Timeline problem: {problem}")
+
+    parts = timeline.partition_timeline(timeline_data, get_partition_count(timeline_data, config))
+
+    partition_dir = get_partition_dir(config)
+    if not os.path.exists(partition_dir):
+        os.makedirs(partition_dir)
+    if config.get('USE_TEMPLATE_LIBRARY'):
+        # Built once here, otherwise every worker would find it missing and build it at the same time
+        template_library.ensure_template_library(config)
+
+    processes = []
+    for index, part in enumerate(parts):
+        blend_path = os.path.join(partition_dir, f"partition_{index:03d}.blend")
+        log_path = os.path.join(partition_dir, f"partition_{index:03d}.log")
+        task = {'task': 'build_partition', 'blend_path': blend_path, 'config': config,
+                'layers': part['layers'], 'captions': part['captions']}
+        processes.append((part, blend_path, log_path, start_build_process(task, config, log_path)))
+    print(f"Parallel build: {len(parts)} partitions")
+
+    local_captions = []
+    built = 0
+    for part, blend_path, log_path, process in processes:
+        process.wait()
+        result = read_result(log_path)
+        if process.returncode == 0 and result is not None and result.get('ok') and os.path.isfile(blend_path):
+            append_partition(blend_path, result['objects'])
+            built += 1
+        else:
+            error = result.get('error') if result else f"exit code {process.returncode}"
+            print(f"Partition {part['frames'][0]}-{part['frames'][1]} failed ({error}), see {log_path}; building it here")
+            local_captions += part['captions']
+            timeline_compiler.compile_items(part['layers'], [], config)
+
+    # The workers set the background on their own world
+    if timeline_data['captions']:
+        text_creator.set_background_color(config['BACKGROUND_COLOR'])
+    timeline_compiler.compile_items([], local_captions, config)
+    merge_duplicate_fonts()
+    # Effect data such as 'typewriter_data' is appended with the objects, their frame handlers are not
+    effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+
+    timeline_compiler.set_frame_range(timeline_data)
+    timeline_compiler.store_timeline(timeline_data)
+    return built
@@ -1,11 +1,15 @@
 # modules/parser.py
 
+import heapq
 import json
+from modules import chunk_store
 
-def parse_data(json_path):
+def parse_data(json_path, config=None):
     """
-    Parses the JSON file and returns a list of chunks.
+    Parses the JSON file and returns the chunks.
     Each chunk is a dictionary with 'text' and 'timestamp' keys.
+    The chunks are validated and time-ordered, and get their frame ranges when a
+    config is given. Where NumPy is available they are returned as a ChunkStore.
     """
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
@@ -15,8 +19,20 @@ def parse_data(json_path):
         if not chunks:
             print("No chunks found in data.")
             return None
+        if not chunk_store.available():
+            chunks, problems = chunk_store.validate_chunks(chunks)
+            for problem in problems:
+                print(f"Transcript problem: {problem}")
+            if config is not None:
+                chunk_store.quantize_chunks(chunks, config['FRAME_RATE'], config.get('MIN_CAPTION_FRAMES', 1))
+            return chunks
 
-        return chunks
+        store = chunk_store.ChunkStore.from_chunks(chunks)
+        for problem in store.validate():
+            print(f"Transcript problem: {problem}")
+        if config is not None:
+            store.quantize(config['FRAME_RATE'], config.get('MIN_CAPTION_FRAMES', 1))
+        return store
 
     except FileNotFoundError:
         print(f"File not found: {json_path}")
@@ -24,6 +40,125 @@ def parse_data(json_path):
     except json.JSONDecodeError as e:
         print(f"JSON decode error: {e}")
         return None
+    except ValueError as e:
+        print(f"Invalid transcript: {e}")
+        return None
+
+def _fill(f, buffer, read_size):
+    """
+    Strips leading whitespace and reads until the buffer starts with a character.
+    Returns '' at the end of the file.
+    """
+    buffer = buffer.lstrip()
+    while not buffer:
+        block = f.read(read_size)
+        if not block:
+            return ''
+        buffer = block.lstrip()
+    return buffer
+
+def _read_value(f, buffer, decoder, read_size):
+    """
+    Decodes the JSON value at the start of the buffer, reading more as needed.
+    Returns the value and the rest of the buffer.
+    """
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer)
+            # A number at the end of the buffer may continue in the next block
+            if buffer[end:].strip():
+                return value, buffer[end:]
+        except json.JSONDecodeError:
+            pass
+        block = f.read(read_size)
+        if not block:
+            value, end = decoder.raw_decode(buffer)
+            return value, buffer[end:]
+        buffer += block
+
+def iter_json_array(json_path, key, read_size=65536):
+    """
+    Streams the items of the array stored under `key` of the top-level object
+    without loading the whole file. Values of the other top-level keys are decoded
+    to skip them, and the array items one at a time, so memory stays bounded by
+    the largest of those values plus one read block.
+    Raises json.JSONDecodeError for malformed JSON.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        # Walk the top-level keys to the opening bracket of the array
+        buffer = _fill(f, '', read_size)
+        if not buffer.startswith('{'):
+            return
+        buffer = buffer[1:]
+        while True:
+            buffer = _fill(f, buffer, read_size)
+            if buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            if not buffer or buffer.startswith('}'):
+                return
+            name, buffer = _read_value(f, buffer, decoder, read_size)
+            buffer = _fill(f, buffer, read_size)
+            if not buffer.startswith(':'):
+                raise json.JSONDecodeError("Expecting ':' delimiter", buffer, 0)
+            buffer = _fill(f, buffer[1:], read_size)
+            if name == key and buffer.startswith('['):
+                buffer = buffer[1:]
+                break
+            _, buffer = _read_value(f, buffer, decoder, read_size)
+
+        # Decode the array items one by one
+        eof = False
+        while True:
+            buffer = buffer.lstrip(' \t\r\n,')
+            if buffer.startswith(']'):
+                return
+            if buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+            elif eof:
+                raise json.JSONDecodeError(f"Unterminated '{key}' array", buffer, 0)
+            block = f.read(read_size)
+            if not block:
+                eof = True
+            buffer += block
+
+def iter_chunks(json_path, reorder_buffer=64, config=None):
+    """
+    Streams chunks from the transcript ordered by start time.
+    Chunks are validated like parse_data() validates them before they are
+    re-sorted, and get their frame ranges when a config is given.
+    Chunks that arrive out of order are re-sorted through a bounded buffer,
+    so only `reorder_buffer` chunks are held in memory at any time.
+    Raises json.JSONDecodeError for a malformed transcript and ValueError for
+    a malformed chunk, so it is not rendered cut short.
+    """
+    heap = []
+    counts = {}
+    try:
+        chunks = chunk_store.iter_validated_chunks(iter_json_array(json_path, 'chunks'), counts)
+        for seq, chunk in enumerate(chunks):
+            if config is not None:
+                chunk_store.quantize_chunks([chunk], config['FRAME_RATE'], config.get('MIN_CAPTION_FRAMES', 1))
+            heapq.heappush(heap, (chunk['timestamp'][0], seq, chunk))
+            if len(heap) > reorder_buffer:
+                yield heapq.heappop(heap)[2]
+        while heap:
+            yield heapq.heappop(heap)[2]
+    except FileNotFoundError:
+        print(f"File not found: {json_path}")
+    for problem in chunk_store.describe_problems(counts):
+        print(f"Transcript problem: {problem}")
+
 def parse_visual_elements(json_path):
     """
     Parses the visual elements JSON file and returns a list of visual elements.
@@ -57,6 +192,10 @@ def parse_visual_elements(json_path):
             if not isinstance(element['timestamp'], list) or len(element['timestamp']) != 2:
                 raise ValueError("Timestamp must be a list of two elements [start_time, end_time].")
 
+            # An explicit 'seed' fixes the element's randomized effects
+            if element.get('seed') is not None and not isinstance(element['seed'], int):
+                raise ValueError("Seed must be an integer.")
+
             # Ensure 'effects' is a list
             if 'effects' not in element or not isinstance(element['effects'], list):
                 element['effects'] = []
@@ -0,0 +1,143 @@
+# modules/pipeline_profiler.py
+
+import bpy
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+def get_profile_dir(config):
+    """
+    Returns the directory for profiling output, next to OUTPUT_PATH unless PROFILE_DIR is set.
+    """
+    return config.get('PROFILE_DIR') or os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'profile')
+
+class OperatorCounter:
+    """
+    Counts bpy.ops calls per operator by wrapping the Python operator call wrapper.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.op_class = getattr(sys.modules.get('bpy.ops'), '_BPyOpsSubModOp', None)
+        self.original_call = None
+
+    def start(self):
+        if self.op_class is None:
+            return
+        self.original_call = self.op_class.__call__
+        counts = self.counts
+        original_call = self.original_call
+
+        def counting_call(op, *args, **kwargs):
+            idname = op.idname_py()
+            counts[idname] = counts.get(idname, 0) + 1
+            return original_call(op, *args, **kwargs)
+
+        self.op_class.__call__ = counting_call
+
+    def stop(self):
+        if self.original_call is not None:
+            self.op_class.__call__ = self.original_call
+            self.original_call = None
+
+class PipelineProfiler:
+    """
+    Wraps each pipeline stage with cProfile, tracemalloc and counters of bpy.ops calls
+    and depsgraph updates (each view_layer.update() that changes something triggers one).
+    Use stage_hook as main.main()'s stage_hook and call write_report() at the end.
+    """
+
+    def __init__(self, config, top=15):
+        self.profile_dir = get_profile_dir(config)
+        self.top = top
+        self.stages = {}
+        self.depsgraph_updates = 0
+
+    def _on_depsgraph_update(self, *args):
+        self.depsgraph_updates += 1
+
+    def _top_functions(self, profile):
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'ncalls': ncalls,
+                'tottime_s': round(tottime, 6),
+                'cumtime_s': round(cumtime, 6),
+            })
+        rows.sort(key=lambda row: row['cumtime_s'], reverse=True)
+        return rows[:self.top]
+
+    def _top_allocations(self, before, after):
+        rows = []
+        for stat in after.compare_to(before, 'lineno')[:self.top]:
+            frame = stat.traceback[0]
+            rows.append({
+                'location': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                'size_diff_kb': round(stat.size_diff / 1024, 1),
+                'count_diff': stat.count_diff,
+            })
+        return rows
+
+    def stage_hook(self, name, func, *args, **kwargs):
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        operators = OperatorCounter()
+        profile = cProfile.Profile()
+        self.depsgraph_updates = 0
+        bpy.app.handlers.depsgraph_update_post.append(self._on_depsgraph_update)
+
+        tracemalloc.reset_peak()
+        snapshot_before = tracemalloc.take_snapshot()
+        operators.start()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            operators.stop()
+            bpy.app.handlers.depsgraph_update_post.remove(self._on_depsgraph_update)
+            snapshot_after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+
+            profile_path = os.path.join(self.profile_dir, f"{name}.prof")
+            profile.dump_stats(profile_path)
+            self.stages[name] = {
+                'time_s': round(elapsed, 6),
+                'cprofile': profile_path,
+                'top_functions': self._top_functions(profile),
+                'python_peak_kb': round(peak / 1024, 1),
+                'top_allocations': self._top_allocations(snapshot_before, snapshot_after),
+                'bpy_ops_calls': sum(operators.counts.values()) if operators.op_class else None,
+                'bpy_ops': dict(sorted(operators.counts.items())),
+                'depsgraph_updates': self.depsgraph_updates,
+            }
+
+    def write_report(self):
+        """
+        Writes all stage measurements into a single JSON report. Returns its path.
+        """
+        if not os.path.exists(self.profile_dir):
+            os.makedirs(self.profile_dir)
+        report_path = os.path.join(self.profile_dir, 'profile_report.json')
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'blender_version': bpy.app.version_string, 'stages': self.stages}, f, indent=2, sort_keys=True)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        for name, stage in self.stages.items():
+            print(f"  {name}: {stage['time_s']:.3f}s, {stage['bpy_ops_calls']} bpy.ops calls, "
+                  f"{stage['depsgraph_updates']} depsgraph updates")
+        print("Profile report saved to:", report_path)
+        return report_path
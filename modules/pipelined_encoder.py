@@ -0,0 +1,137 @@
+# modules/pipelined_encoder.py
+
+import bpy
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+
+# Blender's CRF and preset names mapped to their x264 equivalents
+CRF_VALUES = {
+    'LOSSLESS': 0,
+    'PERC_LOSSLESS': 17,
+    'HIGH': 20,
+    'MEDIUM': 23,
+    'LOW': 26,
+    'VERYLOW': 29,
+    'LOWEST': 32,
+}
+X264_PRESETS = {
+    'REALTIME': 'ultrafast',
+    'GOOD': 'medium',
+    'BEST': 'slow',
+}
+
+class PipelinedEncoder:
+    """
+    Encodes frames in a separate ffmpeg process while Blender keeps rendering.
+
+    Blender writes each frame as an uncompressed BMP into a scratch directory.
+    The render_write handler hands the frame to a bounded queue, and a feeder
+    thread streams it into ffmpeg's stdin and deletes it. When the encoder falls
+    behind, the handler blocks on the full queue, which pauses the render so
+    at most PIPELINE_QUEUE_SIZE frames are waiting at any time.
+    """
+
+    def __init__(self, scene, config, output_args=None):
+        self.scene = scene
+        self.config = config
+        self.output_path = config['OUTPUT_PATH']
+        self.output_args = output_args
+        self.frames = queue.Queue(maxsize=max(1, config.get('PIPELINE_QUEUE_SIZE', 8)))
+        self.frame_dir = None
+        self.process = None
+        self.feeder = None
+        self.error = None
+        self.previous_settings = None
+
+    def build_command(self):
+        """
+        Returns the ffmpeg command reading BMP frames from stdin.
+        `output_args` replaces the output file with custom muxer arguments.
+        """
+        scene = self.scene
+        frame_rate = scene.render.fps / max(1, scene.frame_step)
+        ffmpeg = scene.render.ffmpeg
+        command = [
+            self.config.get('FFMPEG_BINARY', 'ffmpeg'), '-y', '-loglevel', 'error',
+            '-f', 'image2pipe', '-c:v', 'bmp', '-framerate', str(frame_rate), '-i', '-',
+        ]
+        threads = self.config.get('ENCODER_THREADS', 0)
+        if threads:
+            command += ['-threads', str(threads)]
+        command += [
+            '-c:v', 'libx264',
+            '-preset', X264_PRESETS.get(ffmpeg.ffmpeg_preset, 'medium'),
+            '-crf', str(CRF_VALUES.get(ffmpeg.constant_rate_factor, 23)),
+            '-pix_fmt', 'yuv420p',
+        ]
+        if self.output_args is not None:
+            return command + self.output_args
+        return command + [self.output_path]
+
+    def start(self):
+        """
+        Switches the render output to intermediate frames and starts the encoder process.
+        """
+        render = self.scene.render
+        self.previous_settings = (render.filepath, render.image_settings.file_format)
+
+        output_dir = os.path.dirname(self.output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self.frame_dir = tempfile.mkdtemp(prefix='frames_', dir=output_dir or None)
+        render.image_settings.file_format = 'BMP'
+        render.filepath = os.path.join(self.frame_dir, 'frame_')
+
+        self.process = subprocess.Popen(self.build_command(), stdin=subprocess.PIPE)
+        self.feeder = threading.Thread(target=self._feed, daemon=True)
+        self.feeder.start()
+        bpy.app.handlers.render_write.append(self.on_render_write)
+
+    def on_render_write(self, scene, *args):
+        # Blocks while the queue is full, which applies backpressure to the render
+        self.frames.put(scene.render.frame_path(frame=scene.frame_current))
+
+    def _feed(self):
+        while True:
+            frame_path = self.frames.get()
+            if frame_path is None:
+                break
+            try:
+                if self.error is None:
+                    with open(frame_path, 'rb') as f:
+                        self.process.stdin.write(f.read())
+            except (OSError, ValueError) as e:
+                # Keep draining the queue so the render does not block forever
+                self.error = e
+                print(f"Encoder pipe failed: {e}")
+            finally:
+                if os.path.exists(frame_path):
+                    os.remove(frame_path)
+
+    def finish(self):
+        """
+        Waits for the remaining frames to be encoded and restores the render settings.
+        Returns True if the encoder finished successfully.
+        """
+        if self.on_render_write in bpy.app.handlers.render_write:
+            bpy.app.handlers.render_write.remove(self.on_render_write)
+        self.frames.put(None)
+        self.feeder.join()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        returncode = self.process.wait()
+
+        render = self.scene.render
+        render.filepath, render.image_settings.file_format = self.previous_settings
+        shutil.rmtree(self.frame_dir, ignore_errors=True)
+
+        if returncode != 0 or self.error is not None:
+            print(f"Pipelined encoding failed (ffmpeg exit code {returncode}).")
+            return False
+        return True
@@ -0,0 +1,206 @@
+# modules/render_instrumentation.py
+
+import bpy
+import csv
+import json
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def get_memory_mb():
+    """
+    Returns (current_rss_mb, peak_rss_mb) of the Blender process, or None where unavailable.
+    """
+    current = None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    peak = None
+    if resource is not None:
+        # ru_maxrss is reported in kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return current, peak
+
+class RenderInstrumentation:
+    """
+    Records per-frame timings of a render through Blender's app handlers.
+
+    The phases of a frame are measured between these handler calls:
+    frame_change_pre -> frame_change_post (first)   : depsgraph evaluation
+    frame_change_post (first) -> (last)             : Python frame handlers
+    render_pre -> render_post                       : rendering and shading
+    render_post -> render_write                     : writing / encoding the frame
+    An animation render calls render_pre before the frame change handlers, so
+    whichever of render_pre and frame_change_pre runs first opens the frame's record.
+    """
+
+    def __init__(self, max_visible_names=50):
+        self.max_visible_names = max_visible_names
+        self.frames = []
+        self.current = None
+        self.handlers = []
+
+    def _now(self):
+        return time.perf_counter()
+
+    def _open_frame(self, scene):
+        if self.current is None:
+            self.current = {'frame': scene.frame_current, 'frame_start': self._now()}
+        return self.current
+
+    def on_frame_change_pre(self, scene, *args):
+        record = self._open_frame(scene)
+        record['frame'] = scene.frame_current
+        record['frame_change_start'] = self._now()
+
+    def on_frame_change_post_first(self, scene, *args):
+        if self.current is not None:
+            self.current['depsgraph_done'] = self._now()
+
+    def on_frame_change_post_last(self, scene, *args):
+        if self.current is None:
+            return
+        self.current['handlers_done'] = self._now()
+        visible = [obj.name for obj in scene.objects if not obj.hide_render]
+        self.current['visible_count'] = len(visible)
+        self.current['visible_objects'] = visible[:self.max_visible_names]
+
+    def on_render_pre(self, scene, *args):
+        self._open_frame(scene)['render_start'] = self._now()
+
+    def on_render_post(self, scene, *args):
+        if self.current is not None:
+            self.current['render_done'] = self._now()
+
+    def on_render_write(self, scene, *args):
+        if self.current is not None:
+            self.current['write_done'] = self._now()
+            self._finish_frame()
+
+    def _finish_frame(self):
+        record = self.current
+        self.current = None
+        start = record['frame_start']
+
+        def span(begin, end):
+            if begin in record and end in record:
+                return (record[end] - record[begin]) * 1000
+            return None
+
+        # When render_pre ran first, the frame change lies inside render_pre -> render_post
+        if 'render_start' in record and record.get('handlers_done', 0) > record['render_start']:
+            record['render_start'] = record['handlers_done']
+
+        current_mb, peak_mb = get_memory_mb()
+        last_mark = record.get('write_done', record.get('render_done', start))
+        self.frames.append({
+            'frame': record['frame'],
+            'wall_ms': (last_mark - start) * 1000,
+            'depsgraph_ms': span('frame_change_start', 'depsgraph_done'),
+            'handlers_ms': span('depsgraph_done', 'handlers_done'),
+            'render_ms': span('render_start', 'render_done'),
+            'write_ms': span('render_done', 'write_done'),
+            'rss_mb': current_mb,
+            'peak_rss_mb': peak_mb,
+            'visible_count': record.get('visible_count', 0),
+            'visible_objects': record.get('visible_objects', []),
+        })
+
+    def register(self):
+        """
+        Registers the instrumentation handlers around any existing handlers.
+        """
+        handlers = bpy.app.handlers
+        self.handlers = [
+            (handlers.frame_change_pre, self.on_frame_change_pre, 0),
+            (handlers.frame_change_post, self.on_frame_change_post_first, 0),
+            (handlers.frame_change_post, self.on_frame_change_post_last, None),
+            (handlers.render_pre, self.on_render_pre, None),
+            (handlers.render_post, self.on_render_post, None),
+            (handlers.render_write, self.on_render_write, None),
+        ]
+        for handler_list, handler, position in self.handlers:
+            if position is None:
+                handler_list.append(handler)
+            else:
+                handler_list.insert(position, handler)
+
+    def unregister(self):
+        """
+        Removes the instrumentation handlers. Records a pending frame that never reached render_write.
+        """
+        for handler_list, handler, _ in self.handlers:
+            if handler in handler_list:
+                handler_list.remove(handler)
+        self.handlers = []
+        if self.current is not None and 'render_done' in self.current:
+            self._finish_frame()
+
+    def summary(self, slowest=10):
+        """
+        Returns totals, per-phase means and the slowest frames with their visible objects.
+        """
+        if not self.frames:
+            return {'frames': 0}
+
+        def mean(key):
+            values = [f[key] for f in self.frames if f[key] is not None]
+            return sum(values) / len(values) if values else None
+
+        peaks = [f['peak_rss_mb'] for f in self.frames if f['peak_rss_mb'] is not None]
+        total_ms = sum(f['wall_ms'] for f in self.frames)
+        return {
+            'frames': len(self.frames),
+            'total_s': total_ms / 1000,
+            'fps': len(self.frames) / (total_ms / 1000) if total_ms else None,
+            'mean_wall_ms': mean('wall_ms'),
+            'mean_depsgraph_ms': mean('depsgraph_ms'),
+            'mean_handlers_ms': mean('handlers_ms'),
+            'mean_render_ms': mean('render_ms'),
+            'mean_write_ms': mean('write_ms'),
+            'peak_rss_mb': max(peaks) if peaks else None,
+            'slowest_frames': sorted(self.frames, key=lambda f: f['wall_ms'], reverse=True)[:slowest],
+        }
+
+    def write_report(self, output_path):
+        """
+        Writes the JSON report and a CSV of per-frame timings next to the video output.
+        Returns the path of the JSON report.
+        """
+        base_path = os.path.splitext(output_path)[0] + '_render_report'
+        with open(base_path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'frames': self.frames}, f, indent=2)
+
+        columns = ['frame', 'wall_ms', 'depsgraph_ms', 'handlers_ms', 'render_ms', 'write_ms',
+                   'rss_mb', 'peak_rss_mb', 'visible_count']
+        with open(base_path + '.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.frames)
+
+        return base_path + '.json'
+
+def print_summary(summary):
+    """
+    Prints a short human-readable summary of the render report.
+    """
+    if not summary.get('frames'):
+        print("No frames were recorded.")
+        return
+    print(f"Rendered {summary['frames']} frames in {summary['total_s']:.1f}s ({summary['fps']:.2f} frames/s)")
+    for key in ['mean_depsgraph_ms', 'mean_handlers_ms', 'mean_render_ms', 'mean_write_ms']:
+        if summary[key] is not None:
+            print(f"  {key}: {summary[key]:.1f}")
+    if summary['peak_rss_mb'] is not None:
+        print(f"  peak memory: {summary['peak_rss_mb']:.0f} MB")
+    print("Slowest frames:")
+    for frame in summary['slowest_frames'][:5]:
+        print(f"  frame {frame['frame']}: {frame['wall_ms']:.1f} ms, "
+              f"{frame['visible_count']} visible: {', '.join(frame['visible_objects'][:5])}")
@@ -1,25 +1,89 @@
 # modules/renderer.py
 
 import bpy
+import json
 import os
+import subprocess
+import time
 
-def setup_rendering(config):
+def get_render_profile(config, profile_name=None):
     """
-    Sets up rendering parameters based on the configuration.
+    Returns the name and settings of the render profile to use.
+    Falls back to CONFIG['RENDER_PROFILE'] when no profile name is given.
+    """
+    profiles = config.get('RENDER_PROFILES', {})
+    profile_name = profile_name or config.get('RENDER_PROFILE', 'final')
+    if profile_name not in profiles:
+        print(f"Render profile '{profile_name}' not found. Using default settings.")
+        return profile_name, {}
+    return profile_name, profiles[profile_name]
+
+def get_profile_stats_path(config):
+    """
+    Returns the path of the JSON file that stores measured profile throughput.
+    """
+    return os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'render_profiles.json')
+
+def load_profile_stats(config):
+    """
+    Loads the measured frames per second of each render profile, if available.
+    """
+    stats_path = get_profile_stats_path(config)
+    if not os.path.isfile(stats_path):
+        return {}
+    with open(stats_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def apply_engine_settings(scene, profile):
+    """
+    Configures the render engine and its sampling from the profile.
+    """
+    engine = profile.get('engine', 'BLENDER_EEVEE_NEXT')
+    scene.render.engine = engine
+    samples = profile.get('samples')
+
+    if engine == 'CYCLES':
+        scene.cycles.device = profile.get('device', 'CPU')
+        if samples:
+            scene.cycles.samples = samples
+        scene.cycles.use_denoising = profile.get('denoise', False)
+    elif engine == 'BLENDER_WORKBENCH':
+        # Workbench ignores shader nodes, so display the textures unlit
+        scene.display.shading.light = 'FLAT'
+        scene.display.shading.color_type = 'TEXTURE'
+        scene.display.render_aa = profile.get('render_aa', 'FXAA')
+    elif samples:
+        scene.eevee.taa_render_samples = samples
+
+def setup_rendering(config, profile_name=None):
+    """
+    Sets up rendering parameters based on the configuration and the selected render profile.
     """
     scene = bpy.context.scene
     scene.name = config.get('SCENE_NAME', 'Scene')
+    profile_name, profile = get_render_profile(config, profile_name)
 
-    # Set render engine to Eevee
-    scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    # Set render engine
+    apply_engine_settings(scene, profile)
 
     # Set resolution
     scene.render.resolution_x = config['RESOLUTION'][0]
     scene.render.resolution_y = config['RESOLUTION'][1]
-    scene.render.resolution_percentage = 100
+    scene.render.resolution_percentage = profile.get('resolution_percentage', 100)
 
-    # Set frame rate
+    # Set frame rate and frame step. The movie only holds every frame_step-th frame,
+    # so it plays at FRAME_RATE / frame_step to keep its length in time
     scene.render.fps = config['FRAME_RATE']
+    scene.frame_step = profile.get('frame_step', 1)
+    scene.render.fps_base = scene.frame_step
+
+    # Set thread count (0 lets Blender use all cores)
+    threads = profile.get('threads', 0)
+    if threads:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = threads
+    else:
+        scene.render.threads_mode = 'AUTO'
 
     # Set output path
     output_dir = os.path.dirname(config['OUTPUT_PATH'])
@@ -31,20 +95,155 @@ def setup_rendering(config):
     scene.render.image_settings.file_format = 'FFMPEG'
     scene.render.ffmpeg.format = 'MPEG4'
     scene.render.ffmpeg.codec = 'H264'
-    scene.render.ffmpeg.constant_rate_factor = 'HIGH'
-    scene.render.ffmpeg.ffmpeg_preset = 'GOOD'
+    scene.render.ffmpeg.constant_rate_factor = profile.get('crf', 'HIGH')
+    scene.render.ffmpeg.ffmpeg_preset = profile.get('ffmpeg_preset', 'GOOD')
     scene.render.ffmpeg.audio_codec = 'AAC'
     scene.render.ffmpeg.audio_bitrate = 192
 
-    # For Eevee, GPU rendering is used by default
-    print("Eevee uses GPU rendering by default. No additional configuration required.")
+    measured = load_profile_stats(config).get(profile_name)
+    fps_note = f"{measured['fps']:.2f} frames/s measured" if measured else "throughput not measured yet"
+    print(f"Render profile '{profile_name}': {scene.render.engine}, "
+          f"{scene.render.resolution_percentage}% resolution, step {scene.frame_step}, {fps_note}")
 
-def render_animation():
+def measure_render_profiles(config, profile_names=None, sample_frames=24):
+    """
+    Renders a sample of frames of the current scene with each profile and records
+    the measured frames per second in the profile stats JSON.
+    Build the standard scene (main.py with the bundled transcript) before calling this.
+    """
+    from modules import scene_report
+    scene = bpy.context.scene
+    profile_names = profile_names or list(config.get('RENDER_PROFILES', {}))
+    stats = load_profile_stats(config)
+
+    # The complexity of the sampled frames lets scene_report scale the throughput to other scenes
+    object_stats = scene_report.collect_object_stats(scene)
+    handlers = scene_report.get_frame_handlers()
+    handler_count = len(handlers['frame_change_pre']) + len(handlers['frame_change_post'])
+
+    for profile_name in profile_names:
+        setup_rendering(config, profile_name)
+        frames = list(range(scene.frame_start, scene.frame_end + 1, scene.frame_step))[:sample_frames]
+        if not frames:
+            continue
+
+        start = time.perf_counter()
+        for frame in frames:
+            scene.frame_set(frame)
+            bpy.ops.render.render(write_still=False)
+        elapsed = time.perf_counter() - start
+
+        # Frame step renders one frame per step, so the effective rate covers the skipped frames too
+        stats[profile_name] = {
+            'fps': len(frames) / elapsed,
+            'effective_fps': len(frames) * scene.frame_step / elapsed,
+            'frames': len(frames),
+            'mean_cost': sum(scene_report.summarize_range(object_stats, frame, frame, handler_count)['cost']
+                             for frame in frames) / len(frames),
+            'engine': scene.render.engine,
+            'resolution_percentage': scene.render.resolution_percentage,
+            'blender_version': bpy.app.version_string,
+        }
+        print(f"Profile '{profile_name}': {stats[profile_name]['fps']:.2f} frames/s")
+
+    with open(get_profile_stats_path(config), 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2)
+    return stats
+
+def render_animation(config=None):
     """
     Initiates the rendering process.
+    With CONFIG['RENDER_INSTRUMENTATION'] enabled, per-frame timings are written
+    to a report next to the output file. With CONFIG['OUTPUT_MODE'] set to
+    'pipelined', frames are encoded by a separate ffmpeg process while rendering;
+    'hls' does the same but emits HLS segments as soon as they are complete.
+    Only Blender's own FFMPEG output carries the scene's AAC audio track, the
+    pipelined and HLS outputs are video only.
+    Raises RuntimeError if the pipelined or HLS encoder fails.
     """
-    print("Output saved to:", bpy.context.scene.render.filepath)
-    bpy.ops.render.render(animation=True)
+    config = config or {}
+    scene = bpy.context.scene
+    output_path = scene.render.filepath
+
+    # Frame handlers are not stored in the .blend, so re-register the bucket switch
+    if scene.get('visibility_buckets'):
+        from modules import visibility_buckets
+        visibility_buckets.register_handler()
+    print("Output saved to:", output_path)
+
+    instrumentation = None
+    if config.get('RENDER_INSTRUMENTATION'):
+        from modules import render_instrumentation
+        instrumentation = render_instrumentation.RenderInstrumentation()
+        instrumentation.register()
+
+    media = None
+    if config.get('LAZY_MEDIA'):
+        from modules import media_manager
+        media = media_manager.MediaManager(scene, config)
+        media.register()
+
+    encoder = None
+    if config.get('OUTPUT_MODE') == 'pipelined':
+        from modules import pipelined_encoder
+        encoder = pipelined_encoder.PipelinedEncoder(scene, dict(config, OUTPUT_PATH=output_path))
+        encoder.start()
+    elif config.get('OUTPUT_MODE') == 'hls':
+        from modules import streaming_output
+        encoder = streaming_output.StreamingOutput(scene, dict(config, OUTPUT_PATH=output_path))
+        encoder.start()
+    if encoder is not None and scene.sequence_editor is not None and \
+            any(strip.type == 'SOUND' for strip in scene.sequence_editor.sequences_all):
+        print(f"Output mode '{config['OUTPUT_MODE']}' writes no audio, the scene's sound strips are left out")
+
     print("Rendering animation...")
-    
+    start = time.perf_counter()
+    encoded = True
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        if encoder is not None:
+            encoded = encoder.finish()
+        if instrumentation is not None:
+            instrumentation.unregister()
+        if media is not None:
+            media.unregister()
+    if not encoded:
+        raise RuntimeError(f"Encoding {output_path} failed")
+    print(f"Rendering finished in {time.perf_counter() - start:.1f}s")
+
+    if instrumentation is not None:
+        report_path = instrumentation.write_report(output_path)
+        render_instrumentation.print_summary(instrumentation.summary())
+        print("Render report saved to:", report_path)
+
+    if media is not None:
+        stats = media.summary()
+        print(f"Media: {stats['images']} images, {stats['loads']} loads, {stats['frees']} frees, "
+              f"estimated peak texture memory {stats['estimated_peak_texture_mb']} MB "
+              f"of {stats['estimated_total_texture_mb']} MB total")
+
+def concat_segments(segment_paths, output_path, ffmpeg_binary='ffmpeg'):
+    """
+    Concatenates rendered video segments into a single file without re-encoding.
+    All segments must share the same codec settings.
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # The concat demuxer reads the segment list from a text file
+    list_path = os.path.splitext(output_path)[0] + '_segments.txt'
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    command = [ffmpeg_binary, '-y', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Failed to concatenate segments: {result.stderr}")
+        return False
 
+    print("Concatenated", len(segment_paths), "segments into", output_path)
+    return True
@@ -0,0 +1,235 @@
+# modules/scene_report.py
+
+import bpy
+import json
+import os
+import time
+from modules import renderer, scene_stats
+
+# Relative per-frame cost of each kind of scene content. One unit is the fixed
+# cost of a frame; the estimate is scaled to seconds by a measured render.
+COST_WEIGHTS = {
+    'frame': 1.0,
+    'objects': 0.02,
+    'shader_nodes': 0.005,
+    'image_megapixels': 0.05,
+    'movie_textures': 0.5,
+    'fcurves': 0.0005,
+    'frame_handlers': 0.05,
+}
+
+def get_action_counts(id_data):
+    """
+    Returns the (fcurves, keyframes) of an ID's action.
+    """
+    animation_data = getattr(id_data, 'animation_data', None)
+    if animation_data is None or animation_data.action is None:
+        return 0, 0
+    fcurves = list(scene_stats.iter_action_fcurves(animation_data.action))
+    return len(fcurves), sum(len(fcurve.keyframe_points) for fcurve in fcurves)
+
+def get_image_megapixels(obj, image):
+    # Reading image.size would load every image, so use the size recorded at build time
+    if image.has_data or 'texture_bytes' not in obj:
+        return image.size[0] * image.size[1] / 1e6
+    return obj['texture_bytes'] / 4 / 1e6
+
+def collect_object_stats(scene):
+    """
+    Returns per object its visible frame range and what it costs to evaluate and shade.
+    Objects without a recorded frame range are visible on every frame.
+    """
+    stats = []
+    for obj in scene.objects:
+        if obj.type not in ('MESH', 'FONT', 'CURVE'):
+            continue
+        frame_range = tuple(obj['frame_range']) if 'frame_range' in obj else None
+        materials = [slot.material for slot in obj.material_slots if slot.material is not None]
+
+        fcurves, keyframes = get_action_counts(obj)
+        for id_data in [obj.data] + [m.node_tree for m in materials if m.node_tree]:
+            counts = get_action_counts(id_data)
+            fcurves += counts[0]
+            keyframes += counts[1]
+
+        images = []
+        for material in materials:
+            if material.node_tree is None:
+                continue
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image is not None:
+                    images.append((node.image, get_image_megapixels(obj, node.image)))
+
+        stats.append({
+            'name': obj.name,
+            'frame_range': frame_range,
+            'materials': {m.name for m in materials},
+            'shader_nodes': sum(len(m.node_tree.nodes) for m in materials if m.node_tree),
+            'images': images,
+            'fcurves': fcurves,
+            'keyframes': keyframes,
+        })
+    return stats
+
+def get_frame_handlers():
+    handlers = {}
+    for name in ('frame_change_pre', 'frame_change_post', 'render_pre', 'render_post', 'render_write'):
+        handlers[name] = [getattr(handler, '__name__', repr(handler)) for handler in getattr(bpy.app.handlers, name)]
+    return handlers
+
+def get_frame_cost(counts):
+    return sum(COST_WEIGHTS[key] * counts.get(key, 1 if key == 'frame' else 0) for key in COST_WEIGHTS)
+
+def summarize_range(object_stats, start, end, handler_count):
+    """
+    Returns the content visible somewhere within the inclusive frame range.
+    """
+    visible = [s for s in object_stats
+               if s['frame_range'] is None or (s['frame_range'][0] <= end and s['frame_range'][1] >= start)]
+    materials = set().union(*(s['materials'] for s in visible)) if visible else set()
+    images = {image.name: (image, megapixels) for s in visible for image, megapixels in s['images']}
+    counts = {
+        'objects': len(visible),
+        'materials': len(materials),
+        'shader_nodes': sum(s['shader_nodes'] for s in visible),
+        'images': len(images),
+        'movie_textures': sum(1 for image, _ in images.values() if image.source == 'MOVIE'),
+        'image_megapixels': round(sum(megapixels for _, megapixels in images.values()), 2),
+        'fcurves': sum(s['fcurves'] for s in visible),
+        'keyframes': sum(s['keyframes'] for s in visible),
+        'frame_handlers': handler_count,
+    }
+    counts['cost'] = round(get_frame_cost(counts), 3)
+    counts['frames'] = [start, end]
+    return counts
+
+def find_problems(scene, object_stats, handlers):
+    """
+    Returns known problems of the scene as readable strings.
+    """
+    problems = []
+    typewriter_objects = [obj.name for obj in scene.objects if 'typewriter_data' in obj]
+    if typewriter_objects and 'typewriter_handler' not in handlers['frame_change_post']:
+        problems.append(
+            f"typewriter: {len(typewriter_objects)} objects carry typewriter data but the typewriter "
+            f"handler is not registered, so they render their full text on every frame")
+
+    paths = {}
+    for image in bpy.data.images:
+        if image.filepath:
+            paths.setdefault(bpy.path.abspath(image.filepath), []).append(image.name)
+    duplicates = {path: names for path, names in paths.items() if len(names) > 1}
+    if duplicates:
+        copies = sum(len(names) - 1 for names in duplicates.values())
+        problems.append(f"duplicate images: {len(duplicates)} files are loaded {copies} extra times, "
+                        f"e.g. {next(iter(duplicates))}")
+
+    output_megapixels = scene.render.resolution_x * scene.render.resolution_y / 1e6
+    oversized = {image.name for s in object_stats for image, megapixels in s['images']
+                 if megapixels > 4 * output_megapixels}
+    if oversized:
+        problems.append(f"oversized images: {len(oversized)} images are over 4x the output resolution, "
+                        f"consider PREPROCESS_ASSETS proxies")
+
+    always_visible = [s['name'] for s in object_stats if s['frame_range'] is None]
+    if len(always_visible) > 20:
+        problems.append(f"{len(always_visible)} objects have no frame range and are evaluated on every frame")
+    return problems
+
+def calibrate(scene, config, object_stats, handler_count, sample_frames):
+    """
+    Returns the seconds per cost unit, from a sample render of the current scene
+    with the current settings, or from the measured profile throughput.
+    Returns (seconds_per_unit, source).
+    """
+    frames = list(range(scene.frame_start, scene.frame_end + 1, scene.frame_step))
+    if sample_frames and frames:
+        step = max(1, len(frames) // sample_frames)
+        frames = frames[::step][:sample_frames]
+        cost = sum(summarize_range(object_stats, frame, frame, handler_count)['cost'] for frame in frames)
+        current = scene.frame_current
+        start = time.perf_counter()
+        for frame in frames:
+            scene.frame_set(frame)
+            bpy.ops.render.render(write_still=False)
+        elapsed = time.perf_counter() - start
+        scene.frame_set(current)
+        return elapsed / cost, f"{len(frames)} sample frames"
+
+    profile_name, _ = renderer.get_render_profile(config)
+    measured = renderer.load_profile_stats(config).get(profile_name)
+    if measured and measured.get('mean_cost'):
+        return 1 / (measured['fps'] * measured['mean_cost']), f"measured '{profile_name}' profile"
+    return None, None
+
+def build_report(config, range_seconds=None, sample_frames=0):
+    """
+    Inspects the built scene and estimates the render time of its frame range.
+    """
+    scene = bpy.context.scene
+    range_frames = max(1, int((range_seconds or config.get('REPORT_RANGE_SECONDS', 10)) * scene.render.fps))
+    object_stats = collect_object_stats(scene)
+    handlers = get_frame_handlers()
+    handler_count = len(handlers['frame_change_pre']) + len(handlers['frame_change_post'])
+
+    ranges = []
+    for start in range(scene.frame_start, scene.frame_end + 1, range_frames):
+        end = min(start + range_frames - 1, scene.frame_end)
+        ranges.append(summarize_range(object_stats, start, end, handler_count))
+
+    seconds_per_unit, calibration = calibrate(scene, config, object_stats, handler_count, sample_frames)
+    total_seconds = None
+    if seconds_per_unit is not None:
+        for counts in ranges:
+            rendered_frames = len(range(counts['frames'][0], counts['frames'][1] + 1, scene.frame_step))
+            counts['estimated_s'] = round(counts['cost'] * seconds_per_unit * rendered_frames, 1)
+        total_seconds = round(sum(counts['estimated_s'] for counts in ranges), 1)
+
+    return {
+        'blend': bpy.data.filepath,
+        'engine': scene.render.engine,
+        'resolution': [scene.render.resolution_x, scene.render.resolution_y, scene.render.resolution_percentage],
+        'frame_range': [scene.frame_start, scene.frame_end, scene.frame_step],
+        'totals': scene_stats.count_datablocks(),
+        'images': sorted({f"{image.name} ({'movie' if image.source == 'MOVIE' else 'image'}, {megapixels:.1f} MP)"
+                          for s in object_stats for image, megapixels in s['images']}),
+        'frame_handlers': handlers,
+        'ranges': ranges,
+        'calibration': calibration,
+        'estimated_render_s': total_seconds,
+        'problems': find_problems(scene, object_stats, handlers),
+    }
+
+def write_report(report, config):
+    report_path = os.path.splitext(config['OUTPUT_PATH'])[0] + '_scene_report.json'
+    output_dir = os.path.dirname(report_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report_path
+
+def print_report(report):
+    print(f"Scene report: {report['engine']} at {report['resolution'][0]}x{report['resolution'][1]} "
+          f"({report['resolution'][2]}%), frames {report['frame_range'][0]}-{report['frame_range'][1]}")
+    for counts in report['ranges']:
+        estimate = f", ~{counts['estimated_s']}s" if 'estimated_s' in counts else ""
+        print(f"  {counts['frames'][0]}-{counts['frames'][1]}: {counts['objects']} objects, "
+              f"{counts['shader_nodes']} nodes, {counts['images']} images ({counts['movie_textures']} movies, "
+              f"{counts['image_megapixels']} MP), {counts['keyframes']} keys, cost {counts['cost']}{estimate}")
+    if report['estimated_render_s'] is not None:
+        print(f"Estimated render time: {report['estimated_render_s']:.0f}s (calibrated from {report['calibration']})")
+    else:
+        print("No calibration available: measure the render profiles or pass sample frames.")
+    for problem in report['problems']:
+        print("PROBLEM:", problem)
+
+def report_scene(config, sample_frames=0):
+    """
+    Builds, writes and prints the scene report. Returns the report.
+    """
+    report = build_report(config, sample_frames=sample_frames)
+    report_path = write_report(report, config)
+    print_report(report)
+    print("Scene report saved to:", report_path)
+    return report
@@ -0,0 +1,44 @@
+# modules/scene_stats.py
+
+import bpy
+
+def iter_fcurve_collections(action):
+    """
+    Yields the fcurve collections of an action: one per channelbag of a layered
+    (slotted) action, or the action's own fcurves for legacy actions.
+    """
+    layers = getattr(action, 'layers', None)
+    if layers:
+        for layer in layers:
+            for strip in layer.strips:
+                for channelbag in getattr(strip, 'channelbags', []):
+                    yield channelbag.fcurves
+    else:
+        yield action.fcurves
+
+def iter_action_fcurves(action):
+    """
+    Yields the fcurves of an action, for both legacy and layered (slotted) actions.
+    """
+    for fcurves in iter_fcurve_collections(action):
+        yield from fcurves
+
+def count_datablocks():
+    """
+    Returns the number of datablocks per type plus node, fcurve and keyframe totals.
+    """
+    node_trees = [m.node_tree for m in bpy.data.materials if m.node_tree] + list(bpy.data.node_groups)
+    fcurves = [fc for action in bpy.data.actions for fc in iter_action_fcurves(action)]
+    return {
+        'objects': len(bpy.data.objects),
+        'meshes': len(bpy.data.meshes),
+        'curves': len(bpy.data.curves),
+        'materials': len(bpy.data.materials),
+        'images': len(bpy.data.images),
+        'fonts': len(bpy.data.fonts),
+        'actions': len(bpy.data.actions),
+        'shader_nodes': sum(len(tree.nodes) for tree in node_trees),
+        'fcurves': len(fcurves),
+        'keyframes': sum(len(fc.keyframe_points) for fc in fcurves),
+        'frame_handlers': len(bpy.app.handlers.frame_change_pre) + len(bpy.app.handlers.frame_change_post),
+    }
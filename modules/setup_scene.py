@@ -22,46 +22,72 @@ def clear_scene():
         bpy.data.lights.remove(light)
 def remove_default_cube():
     """
-    Removes the default cube from the scene.
+    Removes the default cube and camera from the scene, if present.
     """
-    bpy.data.objects.remove(bpy.data.objects['Cube'], do_unlink=True)
-    #print camera properties before removing
-    print(bpy.data.objects['Camera'].data.lens)
+    cube = bpy.data.objects.get('Cube')
+    if cube is not None:
+        bpy.data.objects.remove(cube, do_unlink=True)
 
     #remove default camera
-    bpy.data.objects.remove(bpy.data.objects['Camera'], do_unlink=True)
+    camera = bpy.data.objects.get('Camera')
+    if camera is not None:
+        bpy.data.objects.remove(camera, do_unlink=True)
+
+def reset_to_empty_scene():
+    """
+    Replaces the startup file with an empty scene, independent of the user's
+    startup file and preferences.
+    """
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+    if scene.world is None:
+        scene.world = bpy.data.worlds.new("World")
+def configure_camera_data(camera_data, config):
+    """
+    Applies the orthographic camera settings from the config to camera data.
+    """
+    # Set camera properties if needed
+    camera_data.lens = config.get('CAMERA_FOCAL_LENGTH', 50)
+    camera_data.ortho_scale = config.get('CAMERA_ORTHO_SCALE', 5)
+    #set the camera viewport ratio to portrait based on the resolution in the config file
+    camera_data.sensor_fit = 'VERTICAL'
+    #set camera sensor size to the resolution in the config file
+    camera_data.sensor_width = config['RESOLUTION'][0]
+    camera_data.sensor_height = config['RESOLUTION'][1]
+    #camera orthographic 
+    camera_data.type = 'ORTHO'
+
 def setup_camera(config):
     """
     Sets up the camera in the scene.
+    A camera appended from the template library is used when present.
     """
-    # Add a camera
-    bpy.ops.object.camera_add()
-    camera = bpy.context.object
-    camera.name = "Camera"
+    from modules import template_library
+    camera = bpy.data.objects.get(template_library.CAMERA_TEMPLATE)
+    if camera is not None and camera.name not in bpy.context.scene.objects:
+        bpy.context.scene.collection.objects.link(camera)
+        camera.use_fake_user = False
+        camera.name = "Camera"
+    else:
+        # Add a camera
+        bpy.ops.object.camera_add()
+        camera = bpy.context.object
+        camera.name = "Camera"
 
-    # Set camera location and rotation
-    camera.location = (0,0, config['CAMERA_DISTANCE'])
-    # camera.rotation_euler = (0, 1.50, 0)  # Rotate 90 degrees to face the text
-    #point the camera to 0,0,0
-    camera.rotation_euler = (0, 0, 0)
+        # Set camera location and rotation
+        camera.location = (0,0, config['CAMERA_DISTANCE'])
+        # camera.rotation_euler = (0, 1.50, 0)  # Rotate 90 degrees to face the text
+        #point the camera to 0,0,0
+        camera.rotation_euler = (0, 0, 0)
 
-    # Adjust rotation if needed
-    # camera.rotation_euler = (1.5708, 0, 3.1416)  # Uncomment if text is not visible
+        # Adjust rotation if needed
+        # camera.rotation_euler = (1.5708, 0, 3.1416)  # Uncomment if text is not visible
+
+        configure_camera_data(camera.data, config)
 
-    # Set camera properties if needed
-    camera.data.lens = config.get('CAMERA_FOCAL_LENGTH', 50)
-    camera.data.ortho_scale = config.get('CAMERA_ORTHO_SCALE', 5)
-    #set the camera viewport ratio to portrait based on the resolution in the config file
-    camera.data.sensor_fit = 'VERTICAL'
     #set the scene resolution
     bpy.context.scene.render.resolution_x = config['RESOLUTION'][0]
     bpy.context.scene.render.resolution_y = config['RESOLUTION'][1]
-    #set camera sensor size to the resolution in the config file
-    camera.data.sensor_width = config['RESOLUTION'][0]
-    camera.data.sensor_height = config['RESOLUTION'][1]
-    #camera orthographic 
-    camera.data.type = 'ORTHO'
-
 
     # Set the camera as the active camera
     bpy.context.scene.camera = camera
@@ -95,6 +121,9 @@ def setup_scene(config):
     """
     remove_default_cube()
     # clear_scene()
+    if config.get('USE_TEMPLATE_LIBRARY'):
+        from modules import template_library
+        template_library.load_templates(config)
     setup_camera(config)
     # setup_lighting()
     # setup_world_background(config['BACKGROUND_COLOR'])
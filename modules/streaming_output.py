@@ -0,0 +1,126 @@
+# modules/streaming_output.py
+
+import json
+import os
+import threading
+import time
+from modules import pipelined_encoder
+
+def get_stream_dir(output_path):
+    """
+    Returns the directory that holds the playlist and segments for an output path.
+    """
+    return os.path.splitext(output_path)[0] + '_hls'
+
+def build_hls_args(stream_dir, config, frame_rate):
+    """
+    Returns the ffmpeg muxer arguments that cut the stream into fixed-duration
+    HLS segments (fragmented MP4 or MPEG-TS) and maintain an event playlist.
+    """
+    segment_seconds = config.get('SEGMENT_SECONDS', 2)
+    segment_format = config.get('SEGMENT_FORMAT', 'fmp4')
+    extension = 'm4s' if segment_format == 'fmp4' else 'ts'
+
+    args = [
+        # Force a keyframe at every segment boundary so segments have a fixed duration
+        '-g', str(max(1, int(round(segment_seconds * frame_rate)))),
+        '-force_key_frames', f'expr:gte(t,n_forced*{segment_seconds})',
+        '-f', 'hls',
+        '-hls_time', str(segment_seconds),
+        '-hls_list_size', '0',
+        '-hls_playlist_type', 'event',
+        '-hls_segment_type', segment_format,
+        '-hls_segment_filename', os.path.join(stream_dir, f'segment_%05d.{extension}'),
+    ]
+    if segment_format == 'fmp4':
+        args += ['-hls_fmp4_init_filename', 'init.mp4']
+    return args + [os.path.join(stream_dir, 'playlist.m3u8')]
+
+def read_playlist_segments(playlist_path):
+    """
+    Returns the segment names listed in the playlist. ffmpeg only lists a segment
+    once it is complete, so every listed segment is ready to upload.
+    """
+    try:
+        with open(playlist_path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except OSError:
+        return []
+
+class SegmentWatcher:
+    """
+    Polls the playlist while rendering and records when each segment becomes available.
+    """
+
+    def __init__(self, stream_dir, poll_interval=0.1):
+        self.playlist_path = os.path.join(stream_dir, 'playlist.m3u8')
+        self.poll_interval = poll_interval
+        self.start_time = None
+        self.segment_times = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+        self.thread.start()
+
+    def _poll(self):
+        for segment in read_playlist_segments(self.playlist_path):
+            if segment not in self.segment_times:
+                self.segment_times[segment] = time.perf_counter() - self.start_time
+                print(f"Segment ready: {segment} after {self.segment_times[segment]:.2f}s")
+
+    def _watch(self):
+        while not self.stopped.wait(self.poll_interval):
+            self._poll()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self._poll()
+
+    def metrics(self):
+        """
+        Returns time-to-first-segment and the availability time of every segment.
+        """
+        times = sorted(self.segment_times.values())
+        return {
+            'time_to_first_segment_s': times[0] if times else None,
+            'segments': len(times),
+            'segment_ready_s': self.segment_times,
+        }
+
+class StreamingOutput:
+    """
+    Renders into HLS segments through the pipelined encoder so each segment
+    can be uploaded while the rest of the video is still rendering.
+    """
+
+    def __init__(self, scene, config):
+        self.stream_dir = get_stream_dir(config['OUTPUT_PATH'])
+        frame_rate = scene.render.fps / max(1, scene.frame_step)
+        output_args = build_hls_args(self.stream_dir, config, frame_rate)
+        self.encoder = pipelined_encoder.PipelinedEncoder(scene, config, output_args=output_args)
+        self.watcher = SegmentWatcher(self.stream_dir)
+
+    def start(self):
+        if not os.path.exists(self.stream_dir):
+            os.makedirs(self.stream_dir)
+        self.watcher.start()
+        self.encoder.start()
+
+    def finish(self):
+        """
+        Flushes the last segment and writes the stream metrics next to the playlist.
+        """
+        success = self.encoder.finish()
+        self.watcher.stop()
+        metrics = self.watcher.metrics()
+        with open(os.path.join(self.stream_dir, 'stream_metrics.json'), 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, indent=2)
+
+        if metrics['time_to_first_segment_s'] is not None:
+            print(f"Time to first segment: {metrics['time_to_first_segment_s']:.2f}s, "
+                  f"{metrics['segments']} segments in {self.stream_dir}")
+        return success
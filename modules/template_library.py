@@ -0,0 +1,147 @@
+# modules/template_library.py
+
+import bpy
+import hashlib
+import json
+import os
+import time
+from modules import setup_scene, text_creator, visual_elements_manager
+
+# Bump when the template contents change in a way the config hash does not capture
+TEMPLATE_VERSION = 1
+
+# Config keys that the templates are built from
+TEMPLATE_CONFIG_KEYS = [
+    'RESOLUTION',
+    'CAMERA_DISTANCE',
+    'CAMERA_FOCAL_LENGTH',
+    'CAMERA_ORTHO_SCALE',
+    'BACKGROUND_COLOR',
+    'TEXT_COLOR',
+]
+
+CAMERA_TEMPLATE = 'Template_Camera'
+WORLD_TEMPLATE = 'Template_World'
+
+def get_template_hash(config):
+    """
+    Returns a short hash of the template version and the config keys the templates depend on.
+    """
+    values = {key: config.get(key) for key in TEMPLATE_CONFIG_KEYS}
+    payload = json.dumps({'version': TEMPLATE_VERSION, 'config': values}, sort_keys=True, default=list)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+def get_template_path(config):
+    """
+    Returns the path of the template library for the current config.
+    A config change produces a new file name, so stale libraries are never loaded.
+    """
+    template_dir = config.get('TEMPLATE_DIR') or os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'templates')
+    return os.path.join(template_dir, f"templates_v{TEMPLATE_VERSION}_{get_template_hash(config)}.blend")
+
+def create_template_datablocks(config):
+    """
+    Creates the template datablocks in the current file without linking them to a scene.
+    Returns the set of created datablocks.
+    """
+    # Camera rig
+    camera_data = bpy.data.cameras.new(CAMERA_TEMPLATE)
+    setup_scene.configure_camera_data(camera_data, config)
+    camera = bpy.data.objects.new(CAMERA_TEMPLATE, camera_data)
+    camera.location = (0, 0, config['CAMERA_DISTANCE'])
+    camera.rotation_euler = (0, 0, 0)
+
+    # World background
+    world = bpy.data.worlds.new(WORLD_TEMPLATE)
+    world.use_nodes = True
+    background_node = world.node_tree.nodes.get('Background')
+    if background_node is None:
+        background_node = world.node_tree.nodes.new(type='ShaderNodeBackground')
+    background_node.inputs['Color'].default_value = config['BACKGROUND_COLOR']
+
+    # Shader graphs
+    text_material = text_creator.build_text_material(text_creator.TEXT_MATERIAL_TEMPLATE, config['TEXT_COLOR'])
+
+    from effects import fade_in_effect
+    fade_material = bpy.data.materials.new(name=fade_in_effect.FADE_MATERIAL_TEMPLATE)
+    fade_in_effect.build_fade_nodes(fade_material, config['TEXT_COLOR'])
+
+    media_material = bpy.data.materials.new(name=visual_elements_manager.MEDIA_MATERIAL_TEMPLATE)
+    visual_elements_manager.build_media_nodes(media_material)
+
+    chroma_material = bpy.data.materials.new(name=visual_elements_manager.CHROMA_MATERIAL_TEMPLATE)
+    visual_elements_manager.build_chroma_key_nodes(chroma_material)
+
+    return {camera, world, text_material, fade_material, media_material, chroma_material}
+
+def build_template_library(config, path=None):
+    """
+    Builds the template library .blend from the config.
+    Records how long building from scratch took, for comparison with loading.
+    """
+    path = path or get_template_path(config)
+    template_dir = os.path.dirname(path)
+    if not os.path.exists(template_dir):
+        os.makedirs(template_dir)
+
+    start = time.perf_counter()
+    datablocks = create_template_datablocks(config)
+    build_time = time.perf_counter() - start
+
+    bpy.data.libraries.write(path, datablocks, fake_user=True)
+
+    # Remove the datablocks from the current file, the library is the source from now on
+    camera = next(block for block in datablocks if isinstance(block, bpy.types.Object))
+    camera_data = camera.data
+    bpy.data.objects.remove(camera)
+    bpy.data.cameras.remove(camera_data)
+    for block in datablocks:
+        if isinstance(block, bpy.types.World):
+            bpy.data.worlds.remove(block)
+        elif isinstance(block, bpy.types.Material):
+            bpy.data.materials.remove(block)
+
+    with open(os.path.splitext(path)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'version': TEMPLATE_VERSION, 'hash': get_template_hash(config), 'build_time_s': build_time}, f, indent=2)
+
+    print(f"Template library written to {path} (built in {build_time * 1000:.1f} ms)")
+    return path
+
+def ensure_template_library(config):
+    """
+    Builds the template library for the config unless it exists. Returns its path.
+    """
+    path = get_template_path(config)
+    if not os.path.isfile(path):
+        build_template_library(config, path)
+    return path
+
+def load_templates(config):
+    """
+    Appends the templates into the current file, building the library first if the
+    config changed since it was last built. Assigns the template world to the scene.
+    """
+    path = ensure_template_library(config)
+
+    start = time.perf_counter()
+    with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+        data_to.objects = [name for name in data_from.objects if name == CAMERA_TEMPLATE]
+        data_to.worlds = [name for name in data_from.worlds if name == WORLD_TEMPLATE]
+        data_to.materials = [name for name in data_from.materials if name.startswith('Template_')]
+    load_time = time.perf_counter() - start
+
+    if data_to.worlds:
+        world = data_to.worlds[0]
+        world.use_fake_user = False
+        bpy.context.scene.world = world
+
+    build_time = None
+    stats_path = os.path.splitext(path)[0] + '.json'
+    if os.path.isfile(stats_path):
+        with open(stats_path, 'r', encoding='utf-8') as f:
+            build_time = json.load(f).get('build_time_s')
+    if build_time is not None:
+        print(f"Templates loaded in {load_time * 1000:.1f} ms (building from scratch took {build_time * 1000:.1f} ms)")
+    else:
+        print(f"Templates loaded in {load_time * 1000:.1f} ms")
+    return path
@@ -1,17 +1,22 @@
 # modules/text_creator.py
 
 import bpy
+import hashlib
+import json
 import os
 import math
 from mathutils import Vector
+from modules import chunk_normalizer, framing
 
-def create_text_objects(chunks, config):
+# Name of the text material in the template library
+TEXT_MATERIAL_TEMPLATE = 'Template_TextEmission'
+
+def prepare_text_creation(config):
     """
-    Creates text objects in Blender for each chunk of text.
-    Returns a list of created text objects.
+    Loads the fonts, sets the background and measures the camera view.
+    Returns (fonts, view_size) where view_size is None for unsupported cameras,
+    or None if the scene has no camera.
     """
-    text_objects = []
-
     # Load fonts
     font_path = os.path.join(config['FONT_PATH'], config['DEFAULT_FONT'])
     bold_font_path = os.path.join(config['FONT_PATH'], config['BOLD_FONT'])
@@ -24,30 +29,75 @@ def create_text_objects(chunks, config):
     camera = bpy.context.scene.camera
     if not camera:
         print("No camera found in the scene. Please add a camera.")
-        return text_objects
+        return None
 
     # Get camera view size
     if camera.data.type == 'PERSP':
         distance = (Vector((0, 0, 0)) - camera.location).length
-        view_width, view_height = get_camera_view_size(camera, distance)
+        view_size = get_camera_view_size(camera, distance)
     elif camera.data.type == 'ORTHO':
-        view_width, view_height = get_camera_view_size(camera, distance=None)
+        view_size = get_camera_view_size(camera, distance=None)
     else:
-        print(f"Unsupported camera type: {camera.data.type}. Defaulting view size to 10x10.")
-        view_width, view_height = 10, 10  # Default values
+        view_size = None
+    return fonts, view_size
 
-    # Define padding
-    padding = config.get('SCALE_PADDING', 0.95)
+def create_text_objects(chunks, config):
+    """
+    Creates text objects in Blender for each chunk of text.
+    Returns a list of created text objects.
+    """
+    text_objects = []
+    prepared = prepare_text_creation(config)
+    if prepared is None:
+        return text_objects
+    fonts, view_size = prepared
 
     for idx, chunk in enumerate(chunks):
-        text_content = chunk['text']
-        start_time, end_time = chunk['timestamp']
+        text_obj = create_text_object(chunk, f"TextObject_{idx}", config, fonts, view_size)
+        text_objects.append(text_obj)
+
+    if uses_shared_text_data(config):
+        shared = len({text_obj.data.name for text_obj in text_objects})
+        print(f"Text data: {len(text_objects)} captions share {shared} text datablocks")
+    return text_objects
+
+def uses_shared_text_data(config):
+    """
+    Returns True if captions with the same text share one text datablock.
+    Effects that rewrite the text, like the typewriter, copy the datablock of
+    the caption they animate.
+    """
+    return config.get('SHARE_TEXT_DATA', True)
+
+def get_text_data_name(text, font, size):
+    """
+    Returns the name of the shared text datablock for a text in a font and size.
+    """
+    key = json.dumps([text, font.name, size])
+    return f"Text_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
 
+def create_text_object(chunk, name, config, fonts, view_size):
+    """
+    Creates a single text object for a chunk, scaled to fit the camera view
+    and keyframed to be visible only during the chunk's frame range.
+    With shared text data, a chunk whose text was already built reuses that
+    text datablock, so it is only laid out and tessellated once.
+    """
+    shared = uses_shared_text_data(config)
+    data_name = get_text_data_name(chunk['text'], fonts['default'], config['TEXT_SIZE']) if shared else None
+    text_data = bpy.data.curves.get(data_name) if shared else None
+
+    if text_data is not None:
+        text_obj = bpy.data.objects.new(name, text_data)
+        bpy.context.collection.objects.link(text_obj)
+        text_obj.location = text_data['origin_location']
+        width, height = text_data['text_size']
+    else:
         # Create text object
         bpy.ops.object.text_add()
         text_obj = bpy.context.object
-        text_obj.name = f"TextObject_{idx}"
-        text_obj.data.body = text_content
+        text_obj.name = name
+        text_obj.data.body = chunk['text']
 
         # Set text properties
         set_text_properties(text_obj, config, fonts)
@@ -60,35 +110,36 @@ def create_text_objects(chunks, config):
 
         # Calculate text dimensions
         width, height, _ = get_text_dimensions(text_obj)
+        if shared:
+            # Later chunks with this text take the layout from the datablock
+            text_obj.data.name = data_name
+            text_obj.data['shared_text'] = True
+            text_obj.data['origin_location'] = tuple(text_obj.location)
+            text_obj.data['text_size'] = (width, height)
+
+    # Every caption gets its own material, so effects can animate it per object
+    set_text_material(text_obj, config, object_link=shared)
+
+    # Kept on the object so other output aspects can refit it
+    text_obj['text_size'] = (width, height)
+
+    # Determine scaling factor with padding
+    if view_size is not None:
+        view_width, view_height = view_size
+        scale_factor = framing.fit_scale(width, height, view_width, view_height,
+                                         config.get('SCALE_PADDING', 0.95), config.get('MAX_SCALE', 1.0))
+    else:
+        scale_factor = 1  # Default scaling
 
-        # Determine scaling factor with padding
-        if camera.data.type == 'PERSP':
-            scale_x = view_width / width if width > 0 else 1
-            scale_y = view_height / height if height > 0 else 1
-            scale_factor = min(scale_x, scale_y, 1) * config.get('MAX_SCALE', 1.0) * padding  # Prevent upscaling and add padding
-        elif camera.data.type == 'ORTHO':
-            aspect_ratio = camera.data.sensor_width / camera.data.sensor_height
-            view_width = camera.data.ortho_scale * aspect_ratio
-            view_height = camera.data.ortho_scale
-            scale_x = view_width / width if width > 0 else 1
-            scale_y = view_height / height if height > 0 else 1
-            scale_factor = min(scale_x, scale_y, 1) * config.get('MAX_SCALE', 1.0) * padding  # Prevent upscaling and add padding
-        else:
-            scale_factor = 1  # Default scaling
-
-        # Apply scaling
-        text_obj.scale = (scale_factor, scale_factor, scale_factor)
-
-        # Hide text before start_time and after end_time
-        frame_start = int(start_time * config['FRAME_RATE'])
-        frame_end = int(end_time * config['FRAME_RATE'])
-
-        # Keyframe visibility
-        set_visibility_keyframes(text_obj, frame_start, frame_end)
+    # Apply scaling
+    text_obj.scale = (scale_factor, scale_factor, scale_factor)
 
-        text_objects.append(text_obj)
+    # Hide text before start_time and after end_time
+    frame_start, frame_end = chunk_normalizer.get_chunk_frames(chunk, config['FRAME_RATE'])
 
-    return text_objects
+    # Keyframe visibility
+    set_visibility_keyframes(text_obj, frame_start, frame_end)
+    return text_obj
 
 def load_fonts(default_font_path, bold_font_path):
     """
@@ -96,30 +147,24 @@ def load_fonts(default_font_path, bold_font_path):
     """
     fonts = {}
     if os.path.isfile(default_font_path):
-        fonts['default'] = bpy.data.fonts.load(default_font_path)
+        fonts['default'] = bpy.data.fonts.load(default_font_path, check_existing=True)
     else:
         fonts['default'] = bpy.data.fonts.load('Bfont')
         print(f"Default font not found at {default_font_path}. Using Blender's default font.")
 
     if os.path.isfile(bold_font_path):
-        fonts['bold'] = bpy.data.fonts.load(bold_font_path)
+        fonts['bold'] = bpy.data.fonts.load(bold_font_path, check_existing=True)
     else:
         fonts['bold'] = fonts['default']
         print(f"Bold font not found at {bold_font_path}. Using default font.")
 
     return fonts
 
-def set_text_properties(text_obj, config, fonts):
+def build_text_material(name, color):
     """
-    Sets the properties of the text object.
+    Creates an Emission material in the given text color.
     """
-    text_obj.data.font = fonts['default']
-    text_obj.data.size = config['TEXT_SIZE']
-    text_obj.data.align_x = 'CENTER'
-    text_obj.data.align_y = 'CENTER'
-
-    # Set text color using an Emission shader
-    material = bpy.data.materials.new(name=f"Material_{text_obj.name}")
+    material = bpy.data.materials.new(name=name)
     material.use_nodes = True
     nodes = material.node_tree.nodes
     links = material.node_tree.links
@@ -133,18 +178,69 @@ def set_text_properties(text_obj, config, fonts):
     emission_node = nodes.new(type='ShaderNodeEmission')
 
     # Set emission color to the desired text color
-    emission_node.inputs['Color'].default_value = config['TEXT_COLOR']
+    emission_node.inputs['Color'].default_value = color
 
     # Link the Emission shader to the Material Output
     links.new(emission_node.outputs['Emission'], output_node.inputs['Surface'])
+    return material
 
-    # Assign the material to the text object
-    text_obj.data.materials.append(material)
+def set_text_properties(text_obj, config, fonts):
+    """
+    Sets the properties of the text object.
+    """
+    text_obj.data.font = fonts['default']
+    text_obj.data.size = config['TEXT_SIZE']
+    text_obj.data.align_x = 'CENTER'
+    text_obj.data.align_y = 'CENTER'
+
+def set_text_material(text_obj, config, object_link=False):
+    """
+    Gives the text object its own text material. With object_link the material
+    is linked to the object instead of its text data, which may be shared.
+    """
+    # Set text color using an Emission shader, copied from the template library when loaded
+    template = bpy.data.materials.get(TEXT_MATERIAL_TEMPLATE)
+    if template is not None:
+        material = template.copy()
+        material.name = f"Material_{text_obj.name}"
+        material.use_fake_user = False
+    else:
+        material = build_text_material(f"Material_{text_obj.name}", config['TEXT_COLOR'])
+
+    if not object_link:
+        # Assign the material to the text object
+        text_obj.data.materials.append(material)
+        return
+
+    if not text_obj.data.materials:
+        text_obj.data.materials.append(None)
+    text_obj.material_slots[0].link = 'OBJECT'
+    text_obj.material_slots[0].material = material
+
+def set_text_font(text_obj, font):
+    """
+    Changes the font of a text object. Shared text data is replaced by the shared
+    data of the same text in the new font, so the other captions keep theirs.
+    """
+    data = text_obj.data
+    if not data.get('shared_text'):
+        data.font = font
+        return
+
+    name = get_text_data_name(data.body, font, data.size)
+    font_data = bpy.data.curves.get(name)
+    if font_data is None:
+        # Keeps the layout of the original font, like changing the font in place does
+        font_data = data.copy()
+        font_data.name = name
+        font_data.font = font
+    text_obj.data = font_data
 
 def set_visibility_keyframes(text_obj, frame_start, frame_end):
     """
     Sets keyframes to control the visibility of the text object.
     """
+    text_obj['frame_range'] = (frame_start, frame_end)
     # Ensure the object has animation data
     if not text_obj.animation_data:
         text_obj.animation_data_create()
@@ -178,6 +274,8 @@ def set_background_color(color):
     """
     Sets the background color of the scene.
     """
+    if bpy.context.scene.world is None:
+        bpy.context.scene.world = bpy.data.worlds.new("World")
     bpy.context.scene.world.use_nodes = True
     nodes = bpy.context.scene.world.node_tree.nodes
     background_node = nodes.get('Background')
@@ -0,0 +1,239 @@
+# modules/timeline.py
+#
+# Pure-Python timeline description of a video. Built from the parsed inputs
+# without bpy, so it can be cached, compared and validated outside Blender.
+# timeline_compiler turns it into scene data.
+
+import hashlib
+import json
+import random
+from modules import chunk_normalizer
+
+TIMELINE_VERSION = 1
+
+# Config keys the compiler styles captions and the scene from. Items do not record
+# them, so a change to any of them rebuilds the whole timeline
+STYLE_CONFIG_KEYS = [
+    'TEXT_SIZE',
+    'TEXT_COLOR',
+    'FONT_PATH',
+    'DEFAULT_FONT',
+    'BOLD_FONT',
+    'SCALE_PADDING',
+    'MAX_SCALE',
+    'BACKGROUND_COLOR',
+    'SHARE_TEXT_DATA',
+    'CAMERA_DISTANCE',
+    'CAMERA_FOCAL_LENGTH',
+    'CAMERA_ORTHO_SCALE',
+]
+
+# z location of the plane for each visual element type
+LAYER_DEPTHS = {
+    'background': -1,
+    'main': 0,
+    'overlay': 1,
+}
+
+ZOOM_EFFECTS = ('zoom_in', 'zoom_out')
+
+def zoom_schedule(start_frame, end_frame, fps, rng=random):
+    """
+    Returns the zoom keyframes between start_frame and end_frame as [frame, state]
+    pairs, where state is 'initial' or 'zoomed'. Each cycle waits 4-6 seconds,
+    zooms in over 0.5 seconds, holds for 4-6 seconds and zooms back out over 0.5 seconds.
+    """
+    keys = [[start_frame, 'initial']]
+    current_frame = start_frame
+
+    while current_frame < end_frame:
+        zoom_in_start_frame = current_frame + rng.uniform(4, 6) * fps
+
+        # Check if there's enough time left for a full zoom cycle
+        total_zoom_cycle_frames = (0.5 + rng.uniform(4, 6) + 0.5) * fps
+        if zoom_in_start_frame + total_zoom_cycle_frames > end_frame:
+            break
+
+        zoom_in_end_frame = zoom_in_start_frame + 0.5 * fps
+        hold_end_frame = zoom_in_end_frame + rng.uniform(4, 6) * fps
+        zoom_out_end_frame = hold_end_frame + 0.5 * fps
+        keys += [
+            [zoom_in_start_frame - 1, 'initial'],
+            [zoom_in_end_frame, 'zoomed'],
+            [hold_end_frame, 'zoomed'],
+            [zoom_out_end_frame, 'initial'],
+        ]
+        current_frame = zoom_out_end_frame
+
+    keys.append([end_frame, 'initial'])
+    return keys
+
+def _content_id(prefix, *parts):
+    payload = json.dumps(parts, sort_keys=True)
+    return f"{prefix}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+def _unique(item_id, seen):
+    # Identical items get a numbered suffix so every id stays unique
+    candidate, suffix = item_id, 1
+    while candidate in seen:
+        candidate = f"{item_id}_{suffix}"
+        suffix += 1
+    seen.add(candidate)
+    return candidate
+
+def get_element_seed(element):
+    """
+    Returns the seed of a visual element's randomized effects: the 'seed' given in
+    visual_elements.json, or one derived from the element's content and timestamp,
+    so the same inputs always produce the same animation.
+    """
+    if element.get('seed') is not None:
+        return element['seed']
+    payload = json.dumps([element['file_path'], element['type'], element['media'],
+                          element['timestamp'], element.get('effects', [])], sort_keys=True)
+    return int(hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16], 16)
+
+def get_style_hash(config):
+    """
+    Returns a short hash of the style config keys.
+    """
+    values = {key: config.get(key) for key in STYLE_CONFIG_KEYS}
+    payload = json.dumps(values, sort_keys=True, default=list)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+def get_layer_frames(timestamp, frame_rate):
+    """
+    Returns the (start_frame, end_frame) of a visual element's [start, end] timestamp.
+    """
+    return int(timestamp[0] * frame_rate), int(timestamp[1] * frame_rate)
+
+def build_layer(element, frame_rate, rng=None):
+    """
+    Returns the timeline entry for a parsed visual element. Randomized effects
+    draw from rng, by default one seeded with the element's seed.
+    """
+    rng = rng or random.Random(get_element_seed(element))
+    start_frame, end_frame = get_layer_frames(element['timestamp'], frame_rate)
+    effects = []
+    for name in element.get('effects', []):
+        effect = {'name': name}
+        if name in ZOOM_EFFECTS:
+            effect['keyframes'] = zoom_schedule(start_frame, end_frame, frame_rate, rng)
+        effects.append(effect)
+
+    return {
+        'file_path': element['file_path'],
+        'type': element['type'],
+        'media': element['media'],
+        'z': LAYER_DEPTHS.get(element['type'], 0),
+        'frames': [start_frame, end_frame],
+        'effects': effects,
+        'asset': element.get('asset'),
+    }
+
+def build_timeline(chunks, visual_elements, config):
+    """
+    Builds the timeline from parsed (and optionally normalized) chunks and visual elements.
+    """
+    frame_rate = config['FRAME_RATE']
+    seen = set()
+
+    layers = []
+    for element in visual_elements or []:
+        layer = build_layer(element, frame_rate)
+        layer['id'] = _unique(_content_id('layer', layer['file_path'], layer['type'], layer['media'], layer['frames']), seen)
+        layers.append(layer)
+
+    captions = []
+    for chunk in chunks or []:
+        frames = list(chunk_normalizer.get_chunk_frames(chunk, frame_rate))
+        caption = {
+            'text': chunk['text'],
+            'frames': frames,
+            'effects': list(config.get('EFFECTS', [])),
+        }
+        caption['id'] = _unique(_content_id('caption', caption['text'], frames), seen)
+        captions.append(caption)
+
+    ends = [c['frames'][1] for c in captions] + [l['frames'][1] for l in layers]
+    starts = [c['frames'][0] for c in captions] + [l['frames'][0] for l in layers]
+    return {
+        'version': TIMELINE_VERSION,
+        'frame_rate': frame_rate,
+        'resolution': list(config['RESOLUTION']),
+        'style': get_style_hash(config),
+        'frame_range': [min(starts, default=0), max(ends, default=0)],
+        'layers': layers,
+        'captions': captions,
+    }
+
+def validate_timeline(timeline):
+    """
+    Returns a list of problems found in the timeline. An empty list means it is valid.
+    """
+    problems = []
+    for kind in ('layers', 'captions'):
+        for item in timeline.get(kind, []):
+            start_frame, end_frame = item['frames']
+            if end_frame < start_frame:
+                problems.append(f"{item['id']}: ends at frame {end_frame} before it starts at {start_frame}")
+    for layer in timeline.get('layers', []):
+        if layer['type'] not in LAYER_DEPTHS:
+            problems.append(f"{layer['id']}: unknown layer type '{layer['type']}'")
+    return problems
+
+def partition_timeline(timeline, partitions):
+    """
+    Splits the layers and captions into at most `partitions` consecutive time
+    ranges holding about the same number of items. Returns a list of
+    {'frames', 'layers', 'captions'} dicts in time order.
+    """
+    items = sorted([('layers', item) for item in timeline['layers']] + [('captions', item) for item in timeline['captions']],
+                   key=lambda entry: (entry[1]['frames'][0], entry[1]['id']))
+    size = max(1, -(-len(items) // max(1, partitions)))
+
+    parts = []
+    for offset in range(0, len(items), size):
+        group = items[offset:offset + size]
+        parts.append({
+            'frames': [group[0][1]['frames'][0], max(item['frames'][1] for _, item in group)],
+            'layers': [item for kind, item in group if kind == 'layers'],
+            'captions': [item for kind, item in group if kind == 'captions'],
+        })
+    return parts
+
+def diff_timeline(old, new):
+    """
+    Compares two timelines by item id. Returns a dict with the ids to remove and
+    the items to add. Items whose id stays the same but whose content changed are
+    listed in both, so they are rebuilt. A different version, frame rate,
+    resolution or style config rebuilds everything.
+    """
+    if old is None or any(old.get(key) != new.get(key) for key in ('version', 'frame_rate', 'resolution', 'style')):
+        old_items = {} if old is None else {item['id']: item for kind in ('layers', 'captions') for item in old.get(kind, [])}
+        return {
+            'full_rebuild': True,
+            'remove': list(old_items),
+            'add_layers': new['layers'],
+            'add_captions': new['captions'],
+        }
+
+    diff = {'full_rebuild': False, 'remove': [], 'add_layers': [], 'add_captions': []}
+    for kind in ('layers', 'captions'):
+        old_items = {item['id']: item for item in old.get(kind, [])}
+        new_items = {item['id']: item for item in new.get(kind, [])}
+        for item_id, item in old_items.items():
+            if new_items.get(item_id) != item:
+                diff['remove'].append(item_id)
+        for item_id, item in new_items.items():
+            if old_items.get(item_id) != item:
+                diff[f'add_{kind}'].append(item)
+    return diff
+
+def save_timeline(timeline, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(timeline, f, indent=2)
+
+def load_timeline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,134 @@
+# modules/timeline_compiler.py
+
+import bpy
+import json
+import os
+from modules import effect_manager, text_creator, timeline, visual_elements_manager
+
+# Text datablock that stores the compiled timeline inside the .blend
+TIMELINE_TEXT_NAME = 'timeline.json'
+
+def store_timeline(timeline_data):
+    """
+    Stores the timeline in the current .blend so a later build can diff against it.
+    """
+    text = bpy.data.texts.get(TIMELINE_TEXT_NAME) or bpy.data.texts.new(TIMELINE_TEXT_NAME)
+    text.clear()
+    text.write(json.dumps(timeline_data))
+
+def read_stored_timeline():
+    """
+    Returns the timeline stored in the current .blend, or None.
+    """
+    text = bpy.data.texts.get(TIMELINE_TEXT_NAME)
+    if text is None:
+        return None
+    try:
+        return json.loads(text.as_string())
+    except json.JSONDecodeError:
+        return None
+
+def find_objects_by_timeline_id():
+    """
+    Returns a dict of timeline id -> object for all compiled objects.
+    """
+    return {obj['timeline_id']: obj for obj in bpy.data.objects if 'timeline_id' in obj}
+
+def compile_layer(layer, config):
+    """
+    Creates the plane, material, visibility and effect keyframes of a visual layer.
+    """
+    asset = layer.get('asset')
+    if asset is None and not os.path.isfile(layer['file_path']):
+        print(f"File not found: {layer['file_path']}")
+        return None
+    plane = visual_elements_manager.add_visual_element(
+        layer['file_path'], layer['type'], None, layer['media'], layer['effects'], config,
+        name=f"Layer_{layer['id']}", frames=layer['frames'], asset=asset)
+    if plane is not None:
+        plane['timeline_id'] = layer['id']
+    return plane
+
+def compile_caption(caption, config, fonts, view_size):
+    """
+    Creates the text object of a caption and applies its effects.
+    """
+    text_obj = text_creator.create_text_object(caption, f"Caption_{caption['id']}", config, fonts, view_size)
+    text_obj['timeline_id'] = caption['id']
+    effects_list = effect_manager.load_effects(caption['effects'])
+    start_frame, end_frame = caption['frames']
+    effect_manager.apply_effects(text_obj, effects_list, start_frame, end_frame)
+    return text_obj
+
+def compile_items(layers, captions, config):
+    """
+    Compiles timeline layers and captions into scene objects.
+    """
+    for layer in layers:
+        compile_layer(layer, config)
+
+    if captions:
+        prepared = text_creator.prepare_text_creation(config)
+        if prepared is None:
+            return
+        fonts, view_size = prepared
+        for caption in captions:
+            compile_caption(caption, config, fonts, view_size)
+
+def remove_items(item_ids):
+    """
+    Removes the objects of the given timeline ids and purges their orphaned data.
+    """
+    objects = find_objects_by_timeline_id()
+    for item_id in item_ids:
+        obj = objects.get(item_id)
+        if obj is not None:
+            bpy.data.objects.remove(obj, do_unlink=True)
+    if item_ids:
+        bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+def set_frame_range(timeline_data):
+    # The video always starts at frame 1, like the direct build
+    bpy.context.scene.frame_end = timeline_data['frame_range'][1]
+
+def compile_timeline(timeline_data, config):
+    """
+    Builds the whole timeline into the current scene.
+    """
+    problems = timeline.validate_timeline(timeline_data)
+    for problem in problems:
+        print(f"Timeline problem: {problem}")
+
+    compile_items(timeline_data['layers'], timeline_data['captions'], config)
+    set_frame_range(timeline_data)
+    store_timeline(timeline_data)
+
+def apply_timeline(new_timeline, config):
+    """
+    Updates the current scene to match new_timeline, rebuilding only the items
+    that differ from the timeline stored in the .blend.
+    Returns the applied diff.
+    """
+    diff = timeline.diff_timeline(read_stored_timeline(), new_timeline)
+    remove_items(diff['remove'])
+    compile_items(diff['add_layers'], diff['add_captions'], config)
+    set_frame_range(new_timeline)
+    store_timeline(new_timeline)
+
+    print(f"Timeline update: removed {len(diff['remove'])}, added {len(diff['add_layers'])} layers "
+          f"and {len(diff['add_captions'])} captions" + (" (full rebuild)" if diff['full_rebuild'] else ""))
+    return diff
+
+def rebuild_blend(blend_path, new_timeline, config):
+    """
+    Opens an existing .blend and applies only the timeline differences to it.
+    Returns the applied diff, or None if the .blend was built with a different
+    version, frame rate, resolution or style config and has to be built from scratch.
+    """
+    bpy.ops.wm.open_mainfile(filepath=blend_path)
+    if timeline.diff_timeline(read_stored_timeline(), new_timeline)['full_rebuild']:
+        print("Stored timeline is missing or incompatible, building from scratch.")
+        return None
+    # Unchanged captions keep their effect data, but the handlers animating it are not in the file
+    effect_manager.register_handlers(effect_manager.load_effects(config['EFFECTS']))
+    return apply_timeline(new_timeline, config)
@@ -0,0 +1,132 @@
+# modules/visibility_buckets.py
+#
+# Groups timed objects into collections covering fixed time buckets. Only the
+# bucket of the current frame is included in the view layer, so objects of other
+# buckets, and their animation, are left out of the depsgraph.
+
+import bpy
+from bisect import bisect_right
+from bpy.app.handlers import persistent
+
+PARENT_COLLECTION = 'TimeBuckets'
+
+# Scene property holding the bucket table
+BUCKET_TABLE = 'visibility_buckets'
+
+# Active bucket per (file, scene, view layer), so collections only change at bucket boundaries
+_active_buckets = {}
+
+def get_bucket_name(index):
+    return f"Bucket_{index:05d}"
+
+def get_bucket_range(frame_start, frame_end, bucket_frames):
+    """
+    Returns the indices of the buckets covering the inclusive frame range.
+    """
+    return range(max(0, frame_start) // bucket_frames, max(0, frame_end) // bucket_frames + 1)
+
+def get_layer_collection(layer_collection, name):
+    """
+    Finds the layer collection of a collection anywhere below layer_collection.
+    """
+    if layer_collection.name == name:
+        return layer_collection
+    for child in layer_collection.children:
+        found = get_layer_collection(child, name)
+        if found is not None:
+            return found
+    return None
+
+def build_visibility_buckets(config):
+    """
+    Links every object with a 'frame_range' into the bucket collections its range
+    overlaps and stores the bucket table in the scene. Can be run again after
+    objects were added or removed.
+    """
+    scene = bpy.context.scene
+    bucket_frames = max(1, int(config.get('BUCKET_SECONDS', 10) * config['FRAME_RATE']))
+
+    parent = bpy.data.collections.get(PARENT_COLLECTION)
+    if parent is None:
+        parent = bpy.data.collections.new(PARENT_COLLECTION)
+    if parent.name not in scene.collection.children:
+        scene.collection.children.link(parent)
+
+    buckets = {}
+    for obj in scene.objects:
+        if 'frame_range' not in obj:
+            continue
+        frame_start, frame_end = obj['frame_range']
+        wanted = set()
+        for index in get_bucket_range(frame_start, frame_end, bucket_frames):
+            name = get_bucket_name(index)
+            collection = buckets.get(name) or bpy.data.collections.get(name)
+            if collection is None:
+                collection = bpy.data.collections.new(name)
+            if collection.name not in parent.children:
+                parent.children.link(collection)
+            buckets[name] = collection
+            wanted.add(name)
+            if obj.name not in collection.objects:
+                collection.objects.link(obj)
+        # Unlink only after the new links so the object is never orphaned
+        for collection in list(obj.users_collection):
+            if collection.name not in wanted:
+                collection.objects.unlink(obj)
+
+    # Drop buckets that no longer hold anything
+    for collection in list(parent.children):
+        if collection.name not in buckets:
+            bpy.data.collections.remove(collection)
+
+    starts = sorted(int(name.split('_')[1]) * bucket_frames for name in buckets)
+    scene[BUCKET_TABLE] = {
+        'bucket_frames': bucket_frames,
+        'starts': starts,
+        'names': [get_bucket_name(start // bucket_frames) for start in starts],
+    }
+    # Collections are switched from a frame handler, which needs the interface locked while rendering
+    scene.render.use_lock_interface = True
+
+    register_handler()
+    set_active_bucket(scene, scene.frame_current)
+    print(f"Visibility buckets: {len(starts)} buckets of {bucket_frames} frames")
+
+def set_active_bucket(scene, frame):
+    """
+    Includes only the bucket covering the frame in the view layers.
+    """
+    table = scene.get(BUCKET_TABLE)
+    if not table:
+        return
+    starts, names = list(table['starts']), list(table['names'])
+    position = bisect_right(starts, frame) - 1
+    active = ''
+    if position >= 0 and frame < starts[position] + table['bucket_frames']:
+        active = names[position]
+
+    for view_layer in scene.view_layers:
+        key = (bpy.data.filepath, scene.name, view_layer.name)
+        if _active_buckets.get(key) == active:
+            continue
+        for name in names:
+            layer_collection = get_layer_collection(view_layer.layer_collection, name)
+            if layer_collection is not None:
+                layer_collection.exclude = name != active
+        _active_buckets[key] = active
+
+@persistent
+def on_frame_change(scene, depsgraph=None):
+    set_active_bucket(scene, scene.frame_current)
+
+def register_handler():
+    """
+    Registers the frame handler once. Call before rendering a .blend with buckets.
+    Forgets the active buckets, since the opened file's saved exclude state may
+    differ from what was last switched.
+    """
+    _active_buckets.clear()
+    for handler in list(bpy.app.handlers.frame_change_pre):
+        if getattr(handler, '__name__', '') == on_frame_change.__name__:
+            bpy.app.handlers.frame_change_pre.remove(handler)
+    bpy.app.handlers.frame_change_pre.append(on_frame_change)
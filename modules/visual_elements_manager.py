@@ -2,9 +2,12 @@
 
 import bpy
 import os
-import bpy
+import random
+from modules import framing, media_manager, timeline
 
-import bpy
+# Names of the media materials in the template library
+MEDIA_MATERIAL_TEMPLATE = 'Template_Media'
+CHROMA_MATERIAL_TEMPLATE = 'Template_ChromaKey'
 
 def create_fullscreen_plane(z_location, name):
     """
@@ -64,25 +67,33 @@ def add_visual_elements(visual_elements, config):
         timestamp = element['timestamp']
         media = element['media']
         effects = element.get('effects', [])
+        asset = element.get('asset')
 
-        # Ensure the file exists
-        if not os.path.isfile(file_path):
+        # Ensure the file exists, preprocessed assets were already checked
+        if asset is None and not os.path.isfile(file_path):
             print(f"File not found: {file_path}")
             continue
 
         # Add the visual element
-        obj = add_visual_element(file_path, element_type, timestamp, media, effects, config)
+        obj = add_visual_element(file_path, element_type, timestamp, media, effects, config, asset=asset,
+                                 seed=timeline.get_element_seed(element))
 
-def add_visual_element(file_path, element_type, timestamp, media, effects, config):
+def add_visual_element(file_path, element_type, timestamp, media, effects, config, name=None, frames=None, asset=None, seed=None):
     """
     Adds a single visual element to the scene.
+    `frames` overrides the frame range computed from the timestamp, and effects may be
+    given as names or as timeline effect dicts carrying precomputed keyframes.
+    `asset` is the element's asset_preprocessor manifest entry: its proxy is loaded
+    instead of the source and its probed size is used for the fit.
+    `seed` seeds the randomized effects, see timeline.get_element_seed.
     """
-    start_time, end_time = timestamp
-    start_frame = int(start_time * config['FRAME_RATE'])
-    end_frame = int(end_time * config['FRAME_RATE'])
+    if frames is not None:
+        start_frame, end_frame = frames
+    else:
+        start_frame, end_frame = timeline.get_layer_frames(timestamp, config['FRAME_RATE'])
 
     # Create a plane for the visual element
-    name = f"{element_type.capitalize()}_{os.path.basename(file_path)}"
+    name = name or f"{element_type.capitalize()}_{os.path.basename(file_path)}"
     
     if element_type == 'background':
         plane = create_fullscreen_plane(z_location=-1, name=name)
@@ -95,31 +106,54 @@ def add_visual_element(file_path, element_type, timestamp, media, effects, confi
         return None
     # chech if its a video or image
     if media == 'video':
-        material = create_material_with_chroma_key_media(file_path, plane)
+        material = create_material_with_chroma_key_media(file_path, plane, asset=asset)
         if not material:
             return None
     else:
         # Load the media as a texture and assign it to the material
-        material = create_material_with_media(file_path, media, plane)
+        material = create_material_with_media(file_path, media, plane, asset=asset)
         if not material:
             return None
 
     # Hide the plane outside of its active time
     set_visibility_keyframes(plane, start_frame, end_frame)
 
-    # Apply effects if any
-    apply_effects(plane, effects, start_frame, end_frame, element_type)
+    # Apply effects if any, drawing random values from the element's own seed
+    if seed is None:
+        seed = timeline.get_element_seed({'file_path': file_path, 'type': element_type, 'media': media,
+                                          'timestamp': [start_frame, end_frame], 'effects': []})
+    apply_effects(plane, effects, start_frame, end_frame, element_type, rng=random.Random(seed))
 
     return plane
 
 
 
-def create_material_with_media(file_path, media, plane):
+def new_material_from_template(template_name, name):
     """
-    Creates and assigns a material with a texture based on the provided media file.
-    Maintains aspect ratio and ensures the texture fits the plane's height.
+    Returns a copy of a template library material, or None if the template is not loaded.
+    """
+    template = bpy.data.materials.get(template_name)
+    if template is None:
+        return None
+    material = template.copy()
+    material.name = name
+    material.use_fake_user = False
+    return material
+
+def find_media_nodes(material):
+    """
+    Returns the (texture_node, mapping_node) of a media material.
+    """
+    nodes = material.node_tree.nodes
+    texture_node = next(node for node in nodes if node.type == 'TEX_IMAGE')
+    mapping_node = next(node for node in nodes if node.type == 'MAPPING')
+    return texture_node, mapping_node
+
+def build_media_nodes(material):
+    """
+    Builds the UV -> Mapping -> Image Texture -> Emission node graph.
+    Returns the (texture_node, mapping_node).
     """
-    material = bpy.data.materials.new(name=f"{plane.name}_Material")
     material.use_nodes = True
     nodes = material.node_tree.nodes
     links = material.node_tree.links
@@ -139,45 +173,30 @@ def create_material_with_media(file_path, media, plane):
     links.new(mapping_node.outputs['Vector'], texture_node.inputs['Vector'])
     links.new(texture_node.outputs['Color'], emission_node.inputs['Color'])
     links.new(emission_node.outputs['Emission'], output_node.inputs['Surface'])
+    return texture_node, mapping_node
+
+def create_material_with_media(file_path, media, plane, asset=None):
+    """
+    Creates and assigns a material with a texture based on the provided media file.
+    Maintains aspect ratio and ensures the texture fits the plane's height.
+    """
+    material = new_material_from_template(MEDIA_MATERIAL_TEMPLATE, f"{plane.name}_Material")
+    if material is not None:
+        texture_node, mapping_node = find_media_nodes(material)
+    else:
+        material = bpy.data.materials.new(name=f"{plane.name}_Material")
+        texture_node, mapping_node = build_media_nodes(material)
 
     # Load the image or video into the texture node
     try:
-        image = bpy.data.images.load(file_path)
+        image = bpy.data.images.load(get_media_path(file_path, asset))
     except Exception as e:
         print(f"Failed to load media file {file_path}: {e}")
         return None
 
     # Ensure that the texture fits the height of the plane and maintains aspect ratio
     if media == 'image' or media == 'video':
-        image_width, image_height = image.size[:2]
-
-        # Get plane dimensions since the scale may have been adjusted   
-        plane_x_dim = plane.dimensions.x
-        plane_y_dim = plane.dimensions.y
-
-        # Calculate the aspect ratios
-        image_aspect = image_width / image_height
-        plane_aspect = plane_x_dim / plane_y_dim
-
-        # Adjust the UV scaling to fit the height of the plane and maintain the image's aspect ratio
-        if image_aspect > plane_aspect:
-            # Image is wider relative to the plane, so scale UV in X direction (crop sides)
-            uv_scale_x = plane_aspect/image_aspect
-            uv_scale_y = 1
-            x_location = (1 - uv_scale_x) / 2
-            y_location = 0
-        else:
-            # Image is taller relative to the plane, so scale UV in Y direction (no cropping needed)
-            uv_scale_x = 1
-            uv_scale_y = image_aspect/plane_aspect
-            x_location = 0
-            y_location = (1 - uv_scale_y) / 2
-
-        # Apply the UV scale to the mapping node
-        mapping_node.inputs['Scale'].default_value = (uv_scale_x, uv_scale_y, 1)
-        # Center the UV mapping
-        mapping_node.inputs['Location'].default_value = (x_location, y_location, 0)
-
+        set_cover_fit(plane, mapping_node, image, asset=asset)
 
     # Assign the appropriate image or video to the texture node
     if media == 'image':
@@ -194,15 +213,43 @@ def create_material_with_media(file_path, media, plane):
     
     return material
 
-def create_material_with_chroma_key_media(file_path, plane, key_color=(0, 1, 0), threshold=0.8):
+def get_media_path(file_path, asset):
     """
-    Creates and assigns a material with chroma keying based on the provided video file.
-    Removes the key color (default green) and makes it transparent.
+    Returns the proxy of a preprocessed asset when there is one, else the source file.
     """
-    import bpy
+    if asset is not None and asset.get('proxy_path'):
+        return asset['proxy_path']
+    return file_path
 
-    # Create a new material
-    material = bpy.data.materials.new(name=f"{plane.name}_ChromaKey_Material")
+def set_cover_fit(plane, mapping_node, image, wide_y_location=0, asset=None):
+    """
+    Fits the image to the height of the plane through the mapping node.
+    The image aspect and fit are stored on the plane so other output aspects can be refitted.
+    A preprocessed asset provides the size, so the image is not read here.
+    """
+    if asset is not None:
+        image_width, image_height = asset.get('proxy_size') or (asset['width'], asset['height'])
+    else:
+        image_width, image_height = image.size[:2]
+    image_aspect = image_width / image_height
+    plane_aspect = plane.dimensions.x / plane.dimensions.y
+    fit = framing.cover_fit(image_aspect, plane_aspect, wide_y_location)
+
+    mapping_node.inputs['Scale'].default_value = (fit[0], fit[1], 1)
+    mapping_node.inputs['Location'].default_value = (fit[2], fit[3], 0)
+
+    plane['image_aspect'] = image_aspect
+    plane['plane_aspect'] = plane_aspect
+    plane['uv_fit'] = fit
+    plane['wide_y_location'] = wide_y_location
+    # Used by the media manager to budget texture memory without loading the image
+    plane['texture_bytes'] = image_width * image_height * 4 if asset is not None else media_manager.get_texture_bytes(image)
+
+def build_chroma_key_nodes(material, key_color=(0, 1, 0), threshold=0.8):
+    """
+    Builds the chroma key node graph that makes pixels close to key_color transparent.
+    Returns the (texture_node, mapping_node).
+    """
     material.use_nodes = True
     nodes = material.node_tree.nodes
     links = material.node_tree.links
@@ -246,10 +293,26 @@ def create_material_with_chroma_key_media(file_path, plane, key_color=(0, 1, 0),
     links.new(transparent_node.outputs['BSDF'], mix_shader_node.inputs[1])
     links.new(principled_node.outputs['BSDF'], mix_shader_node.inputs[2])
     links.new(mix_shader_node.outputs['Shader'], output_node.inputs['Surface'])
+    return texture_node, mapping_node
+
+def create_material_with_chroma_key_media(file_path, plane, key_color=(0, 1, 0), threshold=0.8, asset=None):
+    """
+    Creates and assigns a material with chroma keying based on the provided video file.
+    Removes the key color (default green) and makes it transparent.
+    """
+    # The template is built with the default key color and threshold
+    material = None
+    if key_color == (0, 1, 0) and threshold == 0.8:
+        material = new_material_from_template(CHROMA_MATERIAL_TEMPLATE, f"{plane.name}_ChromaKey_Material")
+    if material is not None:
+        texture_node, mapping_node = find_media_nodes(material)
+    else:
+        material = bpy.data.materials.new(name=f"{plane.name}_ChromaKey_Material")
+        texture_node, mapping_node = build_chroma_key_nodes(material, key_color, threshold)
 
     # Load the video into the texture node
     try:
-        image = bpy.data.images.load(file_path)
+        image = bpy.data.images.load(get_media_path(file_path, asset))
         image.source = 'MOVIE'
         texture_node.image = image
         texture_node.image_user.frame_duration = image.frame_duration
@@ -266,25 +329,7 @@ def create_material_with_chroma_key_media(file_path, plane, key_color=(0, 1, 0),
         return None
 
     # Adjust UV mapping to maintain aspect ratio
-    image_width, image_height = image.size[:2]
-    plane_x_dim = plane.dimensions.x
-    plane_y_dim = plane.dimensions.y
-    image_aspect = image_width / image_height
-    plane_aspect = plane_x_dim / plane_y_dim
-
-    if image_aspect > plane_aspect:
-        uv_scale_x = plane_aspect / image_aspect
-        uv_scale_y = 1
-        x_location = (1 - uv_scale_x) / 2
-        y_location = 0.94
-    else:
-        uv_scale_x = 1
-        uv_scale_y = image_aspect / plane_aspect
-        x_location = 0
-        y_location = (1 - uv_scale_y) / 2
-
-    mapping_node.inputs['Scale'].default_value = (uv_scale_x, uv_scale_y, 1)
-    mapping_node.inputs['Location'].default_value = (x_location, y_location, 0)
+    set_cover_fit(plane, mapping_node, image, wide_y_location=0.94, asset=asset)
     #rotate the video -90 degrees
     mapping_node.inputs['Rotation'].default_value = (0, 0, -1.5708)
 
@@ -298,6 +343,7 @@ def set_visibility_keyframes(obj, frame_start, frame_end):
     """
     Sets keyframes to control the visibility of the object.
     """
+    obj['frame_range'] = (frame_start, frame_end)
     obj.hide_viewport = True
     obj.hide_render = True
     obj.keyframe_insert(data_path="hide_viewport", frame=frame_start - 1)
@@ -316,17 +362,22 @@ def set_visibility_keyframes(obj, frame_start, frame_end):
     obj.keyframe_insert(data_path="hide_viewport", frame=frame_end + 1)
     obj.keyframe_insert(data_path="hide_render", frame=frame_end + 1)
 
-def apply_effects(obj, effects, start_frame, end_frame, element_type):
+def apply_effects(obj, effects, start_frame, end_frame, element_type, rng=None):
     """
-    Applies effects to the visual element.
+    Applies effects to the visual element. Randomized effects draw from rng.
     """
     for effect in effects:
+        schedule = None
+        if isinstance(effect, dict):
+            schedule = effect.get('keyframes')
+            effect = effect['name']
+
         if effect == 'pan_and_zoom':
             pan_and_zoom_effect(obj, start_frame, end_frame, element_type)
         elif effect == 'zoom_in':
-            zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type=element_type)
+            zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type=element_type, schedule=schedule, rng=rng)
         elif effect == 'zoom_out':
-            zoom_effect(obj, start_frame, end_frame, zoom_in=False, element_type=element_type)
+            zoom_effect(obj, start_frame, end_frame, zoom_in=False, element_type=element_type, schedule=schedule, rng=rng)
         elif effect == 'corner_to_corner_pan':
             corner_to_corner_pan_effect(obj, start_frame, end_frame, element_type)
         else:
@@ -361,9 +412,7 @@ def pan_and_zoom_effect(obj, start_frame, end_frame, element_type):
     mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=end_frame)
     mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=end_frame)
 
-import random
-
-def zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type='background'):
+def zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type='background', schedule=None, rng=None):
     """
     Applies a zoom in and revert back to original size effect multiple times between start and end frame.
     The zoom in and zoom out happen quickly (0.5 sec), and the zoomed state is held for 4-6 seconds before reverting.
@@ -374,9 +423,9 @@ def zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type='backgro
     :param end_frame: The frame at which the zoom effect ends.
     :param zoom_in: If True, applies a zoom-in effect; otherwise, applies zoom-out.
     :param element_type: Defines the element type (background/overlay etc.)
+    :param schedule: Precomputed [frame, state] keyframes from timeline.zoom_schedule.
+    :param rng: random.Random the waiting times are drawn from, seeded from the frame range if omitted.
     """
-    import random
-
     material = obj.data.materials[0]
     mapping_node = material.node_tree.nodes.get('Mapping')
 
@@ -400,67 +449,16 @@ def zoom_effect(obj, start_frame, end_frame, zoom_in=True, element_type='backgro
     )
     zoom_location = (initial_location[0], 0.88, initial_location[2])
 
-    current_frame = start_frame
+    if schedule is None:
+        schedule = timeline.zoom_schedule(start_frame, end_frame, fps, rng or random.Random(f"{start_frame}:{end_frame}"))
 
-    # Set the initial scale and location at the start_frame
-    mapping_node.inputs['Scale'].default_value = initial_scale
-    mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=start_frame)
-    mapping_node.inputs['Location'].default_value = initial_location
-    mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=start_frame)
-
-    # Loop through and apply the effect until the end frame is reached
-    while current_frame < end_frame:
-        # Random wait time before zoom (4 to 6 seconds)
-        wait_time_before_zoom = random.uniform(4, 6)
-        wait_frames_before_zoom = wait_time_before_zoom * fps
-
-        # Calculate the frame when zoom in starts
-        zoom_in_start_frame = current_frame + wait_frames_before_zoom
-
-        # Check if there's enough time left for a full zoom cycle
-        total_zoom_cycle_frames = (0.5 + random.uniform(4, 6) + 0.5) * fps  # zoom in + hold + zoom out
-        if zoom_in_start_frame + total_zoom_cycle_frames > end_frame:
-            # Not enough time for another cycle, exit loop
-            break
-
-        # Hold initial scale until zoom_in_start_frame
-        mapping_node.inputs['Scale'].default_value = initial_scale
-        mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=zoom_in_start_frame - 1)
-        mapping_node.inputs['Location'].default_value = initial_location
-        mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=zoom_in_start_frame - 1)
-
-        # Zoom in over 0.5 seconds
-        zoom_in_end_frame = zoom_in_start_frame + (0.5 * fps)
-        mapping_node.inputs['Scale'].default_value = zoom_scale
-        mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=zoom_in_end_frame)
-        mapping_node.inputs['Location'].default_value = zoom_location
-        mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=zoom_in_end_frame)
-
-        # Hold zoomed state for 4-6 seconds
-        hold_time = random.uniform(4, 6)
-        hold_frames = hold_time * fps
-        hold_end_frame = zoom_in_end_frame + hold_frames
-
-        mapping_node.inputs['Scale'].default_value = zoom_scale
-        mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=hold_end_frame)
-        mapping_node.inputs['Location'].default_value = zoom_location
-        mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=hold_end_frame)
-
-        # Zoom out over 0.5 seconds
-        zoom_out_end_frame = hold_end_frame + (0.5 * fps)
-        mapping_node.inputs['Scale'].default_value = initial_scale
-        mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=zoom_out_end_frame)
-        mapping_node.inputs['Location'].default_value = initial_location
-        mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=zoom_out_end_frame)
-
-        # Update current_frame to the end of this cycle
-        current_frame = zoom_out_end_frame
-
-    # After the loop, ensure the object stays at initial scale till end_frame
-    mapping_node.inputs['Scale'].default_value = initial_scale
-    mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=end_frame)
-    mapping_node.inputs['Location'].default_value = initial_location
-    mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=end_frame)
+    # Keyframe the initial or zoomed state at every scheduled frame
+    for frame, state in schedule:
+        scale, location = (zoom_scale, zoom_location) if state == 'zoomed' else (initial_scale, initial_location)
+        mapping_node.inputs['Scale'].default_value = scale
+        mapping_node.inputs['Scale'].keyframe_insert(data_path='default_value', frame=frame)
+        mapping_node.inputs['Location'].default_value = location
+        mapping_node.inputs['Location'].keyframe_insert(data_path='default_value', frame=frame)
 
     print("Zoom effect completed.")
 
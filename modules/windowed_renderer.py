@@ -0,0 +1,133 @@
+# modules/windowed_renderer.py
+
+import bpy
+import os
+from modules import parser, text_creator, effect_manager, renderer, visual_elements_manager, chunk_normalizer, timeline
+
+def iter_windows(chunk_iter, visual_elements, config):
+    """
+    Groups a time-ordered chunk stream and the visual elements into render windows.
+    Yields (window_start, window_end, chunks, elements) where the frame range is
+    inclusive and only items active within the window (plus overlap) are included.
+    """
+    frame_rate = config['FRAME_RATE']
+    window_frames = max(1, int(config.get('WINDOW_SECONDS', 60) * frame_rate))
+    overlap_frames = int(config.get('WINDOW_OVERLAP_SECONDS', 1.0) * frame_rate)
+
+    elements = sorted(visual_elements, key=lambda e: e['timestamp'][0])
+    last_element_frame = max((timeline.get_layer_frames(e['timestamp'], frame_rate)[1] for e in elements), default=0)
+
+    carry = []
+    lookahead = next(chunk_iter, None)
+    window_start = 0
+
+    while True:
+        window_end = window_start + window_frames - 1
+        low = window_start - overlap_frames
+        high = window_end + overlap_frames
+
+        # Drop chunks that ended before this window, then pull in new ones
+        carry = [c for c in carry if chunk_normalizer.get_chunk_frames(c, frame_rate)[1] >= low]
+        carried_into_window = any(chunk_normalizer.get_chunk_frames(c, frame_rate)[1] >= window_start for c in carry)
+        if lookahead is None and not carried_into_window and window_start > last_element_frame:
+            return
+
+        while lookahead is not None and chunk_normalizer.get_chunk_frames(lookahead, frame_rate)[0] <= high:
+            carry.append(lookahead)
+            lookahead = next(chunk_iter, None)
+
+        window_elements = []
+        for element in elements:
+            start_frame, end_frame = timeline.get_layer_frames(element['timestamp'], frame_rate)
+            if start_frame > high:
+                break
+            if end_frame >= low:
+                window_elements.append(element)
+
+        # The last window ends with the last frame that has content
+        if lookahead is None and last_element_frame <= window_end:
+            last_frame = max(
+                [chunk_normalizer.get_chunk_frames(c, frame_rate)[1] for c in carry] +
+                [timeline.get_layer_frames(e['timestamp'], frame_rate)[1] for e in window_elements],
+                default=window_start
+            )
+            window_end = min(window_end, max(last_frame, window_start))
+
+        yield window_start, window_end, list(carry), window_elements
+        window_start = window_end + 1
+
+def build_window(chunks, visual_elements, config, effects_list):
+    """
+    Builds the scene objects for a single window.
+    """
+    if visual_elements:
+        visual_elements_manager.add_visual_elements(visual_elements, config)
+
+    if not chunks:
+        return []
+
+    text_objects = text_creator.create_text_objects(chunks, config)
+    if effects_list:
+        for text_obj, chunk in zip(text_objects, chunks):
+            start_frame, end_frame = chunk_normalizer.get_chunk_frames(chunk, config['FRAME_RATE'])
+            effect_manager.apply_effects(text_obj, effects_list, start_frame, end_frame)
+    return text_objects
+
+def clear_window(scene):
+    """
+    Removes everything the previous window created, keeping only the camera,
+    and purges the orphaned data so memory does not grow between windows.
+    """
+    for obj in list(scene.objects):
+        if obj != scene.camera:
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+def render_windowed(data_file, visual_elements_file, config):
+    """
+    Renders the video window by window. Only the objects active in the current
+    window exist in the scene, so peak memory does not depend on video length.
+    The window segments are concatenated into CONFIG['OUTPUT_PATH'] at the end.
+    A malformed transcript raises json.JSONDecodeError instead of producing a
+    video cut short.
+    """
+    scene = bpy.context.scene
+    visual_elements = parser.parse_visual_elements(visual_elements_file)
+    if visual_elements and config.get('PREPROCESS_ASSETS'):
+        from modules import asset_preprocessor
+        manifest = asset_preprocessor.preprocess_assets(visual_elements, config)
+        visual_elements = asset_preprocessor.apply_manifest(visual_elements, manifest)
+    chunk_iter = parser.iter_chunks(data_file, config.get('STREAM_REORDER_BUFFER', 64), config)
+    if config.get('NORMALIZE_CHUNKS', True):
+        chunk_iter = chunk_normalizer.iter_normalized_chunks(chunk_iter, config)
+    effects_list = effect_manager.load_effects(config['EFFECTS'])
+
+    renderer.setup_rendering(config)
+    output_path = config['OUTPUT_PATH']
+    segment_dir = os.path.join(os.path.dirname(output_path), 'segments')
+    if not os.path.exists(segment_dir):
+        os.makedirs(segment_dir)
+    extension = os.path.splitext(output_path)[1]
+
+    segment_paths = []
+    for idx, (window_start, window_end, chunks, elements) in enumerate(iter_windows(chunk_iter, visual_elements, config)):
+        print(f"Window {idx}: frames {window_start}-{window_end}, {len(chunks)} chunks, {len(elements)} visual elements")
+        build_window(chunks, elements, config, effects_list)
+
+        scene.frame_start = window_start
+        scene.frame_end = window_end
+        segment_path = os.path.join(segment_dir, f"window_{idx:04d}{extension}")
+        scene.render.filepath = segment_path
+
+        if config.get('WINDOW_SAVE_BLEND'):
+            bpy.ops.wm.save_as_mainfile(filepath=os.path.join(segment_dir, f"window_{idx:04d}.blend"), copy=True)
+
+        renderer.render_animation(config)
+        segment_paths.append(segment_path)
+        clear_window(scene)
+
+    scene.render.filepath = output_path
+    if segment_paths:
+        renderer.concat_segments(segment_paths, output_path, config.get('FFMPEG_BINARY', 'ffmpeg'))
+    return segment_paths
@@ -0,0 +1,238 @@
+# modules/worker_pool.py
+#
+# Pool of warm headless Blender processes running blender_worker.py.
+# Pure Python, used by service.py outside Blender.
+
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+# Prefix of the protocol lines a worker writes to stdout, everything else is Blender's log
+MESSAGE_PREFIX = '@@worker '
+
+# Render tasks go before builds so started jobs finish first
+RENDER_PRIORITY = 0
+BUILD_PRIORITY = 1
+
+class Job:
+    """
+    One video request. A job is built into a .blend by one worker and rendered by
+    the next idle worker, so other workers can build while it renders.
+    """
+
+    def __init__(self, job_id, transcript, visual_elements, config, job_dir):
+        self.id = job_id
+        self.transcript = transcript
+        self.visual_elements = visual_elements
+        self.config = config
+        self.blend_path = os.path.join(job_dir, f"{job_id}.blend")
+        self.status = 'queued'
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.stage_times = {}
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'output_path': self.config.get('OUTPUT_PATH'),
+            'blend_path': self.blend_path,
+            'queue_wait_s': round(self.started - self.submitted, 3) if self.started else None,
+            'latency_s': round(self.finished - self.submitted, 3) if self.finished else None,
+            'stage_times': self.stage_times,
+        }
+
+class WorkerProcess:
+    """
+    A Blender process that keeps the pipeline modules loaded between tasks.
+    Tasks are JSON lines on its stdin and results JSON lines on its stdout.
+    """
+
+    def __init__(self, index, blender_binary, worker_script, log_dir):
+        self.index = index
+        self.command = [blender_binary, '--background', '--factory-startup', '--python', worker_script]
+        self.log_path = os.path.join(log_dir, f"worker_{index}.log")
+        self.process = None
+        self.messages = queue.Queue()
+        self.busy_time = 0.0
+        self.task_count = 0
+        self.current = None
+
+    def start(self):
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, text=True, bufsize=1)
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        with open(self.log_path, 'a', encoding='utf-8') as log:
+            for line in self.process.stdout:
+                if line.startswith(MESSAGE_PREFIX):
+                    self.messages.put(json.loads(line[len(MESSAGE_PREFIX):]))
+                else:
+                    log.write(line)
+                    log.flush()
+        # The process exited
+        self.messages.put(None)
+
+    def wait_ready(self, timeout=None):
+        message = self.messages.get(timeout=timeout)
+        return message is not None and message.get('event') == 'ready'
+
+    def run_task(self, task):
+        """
+        Sends a task and waits for its result. Returns None if the worker died.
+        """
+        try:
+            self.process.stdin.write(json.dumps(task) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        while True:
+            message = self.messages.get()
+            if message is None or message.get('event') == 'done':
+                return message
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+class WorkerPool:
+    """
+    Dispatches the build and render tasks of submitted jobs to idle workers.
+    """
+
+    def __init__(self, config, worker_script, worker_count=None):
+        self.config = config
+        self.job_dir = config.get('SERVICE_JOB_DIR') or os.path.join(os.path.dirname(config['OUTPUT_PATH']), 'jobs')
+        if not os.path.exists(self.job_dir):
+            os.makedirs(self.job_dir)
+        worker_count = worker_count or config.get('SERVICE_WORKERS', 2)
+        self.workers = [
+            WorkerProcess(index, config.get('BLENDER_BINARY', 'blender'), worker_script, self.job_dir)
+            for index in range(worker_count)
+        ]
+        self.tasks = queue.PriorityQueue()
+        self.order = itertools.count()
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.started = None
+
+    def start(self):
+        """
+        Starts every worker, waits until they have preloaded and starts dispatching.
+        """
+        self.started = time.time()
+        for worker in self.workers:
+            worker.start()
+        for worker in self.workers:
+            if not worker.wait_ready(timeout=self.config.get('SERVICE_STARTUP_TIMEOUT', 120)):
+                raise RuntimeError(f"Worker {worker.index} failed to start, see {worker.log_path}")
+            threading.Thread(target=self._dispatch, args=(worker,), daemon=True).start()
+        print(f"{len(self.workers)} workers ready in {time.time() - self.started:.2f}s")
+
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
+
+    def submit(self, transcript, visual_elements, overrides=None):
+        """
+        Queues a job. Returns its id.
+        """
+        job_id = f"job_{int(time.time() * 1000)}_{next(self.order)}"
+        config = dict(self.config)
+        config.update(overrides or {})
+        if not (overrides or {}).get('OUTPUT_PATH'):
+            config['OUTPUT_PATH'] = os.path.join(self.job_dir, f"{job_id}.mp4")
+        job = Job(job_id, transcript, visual_elements, config, self.job_dir)
+        with self.lock:
+            self.jobs[job_id] = job
+        self._queue_task(BUILD_PRIORITY, 'build', job)
+        return job_id
+
+    def get_job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def _queue_task(self, priority, task, job):
+        self.tasks.put((priority, next(self.order), task, job))
+
+    def _dispatch(self, worker):
+        while True:
+            _, _, task, job = self.tasks.get()
+            worker.current = job.id
+            if job.started is None:
+                job.started = time.time()
+            job.status = 'building' if task == 'build' else 'rendering'
+
+            start = time.time()
+            result = worker.run_task({
+                'task': task,
+                'job_id': job.id,
+                'transcript': job.transcript,
+                'visual_elements': job.visual_elements,
+                'blend_path': job.blend_path,
+                'config': job.config,
+            })
+            elapsed = time.time() - start
+            worker.busy_time += elapsed
+            worker.task_count += 1
+            worker.current = None
+            job.stage_times[task] = round(elapsed, 3)
+
+            if result is None:
+                job.status, job.error, job.finished = 'failed', f"Worker {worker.index} exited", time.time()
+                print(f"Worker {worker.index} exited, restarting it")
+                worker.start()
+                worker.wait_ready(timeout=self.config.get('SERVICE_STARTUP_TIMEOUT', 120))
+            elif not result.get('ok'):
+                job.status, job.error, job.finished = 'failed', result.get('error'), time.time()
+            elif task == 'build' and not result.get('rendered'):
+                # Any idle worker renders it while this one builds the next job
+                job.status = 'queued_render'
+                self._queue_task(RENDER_PRIORITY, 'render', job)
+            else:
+                job.status, job.finished = 'done', time.time()
+
+    def metrics(self):
+        """
+        Returns the queue depth, job latencies and per-worker utilization.
+        """
+        uptime = time.time() - self.started if self.started else 0
+        with self.lock:
+            jobs = list(self.jobs.values())
+        latencies = sorted(job.finished - job.submitted for job in jobs if job.status == 'done')
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'uptime_s': round(uptime, 1),
+            'queue_depth': self.tasks.qsize(),
+            'jobs': counts,
+            'latency_s': {
+                'mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+                'p50': round(latencies[len(latencies) // 2], 3) if latencies else None,
+                'max': round(latencies[-1], 3) if latencies else None,
+            },
+            'workers': [
+                {
+                    'index': worker.index,
+                    'current_job': worker.current,
+                    'tasks': worker.task_count,
+                    'utilization': round(worker.busy_time / uptime, 3) if uptime else 0,
+                }
+                for worker in self.workers
+            ],
+        }
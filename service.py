@@ -0,0 +1,99 @@
+# service.py
+#
+# Local video rendering service backed by a pool of warm Blender workers:
+#   python service.py --workers 3 --port 8765
+#
+#   POST /jobs      {"transcript": "...", "visual_elements": "...", "config": {...}} -> {"id": ...}
+#   GET  /jobs/<id> job status, queue wait, latency and stage times
+#   GET  /metrics   queue depth, job latencies and worker utilization
+
+import argparse
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from config import CONFIG
+from modules.worker_pool import WorkerPool
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    pool = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self.send_json(200, self.pool.metrics())
+        elif self.path.startswith('/jobs/'):
+            job = self.pool.get_job(self.path[len('/jobs/'):])
+            if job is None:
+                self.send_json(404, {'error': 'Unknown job'})
+            else:
+                self.send_json(200, job)
+        else:
+            self.send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self.send_json(404, {'error': 'Not found'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            transcript = os.path.abspath(request['transcript'])
+            visual_elements = os.path.abspath(request.get('visual_elements') or os.path.join(script_dir, 'visual_elements.json'))
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {'error': f"Invalid job: {e}"})
+            return
+        if not os.path.isfile(transcript):
+            self.send_json(400, {'error': f"Transcript not found: {transcript}"})
+            return
+
+        overrides = request.get('config', {})
+        if request.get('profile'):
+            overrides['RENDER_PROFILE'] = request['profile']
+        job_id = self.pool.submit(transcript, visual_elements, overrides)
+        self.send_json(202, {'id': job_id})
+
+    def log_message(self, format, *args):
+        pass
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local video rendering service")
+    parser.add_argument('--host', default=CONFIG.get('SERVICE_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=CONFIG.get('SERVICE_PORT', 8765))
+    parser.add_argument('--workers', type=int, default=CONFIG.get('SERVICE_WORKERS', 2))
+    parser.add_argument('--blender', help="Blender executable (overrides BLENDER_BINARY)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    config = dict(CONFIG)
+    if args.blender:
+        config['BLENDER_BINARY'] = args.blender
+
+    pool = WorkerPool(config, os.path.join(script_dir, 'blender_worker.py'), args.workers)
+    pool.start()
+    ServiceHandler.pool = pool
+
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    print(f"Listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.stop()
+
+if __name__ == "__main__":
+    main()
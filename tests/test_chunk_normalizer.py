@@ -0,0 +1,68 @@
+# tests/test_chunk_normalizer.py
+
+import os
+import sys
+import unittest
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import chunk_normalizer
+
+def make_chunks(timestamps):
+    return [{'text': f" word{index}", 'timestamp': list(timestamp)} for index, timestamp in enumerate(timestamps)]
+
+def normalize(chunks, **config):
+    config = dict({'FRAME_RATE': 30, 'MIN_CAPTION_FRAMES': 6, 'MAX_CAPTION_DELAY_FRAMES': 2}, **config)
+    return list(chunk_normalizer.iter_normalized_chunks(chunks, config))
+
+class NormalizeChunksTest(unittest.TestCase):
+
+    def assert_sequential(self, normalized):
+        for previous, chunk in zip(normalized, normalized[1:]):
+            self.assertLessEqual(chunk['frames'][0], chunk['frames'][1])
+            self.assertEqual(chunk['frames'][0], previous['frames'][1] + 1)
+
+    def test_back_to_back_short_chunks_do_not_drift(self):
+        chunks = make_chunks((index / 10, (index + 1) / 10) for index in range(20))
+        normalized = normalize(chunks)
+
+        self.assertEqual([chunk['text'] for chunk in normalized], [chunk['text'] for chunk in chunks])
+        for chunk, original in zip(normalized, chunks):
+            start_frame = round(original['timestamp'][0] * 30)
+            self.assertGreaterEqual(chunk['frames'][0], start_frame)
+            self.assertLessEqual(chunk['frames'][0], start_frame + 2)
+        # The last chunk starts at 1.9s, frame 57
+        self.assertLessEqual(normalized[-1]['frames'][0], 59)
+        self.assert_sequential(normalized)
+
+    def test_chunks_starting_on_the_same_frame_are_shown_together(self):
+        chunks = make_chunks([(0.0, 0.1), (0.0, 0.2), (1.0, 1.5)])
+        normalized = normalize(chunks, MAX_CAPTION_DELAY_FRAMES=0)
+
+        self.assertEqual([chunk['text'] for chunk in normalized], [" word0 word1", " word2"])
+        self.assertEqual(normalized[0]['frames'], [0, 6])
+
+    def test_short_chunk_gets_minimum_duration_before_a_gap(self):
+        normalized = normalize(make_chunks([(0.0, 0.05), (1.0, 1.5)]))
+
+        self.assertEqual(normalized[0]['frames'], [0, 5])
+        self.assertEqual(normalized[1]['frames'], [30, 45])
+
+    def test_overlapping_chunk_ends_where_the_next_starts(self):
+        normalized = normalize(make_chunks([(0.0, 1.0), (0.5, 1.5)]))
+
+        self.assertEqual([chunk['frames'] for chunk in normalized], [[0, 14], [15, 45]])
+
+    def test_redundant_chunks_are_merged(self):
+        chunks = [{'text': " hello", 'timestamp': [0.0, 0.5]},
+                  {'text': " hello world", 'timestamp': [0.5, 1.0]}]
+        normalized = normalize(chunks)
+
+        self.assertEqual(len(normalized), 1)
+        self.assertEqual(normalized[0]['text'], " hello world")
+        self.assertEqual(normalized[0]['frames'], [0, 30])
+
+if __name__ == '__main__':
+    unittest.main()
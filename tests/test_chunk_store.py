@@ -0,0 +1,86 @@
+# tests/test_chunk_store.py
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import chunk_normalizer, chunk_store, parser
+
+CHUNKS = [
+    {'text': " b", 'timestamp': [1.0, 1.5]},
+    {'text': " a", 'timestamp': [0.0, None]},
+    {'text': " dropped", 'timestamp': [None, 2.0]},
+    {'text': " c", 'timestamp': [2.0, 1.0]},
+]
+
+class ValidateChunksTest(unittest.TestCase):
+
+    def test_chunks_are_validated_like_the_store(self):
+        chunks, problems = chunk_store.validate_chunks(CHUNKS)
+
+        self.assertEqual(chunks, [
+            {'text': " a", 'timestamp': [0.0, None]},
+            {'text': " b", 'timestamp': [1.0, 1.5]},
+            {'text': " c", 'timestamp': [2.0, 2.0]},
+        ])
+        self.assertEqual(len(problems), 4)
+
+    def test_malformed_chunk_raises(self):
+        with self.assertRaises(ValueError):
+            chunk_store.validate_chunks([{'text': " a", 'timestamp': ["soon", 1.0]}])
+
+    def test_missing_end_gets_the_minimum_duration(self):
+        chunks, _ = chunk_store.validate_chunks(CHUNKS)
+        chunk_store.quantize_chunks(chunks, 30, 6)
+
+        self.assertEqual([chunk['frames'] for chunk in chunks], [[0, 5], [30, 45], [60, 60]])
+        self.assertEqual(chunk_normalizer.get_chunk_frames({'text': " a", 'timestamp': [1.0, None]}, 30), (30, 30))
+
+    def test_parse_data_without_numpy_validates(self):
+        numpy_module = chunk_store.np
+        chunk_store.np = None
+        try:
+            with tempfile.TemporaryDirectory() as work_dir:
+                path = os.path.join(work_dir, 'transcript.json')
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump({'chunks': CHUNKS}, f)
+                chunks = parser.parse_data(path, {'FRAME_RATE': 30, 'MIN_CAPTION_FRAMES': 6})
+        finally:
+            chunk_store.np = numpy_module
+
+        self.assertEqual([chunk['text'] for chunk in chunks], [" a", " b", " c"])
+        self.assertEqual(chunks[0]['frames'], [0, 5])
+
+@unittest.skipUnless(chunk_store.available(), "NumPy is not available")
+class ChunkStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = chunk_store.ChunkStore.from_chunks(CHUNKS)
+        self.store.validate()
+        self.store.quantize(30, 6)
+
+    def test_store_matches_the_dict_validation(self):
+        chunks, _ = chunk_store.validate_chunks(CHUNKS)
+        chunk_store.quantize_chunks(chunks, 30, 6)
+
+        self.assertEqual(list(self.store), chunks)
+
+    def test_slice_returns_a_store(self):
+        sliced = self.store[1:]
+
+        self.assertIsInstance(sliced, chunk_store.ChunkStore)
+        self.assertEqual(list(sliced), list(self.store)[1:])
+        self.assertEqual(sliced[-1], self.store[2])
+
+    def test_index_out_of_range_raises(self):
+        with self.assertRaises(IndexError):
+            self.store[3]
+
+if __name__ == '__main__':
+    unittest.main()
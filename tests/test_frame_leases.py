@@ -0,0 +1,85 @@
+# tests/test_frame_leases.py
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import frame_leases
+
+class RacingBoard(frame_leases.LeaseBoard):
+    """
+    Lets another board reclaim the lease right after this one read the stale lease's owner.
+    """
+
+    def __init__(self, share_dir, rival, **kwargs):
+        super().__init__(share_dir, **kwargs)
+        self.rival = rival
+
+    def read_owner(self, path):
+        owner = super().read_owner(path)
+        if self.rival is not None and path.endswith('.lease'):
+            rival, self.rival = self.rival, None
+            self.assert_claimed = rival.try_claim(0, rival.share_now())
+        return owner
+
+class LeaseBoardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.share_dir = self.work_dir.name
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def make_board(self, worker_id):
+        return frame_leases.LeaseBoard(self.share_dir, worker_id=worker_id, lease_timeout=5)
+
+    def make_stale_lease(self, worker_id):
+        board = self.make_board(worker_id)
+        self.assertTrue(board.try_claim(0, board.share_now()))
+        old = time.time() - 60
+        os.utime(board.lease_path(0), (old, old))
+
+    def test_fresh_lease_is_not_claimed(self):
+        first, second = self.make_board('first'), self.make_board('second')
+
+        self.assertTrue(first.try_claim(0, first.share_now()))
+        self.assertFalse(second.try_claim(0, second.share_now()))
+        self.assertTrue(first.owns(0))
+
+    def test_stale_lease_is_reclaimed(self):
+        self.make_stale_lease('dead')
+        board = self.make_board('live')
+
+        self.assertTrue(board.try_claim(0, board.share_now()))
+        self.assertTrue(board.owns(0))
+
+    def test_lease_reclaimed_meanwhile_is_kept(self):
+        self.make_stale_lease('dead')
+        rival = self.make_board('rival')
+        board = RacingBoard(self.share_dir, rival, worker_id='late', lease_timeout=5)
+
+        self.assertFalse(board.try_claim(0, board.share_now()))
+        self.assertTrue(board.assert_claimed)
+        self.assertTrue(rival.owns(0))
+        leases = [name for name in os.listdir(os.path.join(self.share_dir, 'leases')) if not name.startswith('.clock')]
+        self.assertEqual(leases, ['range_00000.lease'])
+
+    def test_new_job_replaces_the_previous_one(self):
+        board = self.make_board('coordinator')
+        board.create_job(0, 99, 50)
+        self.assertTrue(board.try_claim(0, board.share_now()))
+        job = board.create_job(0, 9, 5)
+
+        self.assertEqual(board.load_job()['ranges'], [[0, 0, 4], [1, 5, 9]])
+        self.assertEqual(len(job['ranges']), 2)
+        self.assertFalse(board.owns(0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_parser.py
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import chunk_normalizer, chunk_store, parser
+
+CHUNKS = [{'text': f" word{index}", 'timestamp': [index, index + 1]} for index in range(20)]
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, text):
+        path = os.path.join(self.work_dir.name, 'transcript.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_only_the_top_level_key_matches(self):
+        document = {'text': 'he said "chunks": [ here', 'meta': {'chunks': [1, 2]}, 'count': 12345, 'chunks': CHUNKS}
+        path = self.write(json.dumps(document))
+
+        for read_size in (1, 7, 65536):
+            self.assertEqual(list(parser.iter_json_array(path, 'chunks', read_size)), CHUNKS)
+
+    def test_missing_key_yields_nothing(self):
+        self.assertEqual(list(parser.iter_json_array(self.write('{"text": "chunks"}'), 'chunks')), [])
+
+    def test_truncated_transcript_raises(self):
+        path = self.write(json.dumps({'chunks': CHUNKS})[:-40])
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(parser.iter_chunks(path))
+
+class IterChunksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.config = {'FRAME_RATE': 30, 'MIN_CAPTION_FRAMES': 6}
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, chunks):
+        path = os.path.join(self.work_dir.name, 'transcript.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'chunks': chunks}, f)
+        return path
+
+    def test_streamed_chunks_are_validated(self):
+        chunks = [
+            {'text': " b", 'timestamp': [1.0, 1.5]},
+            {'text': " dropped", 'timestamp': [None, 2.0]},
+            {'text': " a", 'timestamp': [0.0, None]},
+            {'text': " c", 'timestamp': [2.0, 1.0]},
+        ]
+
+        streamed = list(parser.iter_chunks(self.write(chunks), 1, self.config))
+
+        self.assertEqual([chunk['text'] for chunk in streamed], [" a", " b", " c"])
+        self.assertEqual([chunk['frames'] for chunk in streamed], [[0, 5], [30, 45], [60, 60]])
+
+    def test_streamed_frames_match_parse_data(self):
+        chunks = [{'text': f" word{index}", 'timestamp': [index * 0.049, index * 0.049 + 0.049]} for index in range(40)]
+        path = self.write(chunks)
+
+        streamed = list(parser.iter_chunks(path, 64, self.config))
+        numpy_module = chunk_store.np
+        chunk_store.np = None
+        try:
+            parsed = parser.parse_data(path, self.config)
+        finally:
+            chunk_store.np = numpy_module
+
+        self.assertEqual([chunk['frames'] for chunk in streamed], [chunk['frames'] for chunk in parsed])
+        for chunk in chunks:
+            quantized = chunk_store.quantize_chunks([dict(chunk)], 30)[0]['frames']
+            self.assertEqual(list(chunk_normalizer.get_chunk_frames(chunk, 30)), quantized)
+
+if __name__ == '__main__':
+    unittest.main()
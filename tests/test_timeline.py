@@ -0,0 +1,119 @@
+# tests/test_timeline.py
+
+import copy
+import os
+import sys
+import unittest
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repo_dir not in sys.path:
+    sys.path.insert(0, repo_dir)
+
+from modules import timeline
+
+CONFIG = {
+    'FRAME_RATE': 30,
+    'RESOLUTION': [1080, 1920],
+    'EFFECTS': ['fade_in_effect'],
+    'TEXT_SIZE': 1.0,
+    'TEXT_COLOR': [1, 1, 1, 1],
+    'BACKGROUND_COLOR': [0, 0, 0, 1],
+}
+
+CHUNKS = [{'text': f" word{index}", 'timestamp': [index, index + 0.5]} for index in range(6)]
+
+VISUAL_ELEMENTS = [
+    {'file_path': 'a.png', 'type': 'background', 'media': 'image', 'timestamp': [0, 20], 'effects': ['zoom_in']},
+    {'file_path': 'b.png', 'type': 'overlay', 'media': 'image', 'timestamp': [2, 4]},
+]
+
+def build(config=CONFIG, chunks=CHUNKS):
+    return timeline.build_timeline(chunks, VISUAL_ELEMENTS, config)
+
+class BuildTimelineTest(unittest.TestCase):
+
+    def test_items_have_frames_and_unique_ids(self):
+        result = build()
+
+        self.assertEqual(len(result['captions']), 6)
+        self.assertEqual(len(result['layers']), 2)
+        self.assertEqual(result['captions'][1]['frames'], [30, 45])
+        self.assertEqual(result['captions'][1]['effects'], ['fade_in_effect'])
+        self.assertEqual(result['frame_range'], [0, 600])
+        ids = [item['id'] for kind in ('layers', 'captions') for item in result[kind]]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_identical_captions_get_distinct_ids(self):
+        chunks = [{'text': " same", 'timestamp': [0, 1]}] * 2
+        captions = build(chunks=chunks)['captions']
+
+        self.assertNotEqual(captions[0]['id'], captions[1]['id'])
+
+    def test_style_hash_follows_the_style_keys(self):
+        self.assertEqual(build()['style'], build(dict(CONFIG))['style'])
+        self.assertNotEqual(build()['style'], build(dict(CONFIG, TEXT_SIZE=2.0))['style'])
+
+class DiffTimelineTest(unittest.TestCase):
+
+    def test_same_timeline_has_no_changes(self):
+        diff = timeline.diff_timeline(build(), build())
+
+        self.assertFalse(diff['full_rebuild'])
+        self.assertEqual(diff['remove'] + diff['add_layers'] + diff['add_captions'], [])
+
+    def test_changed_caption_is_removed_and_added(self):
+        old = build()
+        new = copy.deepcopy(old)
+        new['captions'][2]['effects'] = []
+        diff = timeline.diff_timeline(old, new)
+
+        self.assertEqual(diff['remove'], [old['captions'][2]['id']])
+        self.assertEqual(diff['add_captions'], [new['captions'][2]])
+        self.assertEqual(diff['add_layers'], [])
+
+    def test_new_caption_is_added(self):
+        diff = timeline.diff_timeline(build(), build(chunks=CHUNKS + [{'text': " extra", 'timestamp': [9, 10]}]))
+
+        self.assertEqual(diff['remove'], [])
+        self.assertEqual([caption['text'] for caption in diff['add_captions']], [" extra"])
+
+    def test_style_change_rebuilds_everything(self):
+        for key, value in (('TEXT_SIZE', 2.0), ('TEXT_COLOR', [1, 0, 0, 1]), ('BACKGROUND_COLOR', [1, 1, 1, 1]),
+                           ('FONT_PATH', 'fonts'), ('SCALE_PADDING', 0.8)):
+            diff = timeline.diff_timeline(build(), build(dict(CONFIG, **{key: value})))
+            self.assertTrue(diff['full_rebuild'], key)
+
+    def test_frame_rate_change_rebuilds_everything(self):
+        self.assertTrue(timeline.diff_timeline(build(), build(dict(CONFIG, FRAME_RATE=25)))['full_rebuild'])
+
+    def test_missing_stored_timeline_rebuilds_everything(self):
+        diff = timeline.diff_timeline(None, build())
+
+        self.assertTrue(diff['full_rebuild'])
+        self.assertEqual(len(diff['add_captions']), 6)
+
+class PartitionTimelineTest(unittest.TestCase):
+
+    def test_partitions_cover_every_item_in_time_order(self):
+        result = build()
+        parts = timeline.partition_timeline(result, 3)
+
+        self.assertEqual(len(parts), 3)
+        ids = [item['id'] for part in parts for kind in ('layers', 'captions') for item in part[kind]]
+        self.assertEqual(sorted(ids), sorted(item['id'] for kind in ('layers', 'captions') for item in result[kind]))
+        starts = [part['frames'][0] for part in parts]
+        self.assertEqual(starts, sorted(starts))
+        for part in parts:
+            for kind in ('layers', 'captions'):
+                for item in part[kind]:
+                    self.assertGreaterEqual(item['frames'][0], part['frames'][0])
+                    self.assertLessEqual(item['frames'][1], part['frames'][1])
+
+    def test_more_partitions_than_items(self):
+        parts = timeline.partition_timeline(build(chunks=[]), 8)
+
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(timeline.partition_timeline({'layers': [], 'captions': []}, 4), [])
+
+if __name__ == '__main__':
+    unittest.main()